@@ -0,0 +1,238 @@
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.adfvalues import mackinnoncrit, mackinnonp
+from threadpoolctl import threadpool_limits
+
+from backend.instrumentation import instrument
+from backend.preprocessing import fill_gaps, to_regular_grid
+from backend.registry import data_fingerprint
+
+# Analyse de stationnarité et d'autocorrélation, sans affichage.
+#
+# Pour chaque série (une colonne, éventuellement restreinte à une année) :
+# - test ADF (constante, retard choisi par AIC) de la série, de ses différences
+#   d'ordre 1 et 2 et de ses différences saisonnières à 96 pas (jour) et 672 pas
+#   (semaine). Les régressions des retards candidats étant emboîtées, une seule
+#   décomposition QR donne la somme des carrés des résidus de tous les retards ;
+# - ACF par transformée de Fourier (tous les retards en une opération) et PACF
+#   par la récurrence de Durbin-Levinson sur l'ACF.
+# Les séries sont analysées en parallèle sur un pool de processus et les résultats
+# sont conservés en mémoire, indexés par l'empreinte des données.
+
+DIFFERENCES = (0, 1, 2)
+SEASONAL_LAGS = (96, 672)
+NLAGS = 700  # un peu plus d'une semaine de pas de 15 minutes
+CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def transforms(values):
+    """
+    Séries à tester : différences d'ordre d=0..2 et différences saisonnières.
+
+    Returns:
+        dict: Nom ('d=0', 'd=1', 'd=2', 'D=1 (96)', 'D=1 (672)') -> np.ndarray.
+    """
+    series = {f"d={d}": np.diff(values, n=d) for d in DIFFERENCES}
+    for lag in SEASONAL_LAGS:
+        series[f"D=1 ({lag})"] = values[lag:] - values[:-lag]
+    return series
+
+
+def adf_test(x, maxlag=None):
+    """
+    Test de Dickey-Fuller augmenté avec constante, retard choisi par AIC.
+
+    Même résultat que `statsmodels.tsa.stattools.adfuller(x, maxlag, autolag='AIC')` :
+    les régressions des retards 0..maxlag (même échantillon) sont évaluées en une
+    décomposition QR, puis le retard retenu est réestimé sur tout son échantillon.
+
+    Args:
+        x (np.ndarray): Série.
+        maxlag (int): Retard maximal (par défaut, 12 * (n / 100) ** (1 / 4)).
+
+    Returns:
+        dict: statistic, pvalue, usedlag, nobs, critical_values, stationary (p <= 0.05).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if maxlag is None:
+        maxlag = int(np.ceil(12 * (len(x) / 100) ** 0.25))
+    maxlag = max(0, min(len(x) // 2 - 2, maxlag))
+    dx = np.diff(x)
+
+    def design(lags):
+        # [constante, niveau retardé, différences retardées 1..lags], alignés sur dx[lags:]
+        n = len(dx) - lags
+        columns = [np.ones(n), x[lags:-1]] + [dx[lags - k:len(dx) - k] for k in range(1, lags + 1)]
+        return np.column_stack(columns), dx[lags:]
+
+    X, y = design(maxlag)
+    n = len(y)
+    q, _ = np.linalg.qr(X)
+    ssr = y @ y - np.cumsum((q.T @ y) ** 2)[1:]  # modèles à 2, 3, ..., maxlag + 2 colonnes
+    columns = np.arange(2, maxlag + 3)
+    aic = n * (np.log(2 * np.pi) + np.log(ssr / n) + 1) + 2 * columns
+    usedlag = int(np.argmin(aic))
+
+    X, y = design(usedlag)
+    beta, ssr, _, _ = np.linalg.lstsq(X, y, rcond=None)
+    sigma2 = ssr[0] / (len(y) - X.shape[1])
+    statistic = beta[1] / np.sqrt(sigma2 * np.linalg.inv(X.T @ X)[1, 1])
+    pvalue = float(mackinnonp(statistic, regression='c', N=1))
+    critical = mackinnoncrit(N=1, regression='c', nobs=len(y))
+    return {
+        "statistic": float(statistic),
+        "pvalue": pvalue,
+        "usedlag": usedlag,
+        "nobs": len(y),
+        "critical_values": dict(zip(("1%", "5%", "10%"), map(float, critical))),
+        "stationary": pvalue <= 0.05
+    }
+
+
+def acf(x, nlags=NLAGS):
+    """
+    Autocorrélations des retards 0..nlags par transformée de Fourier.
+
+    Estimateur biaisé (division par n), comme `statsmodels.tsa.stattools.acf`.
+    """
+    x = np.asarray(x, dtype=np.float64) - np.mean(x)
+    n = len(x)
+    size = 1 << int(2 * n - 1).bit_length()  # zéros ajoutés : pas de repliement circulaire
+    spectrum = np.fft.rfft(x, size)
+    autocovariance = np.fft.irfft(spectrum * np.conj(spectrum), size)[:min(nlags, n - 1) + 1]
+    return autocovariance / autocovariance[0]
+
+
+def pacf(autocorrelation):
+    """
+    Autocorrélations partielles par la récurrence de Durbin-Levinson.
+
+    Args:
+        autocorrelation (np.ndarray): ACF des retards 0..nlags (voir `acf`).
+
+    Returns:
+        np.ndarray: PACF des retards 0..nlags (1 au retard 0).
+    """
+    r = autocorrelation
+    nlags = len(r) - 1
+    partial = np.ones(nlags + 1)
+    phi = np.zeros(0)
+    variance = 1.0
+    for k in range(1, nlags + 1):
+        # Coefficients AR(k) à partir de ceux d'AR(k-1)
+        reflection = (r[k] - phi @ r[k - 1:0:-1]) / variance
+        phi = np.append(phi - reflection * phi[::-1], reflection)
+        variance *= 1 - reflection ** 2
+        partial[k] = reflection
+    return partial
+
+
+def analyze_series(values, nlags=NLAGS):
+    """
+    Tests ADF, ACF et PACF de toutes les transformations d'une série.
+
+    Args:
+        values (np.ndarray): Série sur une grille régulière, sans valeur manquante.
+        nlags (int): Nombre de retards de l'ACF et de la PACF.
+
+    Returns:
+        dict: {"n", "confidence" (bande à 95 %), "adf", "acf", "pacf"} ; les trois
+        derniers sont indexés par transformation.
+    """
+    result = {"n": len(values), "confidence": 1.96 / np.sqrt(len(values)), "adf": {}, "acf": {}, "pacf": {}}
+    for name, series in transforms(values).items():
+        autocorrelation = acf(series, nlags)
+        result["adf"][name] = adf_test(series)
+        result["acf"][name] = autocorrelation.tolist()
+        result["pacf"][name] = pacf(autocorrelation).tolist()
+    return result
+
+
+def _init_worker():
+    threadpool_limits(1)
+
+
+def _analyze_task(task):
+    values, nlags = task
+    return analyze_series(values, nlags)
+
+
+def _groups(data, columns, by_year):
+    # (colonne, période, valeurs) : série complète, puis une par année
+    frame, _, _ = to_regular_grid(data[list(columns)])
+    filled = fill_gaps(frame.to_numpy(dtype=np.float64))
+    years = frame.index.year.to_numpy()
+    for j, column in enumerate(columns):
+        periods = [("all", slice(None))]
+        if by_year:
+            periods += [(str(year), years == year) for year in np.unique(years)]
+        for period, mask in periods:
+            values = filled[mask, j]
+            index = frame.index[mask]
+            keep = ~np.isnan(values)
+            if keep.sum() > 2 * max(SEASONAL_LAGS):
+                yield column, period, index[keep], values[keep]
+
+
+@instrument(counts=lambda result, *args, **kwargs: {"rows": len(result)})
+def analyze(data, columns=('Consommation',), by_year=True, nlags=NLAGS, max_workers=None):
+    """
+    Analyse de stationnarité et d'autocorrélation de plusieurs séries, en parallèle.
+
+    Args:
+        data (pd.DataFrame): Données indexées par datetime (voir `load_consumption_data`).
+        columns (tuple): Colonnes à analyser.
+        by_year (bool): Analyser aussi chaque année séparément.
+        nlags (int): Nombre de retards de l'ACF et de la PACF.
+        max_workers (int): Nombre de processus (par défaut, tous les cœurs ; 1 pour
+            tout calculer dans le processus courant).
+
+    Returns:
+        list: Un dict par série : column, period ('all' ou l'année), start, end,
+        puis les résultats de `analyze_series`.
+    """
+    entries, missing = [], []
+    for column, period, index, values in _groups(data, columns, by_year):
+        key = data_fingerprint(values, {"nlags": nlags})
+        with _lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+        entries.append(({"column": column, "period": period, "start": str(index[0]), "end": str(index[-1])}, key, cached))
+        if cached is None:
+            missing.append((key, values))
+
+    tasks = [(values, nlags) for _, values in missing]
+    max_workers = min(len(tasks), max_workers or os.cpu_count())
+    # Déjà dans un processus du pool, ou une seule série : pas de pool
+    if max_workers <= 1 or multiprocessing.parent_process() is not None:
+        computed = [_analyze_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            computed = list(executor.map(_analyze_task, tasks))
+
+    fresh = {key: result for (key, _), result in zip(missing, computed)}
+    with _lock:
+        for key, result in fresh.items():
+            _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return [{**meta, **(cached if cached is not None else fresh[key])} for meta, key, cached in entries]
+
+
+def adf_table(results):
+    """Résultats ADF de `analyze` sous forme de tableau (une ligne par série et transformation)."""
+    rows = [
+        {"colonne": r["column"], "période": r["period"], "transformation": name, **{k: v for k, v in test.items() if k != "critical_values"}}
+        for r in results for name, test in r["adf"].items()
+    ]
+    return pd.DataFrame(rows)
@@ -0,0 +1,169 @@
+import contextlib
+import io
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from backend.training import EXOG_MODELS, MODEL_CHOICES, fourier_terms, train_model
+
+# Backtest à origines glissantes.
+#
+# Une origine par jour (10:15 par défaut, comme `cutoff_date` dans training.main),
+# horizon de 96 pas. Les origines sont réparties en blocs contigus sur un pool de
+# processus : chaque bloc ajuste le modèle une seule fois, puis avance d'une origine
+# à l'autre avec `SARIMAXResults.extend` (mêmes paramètres, filtrage des seules
+# nouvelles observations) au lieu de réajuster.
+
+EXOG_COLUMNS = ['PrévisionsJ-1', 'PrévisionsJ']
+
+_data = None
+
+
+def rolling_origins(index, at="10:15", horizon=96, min_train=96 * 28, start=None, end=None):
+    """
+    Positions des origines de prévision : un instant par jour.
+
+    Args:
+        index (pd.DatetimeIndex): Index des données (pas de 15 minutes).
+        at (str): Heure de l'origine, au format HH:MM.
+        horizon (int): Nombre de pas prévus à chaque origine.
+        min_train (int): Nombre minimal de pas d'entraînement.
+        start (str): Première origine autorisée.
+        end (str): Dernière origine autorisée.
+
+    Returns:
+        np.ndarray: Nombre de pas d'entraînement de chaque origine (origine incluse).
+    """
+    hour, minute = map(int, at.split(":"))
+    mask = (index.hour == hour) & (index.minute == minute)
+    if start is not None:
+        mask &= index >= pd.Timestamp(start)
+    if end is not None:
+        mask &= index <= pd.Timestamp(end)
+    positions = np.flatnonzero(mask) + 1
+    return positions[(positions >= min_train) & (positions + horizon <= len(index))]
+
+
+def _init_worker(data):
+    global _data
+    _data = data
+    threadpool_limits(1)
+
+
+def _exog(model_type, start, stop, offset):
+    """Variables exogènes des pas [start, stop) ; `offset` est le début de l'entraînement."""
+    if model_type in EXOG_MODELS:
+        return _data[EXOG_COLUMNS].iloc[start:stop]
+    if model_type == 'fourier':
+        # train_model calcule les termes de Fourier à partir de la position 0
+        return fourier_terms(start - offset, stop - start)
+    return None
+
+
+def _run_chunk(model_type, positions, horizon, train_window):
+    """Ajuste une fois sur la première origine du bloc, puis étend le modèle."""
+    series = _data['Consommation']
+    forecasts = np.empty((len(positions), horizon))
+    timings = {"fit": 0.0, "extend": 0.0, "forecast": 0.0}
+
+    first = positions[0]
+    train_start = max(0, first - train_window) if train_window else 0
+    start = time.perf_counter()
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter("ignore")
+        exog = _exog(model_type, train_start, first, train_start) if model_type in EXOG_MODELS else None
+        model, _, _ = train_model(MODEL_CHOICES[model_type], series.iloc[train_start:first], exog)
+    results = model.arima_res_ if model_type == 'auto_arima' else model
+    timings["fit"] += time.perf_counter() - start
+
+    previous = first
+    for i, position in enumerate(positions):
+        start = time.perf_counter()
+        if position > previous:
+            new_exog = _exog(model_type, previous, position, train_start)
+            results = results.extend(series.iloc[previous:position].to_numpy(), exog=new_exog)
+            previous = position
+        timings["extend"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        future_exog = _exog(model_type, position, position + horizon, train_start)
+        forecasts[i] = np.asarray(results.forecast(horizon, exog=future_exog))
+        timings["forecast"] += time.perf_counter() - start
+    return forecasts, timings
+
+
+def _error_table(errors):
+    steps = np.arange(1, errors.shape[1] + 1)
+    return pd.DataFrame({
+        "MAE": np.nanmean(np.abs(errors), axis=0),
+        "RMSE": np.sqrt(np.nanmean(errors ** 2, axis=0))
+    }, index=pd.Index(steps, name="horizon"))
+
+
+def backtest(data, model_type='sarima', horizon=96, at="10:15", min_train=96 * 28,
+             train_window=None, start=None, end=None, max_workers=None):
+    """
+    Évalue un modèle sur de nombreuses origines glissantes, en parallèle.
+
+    Args:
+        data (pd.DataFrame): Données prétraitées (voir `filter_data`).
+        model_type (str): 'auto_arima', 'sarima', 'sarimax', 'fourier', 'gbm', 'hierarchical' ou 'per_slot'.
+        horizon (int): Nombre de pas prévus à chaque origine.
+        at (str): Heure des origines (HH:MM).
+        min_train (int): Nombre minimal de pas d'entraînement.
+        train_window (int): Nombre de pas utilisés pour l'ajustement initial de
+            chaque bloc (par défaut, tout l'historique).
+        start (str): Première origine autorisée.
+        end (str): Dernière origine autorisée.
+        max_workers (int): Nombre de processus (par défaut, tous les cœurs).
+
+    Returns:
+        dict: Tables MAE/RMSE par horizon pour le modèle et les prévisions RTE,
+        prévisions brutes et durées cumulées.
+    """
+    if model_type not in MODEL_CHOICES:
+        raise ValueError(f"Type de modèle inconnu : {model_type}")
+    positions = rolling_origins(data.index, at, horizon, min_train, start, end)
+    if len(positions) == 0:
+        raise ValueError("Aucune origine de prévision dans la période demandée")
+
+    max_workers = min(len(positions), max_workers or os.cpu_count())
+    chunks = np.array_split(positions, max_workers)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(data,)) as executor:
+        futures = [executor.submit(_run_chunk, model_type, chunk, horizon, train_window) for chunk in chunks]
+        outputs = [future.result() for future in futures]
+    forecasts = np.vstack([forecast for forecast, _ in outputs])
+    timings = {key: sum(t[key] for _, t in outputs) for key in outputs[0][1]}
+
+    # Valeurs réelles et prévisions RTE sur la même grille (origine, horizon)
+    targets = positions[:, None] + np.arange(horizon)
+    actual = data['Consommation'].to_numpy()[targets]
+    tables = {"modèle": _error_table(forecasts - actual)}
+    for column in EXOG_COLUMNS:
+        if column in data.columns:
+            tables[column] = _error_table(data[column].to_numpy()[targets] - actual)
+
+    return {
+        "origins": data.index[positions - 1],
+        "forecasts": forecasts,
+        "errors": pd.concat(tables, axis=1),
+        "timings": timings
+    }
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from backend.chargement_donnes import load_consumption_data
+    from backend.training import filter_data
+
+    DATA_DIR = Path(__file__).parent.parent / "data"
+    data = filter_data(load_consumption_data(str(DATA_DIR)), "2025-02-24 10:15:00")
+    report = backtest(data, 'fourier', train_window=96 * 28, start="2025-01-01")
+    print(report["errors"].iloc[[0, 3, 11, 47, 95]])
+    print(report["errors"].mean())
+    print(report["timings"])
@@ -1,34 +1,582 @@
+import glob
+import json
+import numpy as np
 import pandas as pd
 import os
 from pathlib import Path
-def load_consumption_data(path): 
+
+from backend.instrumentation import instrument, rows
+
+# Cache binaire (colonnes float64 + index int64, lus par memory-map)
+CACHE_DIRNAME = "cache"
+INDEX_FILE = "index.i8"
+VALUES_FILE = "values.f8"
+META_FILE = "meta.json"
+
+# Agrégats multi-résolutions : niveau -> (largeur d'un seau, décalage de l'origine)
+# en secondes ; les semaines commencent le lundi (le 1er janvier 1970 est un jeudi).
+ROLLUP_LEVELS = {"hourly": (3600, 0), "daily": (86400, 0), "weekly": (7 * 86400, 4 * 86400)}
+ROLLUP_STATS = ("count", "sum", "min", "max")
+
+# Températures moyennes journalières en France (colonnes Date, TMoy (°C))
+TEMPERATURE_FILE = Path(__file__).parent.parent / "temperature_moyenne_journaliere_france.xlsx"
+
+def _source_signature(files):
+    """Retourne (mtime, taille) de chaque fichier source, pour invalider le cache."""
+    signature = {}
+    for file in files:
+        stat = os.stat(file)
+        signature[os.path.basename(file)] = [stat.st_mtime_ns, stat.st_size]
+    return signature
+
+def discover_data_files(path):
     """
-    Charge et combine les données de consommation énergétique depuis plusieurs fichiers CSV.
+    Liste les fichiers `energy_data*.csv` présents dans le répertoire de données.
 
     Args:
         path (str): Chemin vers le répertoire contenant les fichiers de données.
 
     Returns:
-        pd.Series: Série temporelle de la consommation énergétique triée par datetime.
+        list: Chemins des fichiers, triés par nom.
+    """
+    return sorted(glob.glob(os.path.join(path, 'energy_data*.csv')))
+
+def _is_structured_csv(file):
+    # Les CSV structurés commencent par l'en-tête « datetime;... »
+    with open(file, encoding='utf-8-sig', errors='replace') as f:
+        return f.readline().startswith('datetime')
+
+def read_data_file(file):
     """
-    files = [
-        os.path.join(path, 'energy_data2023.csv'),
-        os.path.join(path, 'energy_data2024.csv'),
-        os.path.join(path, 'energy_data2025.csv')
-    ]
+    Lit un fichier de données RTE : CSV `;` structuré (colonne `datetime`),
+    export CSV brut en blocs « Journée du ... » ou classeur Excel RTE.
 
+    Args:
+        file (str): Chemin du fichier.
+
+    Returns:
+        pd.DataFrame: Données indexées par datetime, en float64.
+    """
+    if str(file).lower().endswith(('.xlsx', '.xls')):
+        df = read_rte_excel(file)
+    elif not _is_structured_csv(file):
+        df = read_rte_day_block_csv(file)
+    else:
+        df = pd.read_csv(file, sep=';', parse_dates=['datetime'], dayfirst=True)
+        df.set_index('datetime', inplace=True)
+    return df.apply(pd.to_numeric, errors='coerce').astype(np.float64)
+
+def parse_rte_day_blocks(raw):
+    """
+    Convertit un export RTE découpé en blocs « Journée du jj/mm/aaaa ».
+
+    Chaque bloc commence par une ligne « Journée du ... » suivie des lignes
+    horaires (« 0:00 », « 0:15 », ... ou objets `time` dans les classeurs Excel).
+    Deux lignes vides consécutives terminent le bloc courant. Le traitement est
+    entièrement vectorisé : une seule expression régulière sur la première
+    colonne, un unique `pd.to_datetime` sur les dates de blocs, propagées aux
+    lignes horaires par `ffill`.
+
+    Args:
+        raw (pd.DataFrame): Fichier brut lu sans en-tête (colonnes 0 à 3).
+
+    Returns:
+        pd.DataFrame: Données indexées par datetime, mêmes colonnes que
+        `load_consumption_data`.
+    """
+    first = raw.iloc[:, 0]
+    parts = first.astype(str).str.extract(
+        r'^(?:Journée du (?P<day>\d{2}/\d{2}/\d{4})'
+        r'|(?:.*\s)?(?P<hour>\d{1,2}):(?P<minute>\d{2})(?::\d{2})?)$'
+    )
+
+    # Date du bloc (en jours) propagée aux lignes suivantes, remise à zéro par deux lignes vides
+    day = pd.to_datetime(parts['day'], format='%d/%m/%Y', errors='coerce')
+    day = pd.Series(
+        np.where(day.isna(), np.nan, day.to_numpy().astype('datetime64[D]').astype(np.float64)),
+        index=first.index
+    )
+    blank = first.isna()
+    day[blank & blank.shift(-1, fill_value=False)] = np.inf
+    day = day.ffill().replace(np.inf, np.nan)
+
+    rows = (parts['hour'].notna() & day.notna()).to_numpy()
+    minutes = (
+        day[rows].to_numpy().astype(np.int64) * 1440
+        + parts.loc[rows, 'hour'].astype(np.int64).to_numpy() * 60
+        + parts.loc[rows, 'minute'].astype(np.int64).to_numpy()
+    )
+    values = raw.loc[rows, raw.columns[1:4]].apply(pd.to_numeric, errors='coerce')
+    return pd.DataFrame(
+        values.to_numpy(dtype=np.float64),
+        index=pd.DatetimeIndex(minutes.astype('datetime64[m]').astype('datetime64[ns]'), name='datetime'),
+        columns=['PrévisionsJ-1', 'PrévisionsJ', 'Consommation']
+    )
+
+def read_rte_excel(file):
+    """
+    Lit un classeur Excel RTE au format « Journée du ... ».
+
+    Args:
+        file (str): Chemin du classeur.
+
+    Returns:
+        pd.DataFrame: Données indexées par datetime.
+    """
+    return parse_rte_day_blocks(pd.read_excel(file, header=None, engine='openpyxl'))
+
+def read_rte_day_block_csv(file):
+    """
+    Lit un export CSV RTE au format « Journée du ... ».
+
+    Args:
+        file (str): Chemin du fichier.
+
+    Returns:
+        pd.DataFrame: Données indexées par datetime.
+    """
+    return parse_rte_day_blocks(pd.read_csv(
+        file, header=None, names=range(4), usecols=range(4),
+        dtype=str, keep_default_na=False, na_values=['']
+    ))
+
+def _read_csv_files(files):
     # Charger et combiner les fichiers
-    dfs = [pd.read_csv(file, sep=';', parse_dates=['datetime'], dayfirst=True) for file in files]
-    combined_df = pd.concat(dfs, ignore_index=True)
-    combined_df = combined_df.sort_values(by='datetime')
-    combined_df.set_index('datetime', inplace=True)
+    dfs = [read_data_file(file) for file in files]
+    combined_df = pd.concat(dfs)
+    combined_df = combined_df[~combined_df.index.duplicated(keep='last')]
+    combined_df = combined_df.sort_index(kind='stable')
+    # Même résolution que le cache binaire (int64 en nanosecondes), quelle que soit la version de pandas
+    combined_df.index = combined_df.index.as_unit('ns')
+    return combined_df
+
+def write_cache(cache_dir, df, sources, ingested=()):
+    """
+    Écrit le DataFrame dans le cache binaire.
+
+    Args:
+        cache_dir (str/Path): Répertoire du cache.
+        df (pd.DataFrame): Données indexées par datetime.
+        sources (dict): Signature des fichiers sources.
+        ingested (list): Fichiers ingérés hors du répertoire de données.
+    """
+    cache_dir = Path(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    index = df.index.values.astype('datetime64[ns]').view(np.int64)
+    values = np.ascontiguousarray(df.to_numpy(dtype=np.float64))
+    _replace_file(cache_dir / INDEX_FILE, index)
+    _replace_file(cache_dir / VALUES_FILE, values)
+    rollups = {level: _write_rollup(cache_dir, level, *compute_rollup(index, values, level)) for level in ROLLUP_LEVELS}
+    _write_meta(cache_dir, {
+        "columns": list(df.columns), "rows": len(df),
+        "sources": sources, "ingested": list(ingested), "rollups": rollups
+    })
+
+def _replace_file(path, *parts):
+    # Nouveau fichier puis renommage atomique : les memory-maps ouverts gardent l'ancien
+    # fichier intact (le tronquer sous leurs pieds provoquerait un SIGBUS à la lecture)
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "wb") as f:
+        for part in parts:
+            np.ascontiguousarray(part).tofile(f)
+    os.replace(tmp_path, path)
+
+def _write_meta(cache_dir, meta):
+    # Les métadonnées sont écrites en dernier : elles valident le cache
+    tmp_path = cache_dir / (META_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_dir / META_FILE)
+
+def read_cache(cache_dir):
+    """
+    Lit le cache binaire sans copie (memory-map en copy-on-write).
+
+    Args:
+        cache_dir (str/Path): Répertoire du cache.
+
+    Returns:
+        tuple: (pd.DataFrame, métadonnées) ou (None, None) si le cache est absent.
+    """
+    cache_dir = Path(cache_dir)
+    try:
+        with open(cache_dir / META_FILE, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    meta.setdefault("ingested", [])
+    rows, columns = meta["rows"], meta["columns"]
+    if rows == 0:
+        return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name='datetime')), meta
+    index = np.memmap(cache_dir / INDEX_FILE, dtype=np.int64, mode='c', shape=(rows,))
+    values = np.memmap(cache_dir / VALUES_FILE, dtype=np.float64, mode='c', shape=(rows, len(columns)))
+    df = pd.DataFrame(
+        values,
+        index=pd.DatetimeIndex(index.view('datetime64[ns]'), name='datetime'),
+        columns=columns,
+        copy=False
+    )
+    return df, meta
+
+def data_version(path):
+    """
+    Version des données du cache binaire (date de modification des métadonnées).
+
+    Elle change à chaque ingestion ou reconstruction du cache.
+
+    Args:
+        path (str): Chemin vers le répertoire contenant les fichiers de données.
+
+    Returns:
+        int: Version (0 si le cache n'existe pas).
+    """
+    try:
+        return os.stat(Path(path) / CACHE_DIRNAME / META_FILE).st_mtime_ns
+    except OSError:
+        return 0
+
+def ingest_frame(path, new_df, sources=None, ingested=None):
+    """
+    Ajoute de nouvelles lignes au cache binaire.
+
+    Les horodatages déjà présents sont mis à jour sur place (les valeurs
+    manquantes des nouvelles lignes ne remplacent pas les valeurs connues), les
+    horodatages postérieurs à la dernière ligne sont ajoutés en fin de fichier.
+    Le coût est donc proportionnel au nombre de nouvelles lignes ; seule
+    l'insertion d'horodatages au milieu de l'historique impose une réécriture.
+
+    Args:
+        path (str): Chemin vers le répertoire contenant les fichiers de données.
+        new_df (pd.DataFrame): Nouvelles données indexées par datetime.
+        sources (dict): Signatures de fichiers sources à enregistrer.
+        ingested (str): Fichier externe à enregistrer parmi les fichiers ingérés.
+
+    Returns:
+        int: Nombre de lignes ajoutées.
+    """
+    cache_dir = Path(path) / CACHE_DIRNAME
+    df, meta = read_cache(cache_dir)
+    if df is None:
+        raise ValueError(f"Aucun cache dans {cache_dir} : appeler load_consumption_data d'abord")
+
+    # Dédoublonnage et tri des seules nouvelles lignes
+    new_df = new_df.reindex(columns=meta["columns"]).astype(np.float64)
+    new_df = new_df[~new_df.index.duplicated(keep='last')]
+    if not new_df.index.is_monotonic_increasing:
+        new_df = new_df.sort_index(kind='stable')
+    meta["sources"].update(sources or {})
+    if ingested and ingested not in meta["ingested"]:
+        meta["ingested"].append(ingested)
+
+    new_index = new_df.index.values.astype('datetime64[ns]').view(np.int64)
+    new_values = new_df.to_numpy()
+    index = df.index.values.view(np.int64)
+    rows = meta["rows"]
+    pos = np.searchsorted(index, new_index)
+    exists = pos < rows
+    exists[exists] = index[pos[exists]] == new_index[exists]
+    appended = ~exists
+    if rows and appended.any() and new_index[appended][0] <= index[-1]:
+        # Horodatages à insérer dans l'historique : réécriture complète
+        merged = new_df.combine_first(df)
+        write_cache(cache_dir, merged, meta["sources"], meta["ingested"])
+        return len(merged) - rows
+
+    if exists.any():
+        values = np.memmap(cache_dir / VALUES_FILE, dtype=np.float64, mode='r+', shape=(rows, len(meta["columns"])))
+        old_values = values[pos[exists]]
+        update = new_values[exists]
+        values[pos[exists]] = np.where(np.isnan(update), old_values, update)
+        values.flush()
+        del values
+    if appended.any():
+        with open(cache_dir / INDEX_FILE, 'ab') as f:
+            new_index[appended].tofile(f)
+        with open(cache_dir / VALUES_FILE, 'ab') as f:
+            np.ascontiguousarray(new_values[appended]).tofile(f)
+    meta["rows"] = rows + int(appended.sum())
+    # Seuls les seaux touchés par les nouvelles lignes (et les suivants) sont recalculés
+    meta["rollups"] = update_rollups(cache_dir, meta, int(new_index.min()))
+    _write_meta(cache_dir, meta)
+    return int(appended.sum())
+
+def _rollup_files(cache_dir, level):
+    return Path(cache_dir) / f"rollup_{level}.i8", Path(cache_dir) / f"rollup_{level}.f8"
+
+def compute_rollup(index, values, level):
+    """
+    Agrège des lignes triées par seaux (heure, jour ou semaine), sans boucle.
+
+    Args:
+        index (np.ndarray): Horodatages int64 (ns), triés.
+        values (np.ndarray): Valeurs (lignes, colonnes).
+        level (str): Niveau de `ROLLUP_LEVELS`.
+
+    Returns:
+        tuple: (début de chaque seau en int64 ns, statistiques (seaux, 4, colonnes)
+        dans l'ordre de `ROLLUP_STATS`).
+    """
+    width, offset = (np.int64(x * 10**9) for x in ROLLUP_LEVELS[level])
+    keys = (index - offset) // width
+    if len(keys) == 0:
+        return keys, np.empty((0, len(ROLLUP_STATS), values.shape[1]))
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    missing = np.isnan(values)
+    stats = np.stack([
+        np.add.reduceat(~missing, starts, axis=0).astype(np.float64),
+        np.add.reduceat(np.where(missing, 0.0, values), starts, axis=0),
+        np.fmin.reduceat(values, starts, axis=0),
+        np.fmax.reduceat(values, starts, axis=0)
+    ], axis=1)
+    return keys[starts] * width + offset, stats
+
+def _write_rollup(cache_dir, level, buckets, stats, keep=0):
+    # Garde les `keep` premiers seaux et écrit les suivants à la place de l'ancienne fin
+    index_file, values_file = _rollup_files(cache_dir, level)
+    row_bytes = int(np.prod(stats.shape[1:])) * 8
+    for file, data, size in ((index_file, buckets, 8), (values_file, stats, row_bytes)):
+        kept = np.fromfile(file, dtype=np.uint8, count=keep * size) if keep else np.empty(0, dtype=np.uint8)
+        _replace_file(file, kept, data)
+    return keep + len(buckets)
+
+def update_rollups(cache_dir, meta, since):
+    """
+    Met à jour les agrégats après l'ingestion de lignes postérieures à `since`.
+
+    Les seaux antérieurs au seau contenant `since` sont conservés ; les autres
+    sont recalculés à partir du cache brut. Le coût est proportionnel aux
+    lignes concernées (le plus souvent, la fin de l'historique).
+
+    Args:
+        cache_dir (str/Path): Répertoire du cache.
+        meta (dict): Métadonnées du cache (lignes, colonnes, agrégats).
+        since (int): Plus ancien horodatage modifié (int64 ns).
+
+    Returns:
+        dict: Nombre de seaux de chaque niveau.
+    """
+    rows, columns = meta["rows"], len(meta["columns"])
+    index = np.memmap(Path(cache_dir) / INDEX_FILE, dtype=np.int64, mode='r', shape=(rows,))
+    values = np.memmap(Path(cache_dir) / VALUES_FILE, dtype=np.float64, mode='r', shape=(rows, columns))
+    counts = {}
+    for level, (width, offset) in ROLLUP_LEVELS.items():
+        buckets = meta.get("rollups", {}).get(level)
+        index_file, _ = _rollup_files(cache_dir, level)
+        if buckets is None or not index_file.exists():
+            counts[level] = _write_rollup(cache_dir, level, *compute_rollup(index, values, level))
+            continue
+        width, offset = width * 10**9, offset * 10**9
+        first = (since - offset) // width * width + offset
+        old_buckets = np.fromfile(index_file, dtype=np.int64, count=buckets)
+        keep = int(np.searchsorted(old_buckets, first))
+        lo = int(np.searchsorted(index, first))
+        counts[level] = _write_rollup(cache_dir, level, *compute_rollup(index[lo:], values[lo:], level), keep=keep)
+    return counts
+
+def load_rollup(path, level):
+    """
+    Lit les agrégats d'un niveau (horaire, journalier ou hebdomadaire).
+
+    Les agrégats sont maintenus avec le cache binaire : ils sont reconstruits
+    s'ils manquent et mis à jour à chaque ingestion.
+
+    Args:
+        path (str): Chemin vers le répertoire contenant les fichiers de données.
+        level (str): 'hourly', 'daily' ou 'weekly'.
+
+    Returns:
+        pd.DataFrame: Index = début du seau ; colonnes (statistique, variable)
+        avec les statistiques count, sum, mean, min et max.
+    """
+    if level not in ROLLUP_LEVELS:
+        raise ValueError(f"Niveau d'agrégation inconnu : {level}")
+    cache_dir = Path(path) / CACHE_DIRNAME
+    _, meta = read_cache(cache_dir)
+    if meta is None:
+        load_consumption_data(path)
+        _, meta = read_cache(cache_dir)
+    if level not in meta.get("rollups", {}) or not _rollup_files(cache_dir, level)[0].exists():
+        meta["rollups"] = update_rollups(cache_dir, {**meta, "rollups": {}}, 0)
+        _write_meta(cache_dir, meta)
+    buckets = meta["rollups"][level]
+    index_file, values_file = _rollup_files(cache_dir, level)
+    columns = meta["columns"]
+    index = np.fromfile(index_file, dtype=np.int64, count=buckets)
+    stats = np.fromfile(values_file, dtype=np.float64, count=buckets * len(ROLLUP_STATS) * len(columns))
+    stats = stats.reshape(buckets, len(ROLLUP_STATS), len(columns))
+    frames = {name: stats[:, i] for i, name in enumerate(ROLLUP_STATS)}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        frames["mean"] = frames["sum"] / frames["count"]
+    index = pd.DatetimeIndex(index.view('datetime64[ns]'), name='datetime')
+    return pd.concat(
+        {name: pd.DataFrame(frames[name], index=index, columns=columns) for name in ("count", "sum", "mean", "min", "max")},
+        axis=1
+    )
+
+def load_rollups(path):
+    """Agrégats de tous les niveaux : niveau -> DataFrame (voir `load_rollup`)."""
+    return {level: load_rollup(path, level) for level in ROLLUP_LEVELS}
+
+def ingest_file(file, path):
+    """
+    Ingère un fichier de données (CSV ou Excel RTE) dans le cache binaire.
+
+    Args:
+        file (str): Fichier à ingérer.
+        path (str): Chemin vers le répertoire contenant les fichiers de données.
+
+    Returns:
+        int: Nombre de lignes ajoutées.
+    """
+    file = os.path.abspath(file)
+    if file in map(os.path.abspath, discover_data_files(path)):
+        return ingest_frame(path, read_data_file(file), sources=_source_signature([file]))
+    return ingest_frame(path, read_data_file(file), ingested=file)
+
+@instrument(counts=rows)
+def load_consumption_data(path, use_cache=True, compact=False):
+    """
+    Charge et combine les données de consommation énergétique depuis plusieurs fichiers CSV.
+
+    Tous les fichiers `energy_data*.csv` du répertoire sont pris en compte. Le
+    résultat est conservé dans un cache binaire (`<path>/cache`) : un nouveau
+    fichier y est ingéré seul ; si un fichier déjà présent a été modifié (date de
+    modification ou taille) ou a disparu, le cache est reconstruit.
+
+    Args:
+        path (str): Chemin vers le répertoire contenant les fichiers de données.
+        use_cache (bool): Utiliser (et mettre à jour) le cache binaire.
+        compact (bool): Retourner une `CompactFrame` (float32, grille régulière).
+
+    Returns:
+        pd.DataFrame: Données de consommation énergétique triées par datetime.
+    """
+    if compact:
+        return CompactFrame.from_frame(load_consumption_data(path, use_cache))
+    files = discover_data_files(path)
+    if not use_cache:
+        return _read_csv_files(files)
+
+    cache_dir = os.path.join(path, CACHE_DIRNAME)
+    sources = _source_signature(files)
+    cached_df, meta = read_cache(cache_dir)
+    # Fichiers déjà dans le cache et inchangés : seuls les nouveaux fichiers sont ingérés
+    if cached_df is not None and all(sources.get(name) == signature for name, signature in meta["sources"].items()):
+        if meta["sources"] == sources:
+            return cached_df
+        del cached_df
+        for file in files:
+            name = os.path.basename(file)
+            if name not in meta["sources"]:
+                ingest_frame(path, read_data_file(file), sources={name: sources[name]})
+        return read_cache(cache_dir)[0]
+
+    # Fichier modifié ou disparu : ses anciennes lignes (supprimées ou vidées depuis)
+    # ne doivent pas survivre dans le cache, qui est reconstruit
+
+    ingested = [file for file in (meta or {}).get("ingested", []) if os.path.exists(file)]
+    combined_df = _read_csv_files(files + ingested)
+    write_cache(cache_dir, combined_df, sources, ingested)
 
     # Retourner tout le DataFrame
     return combined_df
 
+class CompactFrame:
+    """
+    Représentation compacte des données sur une grille régulière.
+
+    L'index n'est pas stocké : seuls le premier horodatage et le pas le sont
+    (la position i correspond à `start + i * step`). Les valeurs sont en
+    float32 (moitié de la mémoire du float64, précision largement suffisante
+    pour des MW) et les pas absents ou vides sont marqués dans un masque de bits
+    (un bit par valeur). Les DataFrames produits sont des vues sur les valeurs.
+
+    Args:
+        start (pd.Timestamp): Premier horodatage.
+        step (pd.Timedelta): Pas de la grille.
+        values (np.ndarray): Valeurs float32 (n, nombre de colonnes), NaN si absentes.
+        columns (list): Noms des colonnes.
+    """
+
+    def __init__(self, start, step, values, columns):
+        self.start = pd.Timestamp(start)
+        self.step = pd.Timedelta(step)
+        self.values = values
+        self.columns = list(columns)
+        self.missing = np.packbits(np.isnan(values), axis=0)
+
+    @classmethod
+    def from_frame(cls, df, step='15min'):
+        """
+        Place un DataFrame indexé par datetime sur la grille régulière (une seule passe).
+
+        Les horodatages hors grille sont ignorés, les pas absents valent NaN.
+        """
+        step = pd.Timedelta(step)
+        if len(df) == 0:
+            return cls(pd.Timestamp(0), step, np.empty((0, df.shape[1]), dtype=np.float32), df.columns)
+        ticks = df.index.values.astype('datetime64[ns]').view(np.int64)
+        offsets, remainder = np.divmod(ticks - ticks[0], step.value)
+        on_grid = remainder == 0
+        values = np.full((offsets[-1] + 1, df.shape[1]), np.nan, dtype=np.float32)
+        values[offsets[on_grid]] = df.to_numpy(dtype=np.float32)[on_grid]
+        return cls(df.index[0], step, values, df.columns)
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def index(self):
+        """Index de la grille (calculé à la demande)."""
+        return pd.date_range(self.start, periods=len(self), freq=self.step, name='datetime')
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les valeurs et le masque, en octets."""
+        return self.values.nbytes + self.missing.nbytes
+
+    def is_missing(self, column):
+        """Masque booléen des valeurs absentes d'une colonne."""
+        bits = self.missing[:, self.columns.index(column)]
+        return np.unpackbits(bits, count=len(self)).astype(bool)
+
+    def position(self, time, side='left'):
+        """Position d'un horodatage dans la grille (bornée à [0, len])."""
+        offset = (pd.Timestamp(time) - self.start) / self.step
+        offset = np.ceil(offset) if side == 'left' else np.floor(offset) + 1
+        return int(min(max(offset, 0), len(self)))
+
+    def slice(self, start=None, end=None):
+        """Sous-période [start, end] (bornes incluses), sans copie des valeurs."""
+        lo = 0 if start is None else self.position(start, 'left')
+        hi = len(self) if end is None else self.position(end, 'right')
+        return CompactFrame(self.start + lo * self.step, self.step, self.values[lo:hi], self.columns)
+
+    def to_frame(self):
+        """DataFrame float32 dont les colonnes sont des vues sur `values`."""
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns, copy=False)
+
+def load_temperature(file=TEMPERATURE_FILE):
+    """
+    Charge les températures moyennes journalières.
+
+    Args:
+        file (str): Classeur Excel (colonnes « Date » et « TMoy (°C) »).
+
+    Returns:
+        pd.Series: Température moyenne (float64) indexée par jour.
+    """
+    df = pd.read_excel(file)
+    temperature = pd.Series(
+        df['TMoy (°C)'].to_numpy(dtype=np.float64),
+        index=pd.DatetimeIndex(df['Date']).normalize(),
+        name='Temperature'
+    )
+    return temperature[~temperature.index.duplicated(keep='last')].sort_index()
+
 if __name__ == '__main__':
  PROJECT_ROOT = Path(__file__).parent.parent
  DATA_DIR = PROJECT_ROOT / "data"
  data_path = str(DATA_DIR)
  h = load_consumption_data(data_path)
- print (h.head())
\ No newline at end of file
+ print (h.head())
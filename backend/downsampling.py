@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+# Sous-échantillonnage côté serveur des séries affichées.
+#
+# Une pyramide de résolutions (15 min, horaire, journalière) conserve pour chaque
+# niveau la moyenne, le minimum et le maximum de chaque variable. Un graphique ne
+# lit que le niveau le plus grossier suffisant pour la largeur demandée, puis
+# réduit les points à un couple (min, max) par pixel : les pics restent visibles.
+
+LEVELS = [("15min", None), ("1h", "1h"), ("1D", "1D")]
+# Niveaux de la pyramide -> niveaux des agrégats de backend.chargement_donnes
+ROLLUP_LEVELS = {"1h": "hourly", "1D": "daily"}
+
+
+def build_pyramid(df, columns=None, rollups=None):
+    """
+    Précalcule les agrégats multi-résolutions d'un DataFrame indexé par datetime.
+
+    Args:
+        df (pd.DataFrame): Données au pas de 15 minutes, index trié.
+        columns (list): Colonnes à agréger (par défaut, toutes).
+        rollups (dict): Agrégats déjà maintenus (`load_rollups`) : ils
+            remplacent le rééchantillonnage des niveaux horaire et journalier.
+
+    Returns:
+        dict: Niveau -> {"time": horodatages int64 (ns), colonne: {"mean", "min", "max"}}.
+    """
+    columns = list(columns or df.columns)
+    pyramid = {}
+    for level, rule in LEVELS:
+        if rule is None:
+            # Niveau brut : vues sur les colonnes (float64 ou float32), sans copie
+            time = df.index.values.astype('datetime64[ns]', copy=False).view(np.int64)
+            stats = {col: {"mean": df[col].to_numpy()} for col in columns}
+            for col in columns:
+                stats[col]["min"] = stats[col]["max"] = stats[col]["mean"]
+        elif rollups is not None:
+            agg = rollups[ROLLUP_LEVELS[level]]
+            time = agg.index.values.astype('datetime64[ns]').view(np.int64)
+            stats = {col: {name: agg[name][col].to_numpy(dtype=np.float64) for name in ("mean", "min", "max")} for col in columns}
+        else:
+            resampled = df[columns].resample(rule)
+            agg = {name: getattr(resampled, name)() for name in ("mean", "min", "max")}
+            time = agg["mean"].index.values.astype('datetime64[ns]').view(np.int64)
+            stats = {col: {name: agg[name][col].to_numpy(dtype=np.float64) for name in agg} for col in columns}
+        pyramid[level] = {"time": time, **stats}
+    return pyramid
+
+
+def range_bounds(time, start, end):
+    """
+    Bornes [lo, hi) d'une plage de dates dans un tableau d'horodatages trié.
+
+    Deux recherches dichotomiques (`searchsorted`) remplacent les masques
+    booléens : le coût ne dépend pas de la taille du jeu de données.
+
+    Args:
+        time (np.ndarray): Horodatages int64 (ns) triés.
+        start, end: Bornes de la plage (incluses), None pour les extrémités.
+
+    Returns:
+        tuple: (lo, hi)
+    """
+    start = pd.Timestamp(start).value if start is not None else time[0] if len(time) else 0
+    end = pd.Timestamp(end).value if end is not None else time[-1] if len(time) else 0
+    return np.searchsorted(time, start, side='left'), np.searchsorted(time, end, side='right')
+
+
+def minmax_downsample(time, low, high, n_buckets):
+    """
+    Garde le minimum et le maximum de chaque seau (dans l'ordre chronologique).
+
+    Args:
+        time (np.ndarray): Horodatages int64.
+        low (np.ndarray): Valeurs minimales de chaque point.
+        high (np.ndarray): Valeurs maximales de chaque point.
+        n_buckets (int): Nombre de seaux (≈ largeur en pixels).
+
+    Returns:
+        tuple: (horodatages, valeurs), 2 * n_buckets points.
+    """
+    n = len(time)
+    if n == 0:
+        return time, low
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)[:-1]
+    # Indices des min et max de chaque seau, sans boucle Python
+    low_filled = np.where(np.isnan(low), np.inf, low)
+    high_filled = np.where(np.isnan(high), -np.inf, high)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(np.append(edges, n)))
+    order_low = np.lexsort((low_filled, bucket))
+    order_high = np.lexsort((-high_filled, bucket))
+    i_low = order_low[edges]
+    i_high = order_high[edges]
+    low_first = i_low <= i_high
+    idx = np.column_stack([np.minimum(i_low, i_high), np.maximum(i_low, i_high)]).ravel()
+    values = np.column_stack([
+        np.where(low_first, low[i_low], high[i_high]),
+        np.where(low_first, high[i_high], low[i_low])
+    ]).ravel()
+    return time[idx], values
+
+
+def lttb(time, values, n_out):
+    """
+    Sous-échantillonnage Largest-Triangle-Three-Buckets.
+
+    Args:
+        time (np.ndarray): Horodatages int64.
+        values (np.ndarray): Valeurs.
+        n_out (int): Nombre de points conservés.
+
+    Returns:
+        tuple: (horodatages, valeurs) sous-échantillonnés.
+    """
+    n = len(time)
+    if n <= n_out or n_out < 3:
+        return time, values
+    x = (time - time[0]).astype(np.float64)
+    y = np.nan_to_num(values, nan=np.nanmean(values))
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        avg_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return time[selected], values[selected]
+
+
+def downsample_range(pyramid, column, start=None, end=None, max_points=2000, method="minmax"):
+    """
+    Série prête à afficher pour une plage de dates et une largeur donnée.
+
+    Le niveau utilisé est le plus fin dont le nombre de points dans la plage ne
+    dépasse pas quatre fois `max_points` : les vues larges ne lisent jamais les
+    données brutes. Les niveaux agrégés sont affichés par leur enveloppe
+    (min, max) pour ne pas lisser les pics.
+
+    Args:
+        pyramid (dict): Résultat de `build_pyramid`.
+        column (str): Variable à afficher.
+        start, end: Bornes de la plage (incluses).
+        max_points (int): Nombre maximal de points renvoyés (≈ pixels).
+        method (str): 'minmax' (préserve les pics) ou 'lttb'.
+
+    Returns:
+        tuple: (pd.DatetimeIndex, np.ndarray, niveau utilisé)
+    """
+    for level, _ in LEVELS:
+        data = pyramid[level]
+        lo, hi = range_bounds(data["time"], start, end)
+        if hi - lo <= 4 * max_points:
+            break
+    time = data["time"][lo:hi]
+    stats = data[column]
+    if level == LEVELS[0][0] and hi - lo <= max_points:
+        values = stats["mean"][lo:hi]
+    elif method == "lttb":
+        time, values = lttb(time, stats["mean"][lo:hi], max_points)
+    else:
+        # Les niveaux agrégés gardent toujours leur enveloppe (min, max)
+        n_buckets = min(hi - lo, max_points // 2)
+        time, values = minmax_downsample(time, stats["min"][lo:hi], stats["max"][lo:hi], n_buckets)
+    return pd.DatetimeIndex(time.view('datetime64[ns]')), values, level
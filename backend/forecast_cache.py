@@ -0,0 +1,144 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+
+
+def exog_fingerprint(exog):
+    """
+    Empreinte des variables exogènes d'une prévision (None si absentes).
+
+    Args:
+        exog (array-like): Variables exogènes.
+
+    Returns:
+        str: Empreinte hexadécimale, ou None.
+    """
+    if exog is None:
+        return None
+    values = np.ascontiguousarray(np.asarray(exog, dtype=np.float64))
+    return hashlib.sha256(values.tobytes()).hexdigest()[:16]
+
+
+class ForecastCache:
+    """
+    Cache LRU à durée de vie limitée des prévisions de l'API.
+
+    Les clés sont de la forme (id du modèle, horodatage de la dernière
+    observation, horizon, empreinte des exogènes) : deux requêtes identiques
+    dans le même intervalle de 15 minutes partagent la même prévision. Le cache
+    est vidé dès que la version des données (voir `data_version`) change.
+    Les requêtes simultanées d'une même clé absente ne la calculent qu'une fois :
+    les suivantes attendent le résultat du premier calcul.
+
+    Args:
+        maxsize (int): Nombre maximal d'entrées.
+        ttl (float): Durée de vie d'une entrée, en secondes.
+    """
+
+    def __init__(self, maxsize=256, ttl=900):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._generation = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.coalesced = 0
+
+    def check_version(self, version):
+        """
+        Vide le cache si les données ont changé depuis le dernier appel.
+
+        Returns:
+            bool: True si la version a changé (les données chargées sont à recharger).
+        """
+        with self._lock:
+            if version == self._version:
+                return False
+            changed = self._version is not None
+            if changed:
+                self._clear()
+            self._version = version
+            return changed
+
+    def invalidate(self):
+        """Vide le cache (nouvelles données ingérées)."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        # Les calculs en cours ne seront pas mis en cache (génération périmée)
+        self._entries.clear()
+        self._generation += 1
+        self.invalidations += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Retourne la prévision en cache, ou la calcule et la met en cache.
+
+        Args:
+            key (tuple): Clé de la prévision.
+            compute (callable): Calcul de la prévision en cas d'absence.
+
+        Returns:
+            Prévision.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                pending = self._pending[key] = Future()
+                generation = self._generation
+            else:
+                self.coalesced += 1
+                generation = None
+        if generation is None:
+            # Même clé déjà en cours de calcul : attendre son résultat
+            return pending.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+            if generation == self._generation:
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        pending.set_result(value)
+        return value
+
+    def stats(self):
+        """Compteurs du cache."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "coalesced": self.coalesced
+            }
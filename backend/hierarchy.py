@@ -0,0 +1,232 @@
+import copy
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from backend.chargement_donnes import load_temperature
+from backend.preprocessing import fourier_terms
+from backend.regression import temperature_at
+
+# Prévision hiérarchique : jour -> heure -> quart d'heure.
+#
+# Trois modèles bon marché remplacent le SARIMA au pas de 15 minutes :
+# - un SARIMA journalier (saisonnalité hebdomadaire, m=7) sur les sommes par jour ;
+# - un ARIMA horaire avec termes de Fourier (24 h et 168 h) sur les sommes par heure ;
+#   ces deux modèles ont pour variables exogènes la température et les degrés-jours
+#   de chauffage (comme le modèle 'gbm', température observée ou normale de saison) ;
+# - un profil intrajournalier : part moyenne de chaque quart d'heure de la semaine
+#   dans son jour, appliquée à la prévision journalière.
+# Les trois prévisions de base sont rendues cohérentes (somme des quarts d'heure
+# = heure, somme des heures = jour) par une projection linéaire calculée une fois
+# et appliquée à tous les jours de l'horizon en un seul produit matriciel.
+#
+# Les « jours » et les « heures » sont des blocs de 96 et 4 pas consécutifs alignés
+# sur la dernière observation : l'horizon commence toujours par un bloc complet.
+
+STEPS_PER_HOUR = 4
+STEPS_PER_DAY = 96
+HOURS_PER_DAY = STEPS_PER_DAY // STEPS_PER_HOUR
+STEP = pd.Timedelta('15min')
+DAILY_HISTORY_DAYS = 728  # deux ans (multiple de 7) pour le modèle journalier
+HOURLY_HISTORY_DAYS = 56  # huit semaines pour le modèle horaire
+PROFILE_DAYS = 56  # huit semaines pour le profil intrajournalier
+MIN_DAYS = 28
+HOURLY_FOURIER = {24: 6, 168: 4}  # période (heures) -> nombre d'harmoniques
+HEATING_THRESHOLD = 15.0  # °C, seuil des degrés-jours de chauffage
+RECONCILIATION_METHODS = ('bottom_up', 'ols', 'wls')
+
+
+def summing_matrix():
+    """
+    Matrice d'agrégation d'un jour : (1 + 24 + 96, 96).
+
+    Lignes : total du jour, totaux horaires, puis les 96 quarts d'heure.
+    """
+    return np.vstack([
+        np.ones((1, STEPS_PER_DAY)),
+        np.kron(np.eye(HOURS_PER_DAY), np.ones((1, STEPS_PER_HOUR))),
+        np.eye(STEPS_PER_DAY)
+    ])
+
+
+def reconciliation_matrix(method='wls', variances=None):
+    """
+    Projection des prévisions de base d'un jour sur les 96 quarts d'heure cohérents.
+
+    Args:
+        method (str): 'bottom_up' (quarts d'heure seuls), 'ols' (moindres carrés)
+            ou 'wls' (MinT à covariance diagonale : chaque niveau pondéré par
+            l'inverse de la variance de ses erreurs de prévision).
+        variances (array-like): Variances (jour, heure, quart d'heure), pour 'wls' ;
+            forme (..., 3) pour une projection par jour de l'horizon.
+
+    Returns:
+        np.ndarray: Matrice P (96, 121), ou (..., 96, 121) ; quarts d'heure réconciliés = P @ base.
+    """
+    S = summing_matrix()
+    if method == 'bottom_up':
+        return np.hstack([np.zeros((STEPS_PER_DAY, len(S) - STEPS_PER_DAY)), np.eye(STEPS_PER_DAY)])
+    if method == 'ols':
+        weights = np.ones(len(S))
+    elif method == 'wls':
+        if variances is None:
+            raise ValueError("Les variances des résidus sont nécessaires pour 'wls'")
+        weights = 1 / np.repeat(np.asarray(variances, dtype=np.float64), [1, HOURS_PER_DAY, STEPS_PER_DAY], axis=-1)
+    else:
+        raise ValueError(f"Méthode de réconciliation inconnue : {method}")
+    weighted = S.T * weights[..., None, :]
+    return np.linalg.solve(weighted @ S, weighted)
+
+
+def week_slots(times):
+    """Quart d'heure de la semaine (0 à 671) de chaque horodatage."""
+    return times.dayofweek * STEPS_PER_DAY + times.hour * STEPS_PER_HOUR + times.minute // 15
+
+
+def _hours(time):
+    # Heures écoulées depuis l'époque : phase absolue des termes de Fourier horaires
+    return pd.Timestamp(time).value / 3.6e12
+
+
+class HierarchicalModel:
+    """
+    Modèles journalier, horaire et profil intrajournalier, réconciliés au pas de 15 minutes.
+
+    Args:
+        method (str): Réconciliation par défaut (voir `reconciliation_matrix`).
+        daily_order (tuple): Ordre ARIMA du modèle journalier.
+        daily_seasonal_order (tuple): Ordre saisonnier du modèle journalier.
+        hourly_order (tuple): Ordre ARIMA du modèle horaire.
+        temperature (pd.Series): Températures journalières (par défaut, `load_temperature()`).
+    """
+
+    def __init__(self, method='wls', daily_order=(1, 0, 1), daily_seasonal_order=(1, 1, 1, 7), hourly_order=(2, 1, 1),
+                 temperature=None):
+        if method not in RECONCILIATION_METHODS:
+            raise ValueError(f"Méthode de réconciliation inconnue : {method}")
+        self.method = method
+        self.daily_order = daily_order
+        self.daily_seasonal_order = daily_seasonal_order
+        self.hourly_order = hourly_order
+        self.temperature = load_temperature() if temperature is None else temperature
+
+    def _exog(self, first, steps):
+        """
+        Variables exogènes des blocs de `steps` pas commençant à `first`.
+
+        Returns:
+            tuple: (journalières (jours, 2), horaires (heures, 2 + Fourier))
+        """
+        times = pd.date_range(first, periods=steps, freq=STEP)
+        temperature = temperature_at(times, self.temperature)
+        weather = np.column_stack([temperature, np.maximum(HEATING_THRESHOLD - temperature, 0)])
+        daily = weather.reshape(-1, STEPS_PER_DAY, 2).mean(axis=1)
+        hourly = weather.reshape(-1, STEPS_PER_HOUR, 2).mean(axis=1)
+        return daily, np.hstack([hourly, fourier_terms(_hours(first), len(hourly), HOURLY_FOURIER)])
+
+    def _levels(self, history):
+        """Sommes par jour et par heure des blocs alignés sur la fin de l'historique, et leurs exogènes."""
+        daily_exog, hourly_exog = self._exog(self._last_time - STEP * (len(history) - 1), len(history))
+        hourly = history.reshape(-1, STEPS_PER_HOUR).sum(axis=1)
+        hours = HOURLY_HISTORY_DAYS * HOURS_PER_DAY
+        return history.reshape(-1, STEPS_PER_DAY).sum(axis=1), daily_exog, hourly[-hours:], hourly_exog[-hours:]
+
+    def fit(self, series, exog=None):
+        """
+        Ajuste les trois modèles sur une série indexée par datetime (pas de 15 minutes).
+
+        Args:
+            series (pd.Series): Consommation.
+            exog: Ignoré (même interface que les autres modèles).
+
+        Returns:
+            HierarchicalModel: Le modèle ajusté.
+        """
+        y = series.to_numpy(dtype=np.float64)
+        days = min(len(y) // STEPS_PER_DAY, DAILY_HISTORY_DAYS)
+        if days < MIN_DAYS:
+            raise ValueError(f"Au moins {MIN_DAYS} jours d'observations sont nécessaires")
+        self._history = y[-days * STEPS_PER_DAY:].copy()
+        self._last_time = pd.Timestamp(series.index[-1])
+        self.nobs = len(y)
+
+        daily, daily_exog, hourly, hourly_exog = self._levels(self._history)
+        self.daily_results = SARIMAX(
+            daily, exog=daily_exog, order=self.daily_order, seasonal_order=self.daily_seasonal_order
+        ).fit(disp=False)
+        self.hourly_results = SARIMAX(hourly, exog=hourly_exog, order=self.hourly_order).fit(disp=False)
+
+        # Profil : rapport de chaque quart d'heure à la moyenne de son jour, moyenné par quart d'heure de la semaine
+        window = self._history[-PROFILE_DAYS * STEPS_PER_DAY:].reshape(-1, STEPS_PER_DAY)
+        times = pd.date_range(end=self._last_time, periods=window.size, freq=STEP)
+        slots = week_slots(times).to_numpy()
+        ratios = window / window.mean(axis=1, keepdims=True)
+        self.profile = np.bincount(slots, ratios.ravel(), minlength=7 * STEPS_PER_DAY) / np.maximum(
+            np.bincount(slots, minlength=7 * STEPS_PER_DAY), 1)
+        shares = self._shares(slots.reshape(window.shape))
+        self.profile_variance = np.var(window - shares * window.sum(axis=1, keepdims=True))
+        return self
+
+    def _shares(self, slots):
+        # Part de chaque quart d'heure dans son bloc de 96 pas
+        shares = self.profile[slots]
+        return shares / shares.sum(axis=1, keepdims=True)
+
+    def extend(self, values, exog=None):
+        """
+        Ajoute de nouvelles observations sans réajuster (comme `SARIMAXResults.extend`).
+
+        Les paramètres et le profil sont conservés ; les modèles journalier et
+        horaire sont refiltrés sur les blocs réalignés sur la nouvelle fin.
+
+        Returns:
+            HierarchicalModel: Copie du modèle avec l'historique prolongé.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        extended = copy.copy(self)
+        history = np.concatenate([self._history, values])
+        days = min(len(history) // STEPS_PER_DAY, DAILY_HISTORY_DAYS)
+        extended._history = history[-days * STEPS_PER_DAY:]
+        extended._last_time = self._last_time + STEP * len(values)
+        extended.nobs = self.nobs + len(values)
+        daily, daily_exog, hourly, hourly_exog = extended._levels(extended._history)
+        extended.daily_results = self.daily_results.apply(daily, exog=daily_exog)
+        extended.hourly_results = self.hourly_results.apply(hourly, exog=hourly_exog)
+        return extended
+
+    def forecast(self, steps, exog=None, method=None):
+        """
+        Prévision réconciliée de `steps` pas après la dernière observation.
+
+        Args:
+            steps (int): Nombre de pas.
+            exog: Ignoré (température et calendrier sont connus du modèle).
+            method (str): Réconciliation ('bottom_up', 'ols', 'wls'), par défaut celle du modèle.
+
+        Returns:
+            pd.Series: Prévisions indexées par datetime.
+        """
+        days = -(-steps // STEPS_PER_DAY)
+        times = pd.date_range(self._last_time + STEP, periods=days * STEPS_PER_DAY, freq=STEP)
+        daily_exog, hourly_exog = self._exog(times[0], len(times))
+        daily = self.daily_results.get_forecast(days, exog=daily_exog)
+        hourly = self.hourly_results.get_forecast(len(hourly_exog), exog=hourly_exog)
+        daily_mean = np.asarray(daily.predicted_mean)
+        bottom = self._shares(week_slots(times).to_numpy().reshape(days, STEPS_PER_DAY)) * daily_mean[:, None]
+
+        # Prévisions de base (jours, 121) -> quarts d'heure cohérents (jours, 96)
+        base = np.hstack([daily_mean[:, None], np.asarray(hourly.predicted_mean).reshape(days, HOURS_PER_DAY), bottom])
+        method = method or self.method
+        variances = None
+        if method == 'wls':
+            # Variances des erreurs à l'horizon de chaque jour : une projection par jour
+            daily_var = np.asarray(daily.var_pred_mean)
+            variances = np.column_stack([
+                daily_var,
+                np.asarray(hourly.var_pred_mean).reshape(days, HOURS_PER_DAY).mean(axis=1),
+                self.profile_variance + daily_var / STEPS_PER_DAY ** 2
+            ])
+        projection = reconciliation_matrix(method, variances)
+        reconciled = (projection @ base[:, :, None])[:, :, 0]
+        return pd.Series(reconciled.ravel()[:steps], index=times[:steps])
@@ -0,0 +1,284 @@
+import contextlib
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+# Instrumentation légère du pipeline.
+#
+# Chaque étape instrumentée (décorateur `instrument` ou gestionnaire `stage`)
+# enregistre sa durée, des compteurs (lignes, itérations de l'optimiseur, ...)
+# et le pic de mémoire. Les mesures sont agrégées pour l'export Prometheus
+# (`render_prometheus`), collectées par exécution (`profile_run`, profil JSON ;
+# `collect` et `merge` pour les processus du pool) et, sur demande, une étape
+# peut être profilée avec cProfile (`profile_request`).
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROFILES_DIR = PROJECT_ROOT / "profiles"
+METRIC_PREFIX = "energy_stage"
+
+_lock = threading.Lock()
+_metrics = {}
+_runs = []
+_profile_file = contextvars.ContextVar("profile_file", default=None)
+_peak_stack = contextvars.ContextVar("peak_stack", default=())  # pics des étapes tracemalloc en cours
+
+
+def peak_rss_bytes():
+    """RSS maximal du processus, en octets."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # kilo-octets sous Linux
+
+
+# Champs d'un événement qui ne sont pas des compteurs
+_EVENT_FIELDS = ("stage", "seconds", "peak_rss_bytes", "peak_memory_bytes")
+
+
+def record(name, seconds, counts=None, peak_memory=None):
+    """
+    Enregistre une exécution d'étape.
+
+    Args:
+        name (str): Nom de l'étape.
+        seconds (float): Durée.
+        counts (dict): Compteurs à cumuler (lignes, itérations, ...).
+        peak_memory (int): Pic de mémoire allouée pendant l'étape (octets), si mesuré.
+    """
+    counts = {key: value for key, value in (counts or {}).items() if value is not None}
+    event = {"stage": name, "seconds": seconds, "peak_rss_bytes": peak_rss_bytes(), **counts}
+    if peak_memory is not None:
+        event["peak_memory_bytes"] = peak_memory
+    with _lock:
+        _aggregate(event)
+
+
+def merge(events):
+    """
+    Ajoute aux métriques les événements collectés dans un autre processus (voir `collect`).
+
+    Args:
+        events (list): Événements de `collect`.
+    """
+    with _lock:
+        for event in events:
+            _aggregate(event)
+
+
+def _aggregate(event):
+    # Appelé sous `_lock`
+    name, seconds, peak_memory = event["stage"], event["seconds"], event.get("peak_memory_bytes")
+    metric = _metrics.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "counts": {}})
+    metric["count"] += 1
+    metric["seconds"] += seconds
+    metric["max_seconds"] = max(metric["max_seconds"], seconds)
+    for key, value in event.items():
+        if key not in _EVENT_FIELDS:
+            metric["counts"][key] = metric["counts"].get(key, 0) + value
+    if peak_memory is not None:
+        metric["peak_memory_bytes"] = max(metric.get("peak_memory_bytes", 0), peak_memory)
+    for run in _runs:
+        run.append(event)
+
+
+@contextlib.contextmanager
+def stage(name, **counts):
+    """
+    Mesure un bloc de code ; les compteurs peuvent être complétés dans le bloc.
+
+    Le pic de mémoire n'est mesuré que si `tracemalloc` est actif.
+
+    Example:
+        with stage("parsing", files=3) as counts:
+            df = ...
+            counts["rows"] = len(df)
+    """
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # tracemalloc n'a qu'un pic : celui de l'étape englobante est reporté avant la remise à zéro
+        parents = _peak_stack.get()
+        if parents:
+            parents[-1][0] = max(parents[-1][0], tracemalloc.get_traced_memory()[1])
+        floor = [0]
+        token = _peak_stack.set(parents + (floor,))
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        seconds = time.perf_counter() - start
+        peak = None
+        if tracing:
+            peak = max(floor[0], tracemalloc.get_traced_memory()[1])
+            _peak_stack.reset(token)
+            if parents:
+                parents[-1][0] = max(parents[-1][0], peak)
+        record(name, seconds, counts, peak)
+
+
+def instrument(name=None, counts=None):
+    """
+    Décorateur : mesure chaque appel de la fonction.
+
+    Si le profilage de la requête courante est demandé (`profile_request`),
+    le premier appel instrumenté est exécuté sous cProfile.
+
+    Args:
+        name (str): Nom de l'étape (par défaut, le nom de la fonction).
+        counts (callable): `counts(result, *args, **kwargs)` -> dict de compteurs.
+    """
+    def decorator(fn):
+        stage_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name) as stage_counts:
+                profile_file = _profile_file.get()
+                if profile_file is None:
+                    result = fn(*args, **kwargs)
+                else:
+                    _profile_file.set(None)  # un seul profil par requête
+                    profiler = cProfile.Profile()
+                    result = profiler.runcall(fn, *args, **kwargs)
+                    os.makedirs(Path(profile_file).parent, exist_ok=True)
+                    profiler.dump_stats(profile_file)
+                if counts is not None:
+                    stage_counts.update(counts(result, *args, **kwargs))
+            return result
+        return wrapper
+    return decorator
+
+
+def rows(result, *args, **kwargs):
+    """Compteur usuel : nombre de lignes du résultat."""
+    return {"rows": len(result)}
+
+
+@contextlib.contextmanager
+def profile_request(file):
+    """Profile (cProfile) la prochaine étape instrumentée exécutée dans ce contexte."""
+    token = _profile_file.set(str(file))
+    try:
+        yield
+    finally:
+        _profile_file.reset(token)
+
+
+@contextlib.contextmanager
+def collect():
+    """
+    Collecte les événements des étapes exécutées dans ce contexte.
+
+    Les tâches des processus du pool renvoient ainsi leurs mesures avec leur
+    résultat ; le processus de l'API les ajoute aux siennes avec `merge`.
+
+    Yields:
+        list: Événements (complétés au fil de l'eau).
+    """
+    events = []
+    with _lock:
+        _runs.append(events)
+    try:
+        yield events
+    finally:
+        with _lock:
+            _runs.remove(events)
+
+
+@contextlib.contextmanager
+def profile_run(file=None, trace_memory=False):
+    """
+    Collecte toutes les étapes d'une exécution et écrit un profil JSON.
+
+    Args:
+        file (str/Path): Fichier de sortie (par défaut, profiles/run_<date>.json).
+        trace_memory (bool): Mesurer le pic de mémoire de chaque étape (tracemalloc, plus lent).
+
+    Yields:
+        list: Événements de l'exécution (complétés au fil de l'eau).
+    """
+    started = time.time()
+    start = time.perf_counter()
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        with collect() as events:
+            yield events
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        file = Path(file or PROFILES_DIR / time.strftime("run_%Y%m%d_%H%M%S.json", time.localtime(started)))
+        os.makedirs(file.parent, exist_ok=True)
+        summary = {}
+        for event in events:
+            entry = summary.setdefault(event["stage"], {"calls": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["seconds"] += event["seconds"]
+        file.write_text(json.dumps({
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+            "total_seconds": time.perf_counter() - start,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": summary,
+            "events": events
+        }, indent=2, ensure_ascii=False, default=float))
+
+
+def snapshot():
+    """Copie des métriques agrégées par étape."""
+    with _lock:
+        return {name: {**metric, "counts": dict(metric["counts"])} for name, metric in _metrics.items()}
+
+
+def render_prometheus():
+    """
+    Métriques au format texte de Prometheus (version 0.0.4).
+
+    Returns:
+        str: Durées (summary count/sum), durée maximale, compteurs cumulés,
+        pic de mémoire par étape et RSS maximal du processus.
+    """
+    metrics = snapshot()
+    lines = [
+        f"# HELP {METRIC_PREFIX}_duration_seconds Durée des étapes du pipeline.",
+        f"# TYPE {METRIC_PREFIX}_duration_seconds summary"
+    ]
+    for name, metric in sorted(metrics.items()):
+        lines.append(f'{METRIC_PREFIX}_duration_seconds_count{{stage="{name}"}} {metric["count"]}')
+        lines.append(f'{METRIC_PREFIX}_duration_seconds_sum{{stage="{name}"}} {metric["seconds"]:.6f}')
+    lines += [
+        f"# HELP {METRIC_PREFIX}_duration_seconds_max Durée maximale d'une exécution de l'étape.",
+        f"# TYPE {METRIC_PREFIX}_duration_seconds_max gauge"
+    ]
+    lines += [
+        f'{METRIC_PREFIX}_duration_seconds_max{{stage="{name}"}} {metric["max_seconds"]:.6f}'
+        for name, metric in sorted(metrics.items())
+    ]
+    for key in sorted({key for metric in metrics.values() for key in metric["counts"]}):
+        lines += [
+            f"# HELP {METRIC_PREFIX}_{key}_total Cumul du compteur {key}.",
+            f"# TYPE {METRIC_PREFIX}_{key}_total counter"
+        ]
+        lines += [
+            f'{METRIC_PREFIX}_{key}_total{{stage="{name}"}} {metric["counts"][key]}'
+            for name, metric in sorted(metrics.items()) if key in metric["counts"]
+        ]
+    peaks = {name: metric["peak_memory_bytes"] for name, metric in metrics.items() if "peak_memory_bytes" in metric}
+    if peaks:
+        lines += [
+            f"# HELP {METRIC_PREFIX}_peak_memory_bytes Pic de mémoire allouée pendant l'étape (tracemalloc).",
+            f"# TYPE {METRIC_PREFIX}_peak_memory_bytes gauge"
+        ]
+        lines += [f'{METRIC_PREFIX}_peak_memory_bytes{{stage="{name}"}} {peak}' for name, peak in sorted(peaks.items())]
+    lines += [
+        "# HELP process_peak_rss_bytes RSS maximal du processus.",
+        "# TYPE process_peak_rss_bytes gauge",
+        f"process_peak_rss_bytes {peak_rss_bytes()}"
+    ]
+    return "\n".join(lines) + "\n"
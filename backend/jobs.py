@@ -0,0 +1,251 @@
+import contextlib
+import io
+import os
+import threading
+import time
+import uuid
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+from pathlib import Path
+
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from backend.chargement_donnes import load_consumption_data
+from backend.instrumentation import collect, merge
+from backend.predictions import fit_models
+from backend.registry import MODELS_DIR, ModelRegistry, data_fingerprint
+from backend.training import EXOG_MODELS, MODEL_CHOICES, filter_data, make_future_predictions, train_model
+
+# Entraînements asynchrones : les ajustements tournent dans un pool de processus
+# borné (un thread BLAS par processus), l'API ne fait qu'enregistrer les tâches et
+# lire leur avancement.
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+EXOG_COLUMNS = ['PrévisionsJ-1', 'PrévisionsJ']
+MAX_HISTORY = 200  # tâches terminées conservées pour /jobs/{job_id}
+
+
+def _init_worker():
+    threadpool_limits(1)
+
+
+class _Progress:
+    """Publie l'étape courante et les durées d'une tâche dans le dictionnaire partagé."""
+
+    def __init__(self, job_id, shared):
+        self.job_id = job_id
+        self.shared = shared
+        self.timings = {}
+        self.shared[job_id] = {"stage": "démarrage", "started_at": time.time(), "timings": {}}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        state = dict(self.shared[self.job_id])
+        state["stage"] = name
+        self.shared[self.job_id] = state
+        start = time.perf_counter()
+        yield
+        self.timings[name] = time.perf_counter() - start
+        state["timings"] = dict(self.timings)
+        self.shared[self.job_id] = state
+
+
+def run_training(job_id, shared, model_type, cutoff_date, horizon, data_dir=DATA_DIR, models_dir=MODELS_DIR):
+    """
+    Tâche d'entraînement exécutée dans un processus du pool.
+
+    Args:
+        job_id (str): Identifiant de la tâche.
+        shared (dict): Dictionnaire partagé d'avancement.
+        model_type (str): Type de modèle (voir `MODEL_CHOICES`).
+        cutoff_date (str): Date limite des données d'entraînement.
+        horizon (int): Nombre de pas à prédire.
+
+    Returns:
+        dict: Description du modèle enregistré et prévision à `horizon` pas.
+    """
+    progress = _Progress(job_id, shared)
+    # Mesures des étapes renvoyées avec le résultat (voir JobManager._finish)
+    with collect() as events:
+        cutoff = pd.to_datetime(cutoff_date)
+        with progress.stage("chargement"):
+            data = load_consumption_data(str(data_dir))
+        with progress.stage("prétraitement"), contextlib.redirect_stdout(io.StringIO()):
+            filtered = filter_data(data, cutoff)
+            series = filtered['Consommation']
+            exog = filtered[EXOG_COLUMNS] if model_type in EXOG_MODELS else None
+        with progress.stage("ajustement"), warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+            warnings.simplefilter("ignore")
+            model, model_name, model_type = train_model(MODEL_CHOICES[model_type], series, exog)
+        with progress.stage("prévision"):
+            future_exog = None
+            if model_type in EXOG_MODELS:
+                # Prévisions RTE disponibles après la date limite
+                future_exog = data[EXOG_COLUMNS].loc[cutoff:].iloc[1:horizon + 1].ffill().bfill()
+            predictions = make_future_predictions(model, model_type, horizon, future_exog)
+        with progress.stage("sauvegarde"):
+            key = data_fingerprint(series, {"model_type": model_type, "cutoff": str(cutoff)})
+            ModelRegistry(models_dir).put(model_type, key, model)
+        index = pd.date_range(series.index[-1], periods=horizon + 1, freq='15min')[1:]
+    return {
+        "model_name": model_name,
+        "model_type": model_type,
+        "registry_key": key,
+        "cutoff_date": str(cutoff),
+        "forecast": {"index": index.strftime('%Y-%m-%d %H:%M').tolist(), "values": list(map(float, predictions))},
+        "timings": progress.timings,
+        "events": events
+    }
+
+
+def run_baseline(job_id, shared, data, models_dir=MODELS_DIR):
+    """Ajuste les modèles AR, SARIMAX et Kalman de `/predict/` dans un processus du pool."""
+    progress = _Progress(job_id, shared)
+    with collect() as events, progress.stage("ajustement"), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        fit_models(data, ModelRegistry(models_dir))
+    return {"model_type": "baseline", "timings": progress.timings, "events": events}
+
+
+class JobManager:
+    """
+    File de tâches d'entraînement sur un pool de processus borné.
+
+    Seules les `max_history` dernières tâches terminées sont conservées (plus la
+    dernière réussie de chaque catégorie). Avec un registre, la dernière tâche
+    réussie de chaque catégorie est enregistrée sur disque et restaurée au
+    démarrage : le modèle courant de `/predict/` survit à un redémarrage.
+
+    Args:
+        max_workers (int): Nombre de processus (par défaut, un cœur est laissé à l'API).
+        registry (ModelRegistry): Registre où enregistrer les dernières tâches réussies.
+        max_history (int): Nombre de tâches terminées conservées.
+    """
+
+    def __init__(self, max_workers=None, registry=None, max_history=MAX_HISTORY):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.registry = registry
+        self.max_history = max_history
+        self._executor = None
+        self._manager = None
+        self._shared = None
+        self._jobs = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        self._manager = Manager()
+        self._shared = self._manager.dict()
+        if self.registry is not None:
+            with self._lock:
+                for kind, job in self.registry.latest().items():
+                    self._jobs.setdefault(job["job_id"], job)
+                    self._latest[kind] = job["job_id"]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = None
+
+    def submit(self, kind, fn, *args, params=None):
+        """
+        Ajoute une tâche à la file.
+
+        Args:
+            kind (str): Catégorie de tâche ('train', 'baseline', ...).
+            fn (callable): Fonction exécutée dans le pool (reçoit l'id et l'avancement).
+            params (dict): Paramètres affichés dans le statut.
+
+        Returns:
+            str: Identifiant de la tâche.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "kind": kind,
+                "params": params or {},
+                "status": "queued",
+                "submitted_at": time.time()
+            }
+        future = self._executor.submit(fn, job_id, self._shared, *args)
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        return job_id
+
+    def _finish(self, job_id, future):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["finished_at"] = time.time()
+            if future.cancelled():
+                job["status"] = "cancelled"
+            elif future.exception() is not None:
+                job["status"] = "failed"
+                job["error"] = repr(future.exception())
+            else:
+                job["status"] = "done"
+                job["result"] = future.result()
+                # Étapes mesurées dans le processus du pool : ajoutées aux métriques de l'API
+                merge(job["result"].pop("events", []))
+                self._latest[job["kind"]] = job_id
+                if self.registry is not None:
+                    self.registry.set_latest(job["kind"], self._record(job))
+            self._evict()
+
+    def _record(self, job):
+        # Statut complet (avancement compris) tel que le renverra `status`
+        record = dict(job)
+        progress = self._shared.get(job["job_id"])
+        if progress:
+            record.update(stage=progress["stage"], started_at=progress["started_at"], timings=progress["timings"])
+        return record
+
+    def _evict(self):
+        # Appelé sous `_lock` : les tâches terminées les plus anciennes sont oubliées
+        finished = sorted(
+            (job for job in self._jobs.values() if "finished_at" in job and job["job_id"] not in self._latest.values()),
+            key=lambda job: job["finished_at"]
+        )
+        for job in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job["job_id"]]
+            self._shared.pop(job["job_id"], None)
+
+    def status(self, job_id):
+        """
+        Statut d'une tâche : état, étape courante, durées.
+
+        Returns:
+            dict: Statut, ou None si la tâche est inconnue.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+        progress = self._shared.get(job_id) if self._shared is not None else None
+        if progress:
+            job["stage"] = progress["stage"]
+            job["started_at"] = progress["started_at"]
+            job["timings"] = progress["timings"]
+            if job["status"] == "queued":
+                job["status"] = "running"
+            job["queue_seconds"] = progress["started_at"] - job["submitted_at"]
+        if "finished_at" in job and "started_at" in job:
+            job["run_seconds"] = job["finished_at"] - job["started_at"]
+        return job
+
+    def completed(self, kind):
+        """Tâches terminées avec succès de la catégorie `kind`, de la plus récente à la plus ancienne."""
+        with self._lock:
+            done = [dict(job) for job in self._jobs.values() if job["kind"] == kind and job["status"] == "done"]
+        return sorted(done, key=lambda job: job["finished_at"], reverse=True)
+
+    def latest(self, kind):
+        """Dernière tâche terminée avec succès de la catégorie `kind`, ou None."""
+        with self._lock:
+            job_id = self._latest.get(kind)
+        return self.status(job_id) if job_id else None
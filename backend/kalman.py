@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+# Filtre de Kalman scalaire de marche aléatoire (F = H = 1) sur des tableaux NumPy.
+#
+# Pour Q et R fixés, la variance P (donc le gain K) ne dépend pas des données et
+# converge vers un gain stationnaire : le filtre devient alors le lissage
+# exponentiel x_t = (1 - K) x_{t-1} + K z_t, calculé par `scipy.signal.lfilter`.
+# Seul le régime transitoire (quelques centaines de pas au plus) est itéré en Python.
+
+
+def steady_state_gain(Q, R):
+    """
+    Gain de Kalman stationnaire de la marche aléatoire.
+
+    Args:
+        Q (float): Variance du bruit du processus.
+        R (float): Variance de la mesure.
+
+    Returns:
+        tuple: (gain stationnaire, variance a priori stationnaire)
+    """
+    P_prior = (Q + np.sqrt(Q * Q + 4 * Q * R)) / 2
+    return P_prior / (P_prior + R), P_prior
+
+
+def _filter_run(z, x, P, Q, R, K_ss, tol):
+    """Filtre une suite d'observations sans valeur manquante."""
+    n = len(z)
+    out = np.empty(n)
+    t = 0
+    # Régime transitoire : le gain dépend encore de P
+    while t < n:
+        P = P + Q
+        K = P / (P + R)
+        if abs(K - K_ss) <= tol * K_ss:
+            P = P - Q
+            break
+        x = x + K * (z[t] - x)
+        P = (1 - K) * P
+        out[t] = x
+        t += 1
+    # Régime stationnaire : lissage exponentiel
+    if t < n:
+        out[t:], _ = lfilter([K_ss], [1, K_ss - 1], z[t:], zi=[(1 - K_ss) * x])
+        x = out[-1]
+        P = K_ss * R  # Variance a posteriori stationnaire
+    return out, x, P
+
+
+def _filter_column(z, x, P, Q, R, tol):
+    K_ss = steady_state_gain(Q, R)[0]
+    out = np.empty(len(z))
+    valid = ~np.isnan(z)
+    # Découpage en plages d'observations valides / manquantes
+    edges = np.flatnonzero(np.diff(valid.astype(np.int8))) + 1
+    bounds = np.concatenate(([0], edges, [len(z)]))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if valid[start]:
+            out[start:end], x, P = _filter_run(z[start:end], x, P, Q, R, K_ss, tol)
+        else:
+            # Pas de mesure : prédiction seule
+            out[start:end] = x
+            P = P + Q * (end - start)
+    return out, x, P
+
+
+def kalman_filter_array(z, Q, R, x0=None, P0=1.0, tol=1e-12):
+    """
+    Applique le filtre de Kalman scalaire (F = H = 1) à une ou plusieurs séries.
+
+    Chaque observation donne lieu à une prédiction puis une mise à jour, comme la
+    boucle `filterpy` ; les valeurs manquantes (NaN) ne font que la prédiction.
+
+    Args:
+        z (array-like): Observations, 1-D ou 2-D (une colonne par série).
+        Q (float): Variance du bruit du processus.
+        R (float): Variance de la mesure.
+        x0 (float/array): État initial (par défaut, première observation valide).
+        P0 (float/array): Variance initiale.
+        tol (float): Tolérance relative de convergence du gain.
+
+    Returns:
+        tuple: (estimations filtrées de même forme que `z`, état final x, variance finale P)
+    """
+    z = np.asarray(z, dtype=np.float64)
+    columns = z.reshape(len(z), -1)
+    k = columns.shape[1]
+    if x0 is None:
+        x0 = [col[~np.isnan(col)][0] if (~np.isnan(col)).any() else 0.0 for col in columns.T]
+    x0 = np.broadcast_to(np.asarray(x0, dtype=np.float64), (k,))
+    P0 = np.broadcast_to(np.asarray(P0, dtype=np.float64), (k,))
+
+    out = np.empty_like(columns)
+    x_final = np.empty(k)
+    P_final = np.empty(k)
+    for j in range(k):
+        out[:, j], x_final[j], P_final[j] = _filter_column(columns[:, j], x0[j], P0[j], Q, R, tol)
+    if z.ndim == 1:
+        return out[:, 0], x_final[0], P_final[0]
+    return out, x_final, P_final
+
+
+def kalman_filter_frame(df, Q, R, columns=('Consommation', 'PrévisionsJ-1', 'PrévisionsJ'), P0=1.0):
+    """
+    Filtre plusieurs colonnes d'un DataFrame en une fois.
+
+    Args:
+        df (pd.DataFrame): Données indexées par datetime.
+        Q (float): Variance du bruit du processus.
+        R (float): Variance de la mesure.
+        columns (tuple): Colonnes à filtrer.
+        P0 (float): Variance initiale.
+
+    Returns:
+        pd.DataFrame: Estimations filtrées, même index que `df`.
+    """
+    columns = [col for col in columns if col in df.columns]
+    filtered, _, _ = kalman_filter_array(df[columns].to_numpy(dtype=np.float64), Q, R, P0=P0)
+    return pd.DataFrame(filtered, index=df.index, columns=columns)
@@ -0,0 +1,188 @@
+import itertools
+import json
+import os
+import signal
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from threadpoolctl import threadpool_limits
+
+from backend.registry import MODELS_DIR, data_fingerprint
+
+# Recherche parallèle d'ordres SARIMA.
+#
+# La recherche se fait en deux passes sur un pool de processus :
+#   1. une passe rapide (peu d'itérations de l'optimiseur) classe les candidats ;
+#   2. les candidats retenus sont ajustés complètement, et ceux dont l'AIC
+#      rapide est nettement moins bon que le meilleur AIC complet sont abandonnés.
+# Chaque résultat est ajouté à un fichier JSON lines : une recherche interrompue
+# reprend là où elle s'était arrêtée.
+
+RESULTS_FILE = MODELS_DIR / "model_search.jsonl"
+
+_series = None
+
+
+class CandidateTimeout(Exception):
+    """Un candidat a dépassé son temps d'ajustement."""
+
+
+def candidate_grid(p=(0, 1, 2), d=(1,), q=(0, 1, 2), P=(0, 1), D=(1,), Q=(0, 1), m=(96, 672)):
+    """
+    Construit la grille des ordres (p,d,q)(P,D,Q,m) à évaluer.
+
+    Returns:
+        list: Couples (order, seasonal_order).
+    """
+    return [
+        ((p_, d_, q_), (P_, D_, Q_, m_))
+        for p_, d_, q_, P_, D_, Q_, m_ in itertools.product(p, d, q, P, D, Q, m)
+    ]
+
+
+def _init_worker(series):
+    global _series
+    _series = series
+    # Un seul thread BLAS par processus : le parallélisme vient du pool
+    threadpool_limits(1)
+
+
+def _on_timeout(signum, frame):
+    raise CandidateTimeout()
+
+
+def _fit_candidate(order, seasonal_order, maxiter, timeout):
+    start = time.perf_counter()
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = SARIMAX(_series, order=order, seasonal_order=seasonal_order, enforce_stationarity=False)
+            results = model.fit(disp=False, maxiter=maxiter)
+        return {
+            "status": "ok",
+            "aic": float(results.aic),
+            "iterations": int(results.mle_retvals.get("iterations", -1)),
+            "seconds": time.perf_counter() - start
+        }
+    except CandidateTimeout:
+        return {"status": "timeout", "aic": None, "seconds": time.perf_counter() - start}
+    except Exception as e:
+        return {"status": "error", "aic": None, "error": str(e), "seconds": time.perf_counter() - start}
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _candidate_id(order, seasonal_order):
+    return f"{tuple(order)}{tuple(seasonal_order)}"
+
+
+def _load_results(results_file, key):
+    done = {}
+    if results_file.exists():
+        with open(results_file, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["key"] == key:
+                    done[(record["stage"], record["candidate"])] = record
+    return done
+
+
+def _run_stage(executor, stage, candidates, done, results_file, key, maxiter, timeout, abandon=None):
+    """
+    Évalue une passe. `abandon(résultats)` retourne le prédicat des candidats
+    en attente à annuler, compte tenu des résultats déjà obtenus.
+    """
+    results = {}
+    futures = {}
+    for order, seasonal_order in candidates:
+        cid = _candidate_id(order, seasonal_order)
+        if (stage, cid) in done:
+            results[cid] = done[(stage, cid)]
+            continue
+        if abandon is not None and abandon(results)(cid):
+            print(f"[{stage}] {cid}: abandonné")
+            continue
+        future = executor.submit(_fit_candidate, order, seasonal_order, maxiter, timeout)
+        futures[future] = (cid, order, seasonal_order)
+
+    with open(results_file, "a", encoding="utf-8") as f:
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            cid, order, seasonal_order = futures[future]
+            record = {
+                "key": key, "stage": stage, "candidate": cid,
+                "order": list(order), "seasonal_order": list(seasonal_order),
+                **future.result()
+            }
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            results[cid] = record
+            print(f"[{stage}] {cid}: {record['status']} AIC={record['aic']} ({record['seconds']:.1f} s)")
+            if abandon is not None:
+                should_abandon = abandon(results)
+                for pending, (pending_cid, _, _) in futures.items():
+                    if not pending.done() and should_abandon(pending_cid) and pending.cancel():
+                        print(f"[{stage}] {pending_cid}: abandonné")
+    return results
+
+
+def search_models(series, candidates=None, max_workers=None, timeout=600,
+                  screen_maxiter=5, maxiter=50, abandon_margin=100.0, results_file=RESULTS_FILE):
+    """
+    Sélectionne le meilleur ordre SARIMA (AIC) sur un pool de processus.
+
+    Args:
+        series (array-like): Série d'entraînement.
+        candidates (list): Couples (order, seasonal_order), par défaut `candidate_grid()`.
+        max_workers (int): Nombre de processus (par défaut, tous les cœurs).
+        timeout (float): Temps maximal d'ajustement d'un candidat, en secondes.
+        screen_maxiter (int): Itérations de l'optimiseur pour la passe rapide.
+        maxiter (int): Itérations de l'optimiseur pour l'ajustement complet.
+        abandon_margin (float): Écart d'AIC au-delà duquel un candidat est abandonné.
+        results_file (str/Path): Fichier JSON lines des résultats (reprise).
+
+    Returns:
+        list: Résultats complets triés par AIC croissant.
+    """
+    values = np.asarray(series, dtype=np.float64)
+    candidates = candidates or candidate_grid()
+    results_file = Path(results_file)
+    os.makedirs(results_file.parent, exist_ok=True)
+    key = data_fingerprint(values, {"maxiter": maxiter, "screen_maxiter": screen_maxiter})
+    done = _load_results(results_file, key)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(values,)) as executor:
+        screen = _run_stage(executor, "screen", candidates, done, results_file, key, screen_maxiter, timeout)
+        screened = {cid: r["aic"] for cid, r in screen.items() if r["status"] == "ok"}
+        retained = [c for c in candidates if _candidate_id(*c) in screened]
+        retained.sort(key=lambda c: screened[_candidate_id(*c)])
+
+        def abandon(results):
+            # Abandon des candidats dont l'AIC rapide dépasse nettement le meilleur AIC complet
+            best = min((r["aic"] for r in results.values() if r["status"] == "ok"), default=np.inf)
+            return lambda cid: screened[cid] > best + abandon_margin
+
+        full = _run_stage(executor, "full", retained, done, results_file, key, maxiter, timeout, abandon)
+
+    ranked = [r for r in full.values() if r["status"] == "ok"]
+    return sorted(ranked, key=lambda r: r["aic"])
+
+
+if __name__ == "__main__":
+    from backend.chargement_donnes import load_consumption_data
+    from backend.training import filter_data
+
+    DATA_DIR = Path(__file__).parent.parent / "data"
+    data = filter_data(load_consumption_data(str(DATA_DIR)), "2025-02-24 10:15:00")
+    for record in search_models(data['Consommation'])[:5]:
+        print(record["candidate"], record["aic"])
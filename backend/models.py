@@ -1,20 +1,57 @@
-import pandas as pd
+import numpy as np
 import pmdarima as pm
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 from filterpy.kalman import KalmanFilter
+from backend.kalman import kalman_filter_array
+
+# Hyperparamètres des modèles (ils font partie de l'empreinte du registre)
+AR_PARAMS = {"seasonal": False}
+SARIMAX_PARAMS = {"order": (1, 1, 1), "seasonal_order": (1, 1, 1, 12)}
+KALMAN_PARAMS = {"Q": 1.0, "R": 100.0, "P0": 1.0}  # Valeurs du notebook Kalman_filter
 
 # Exemple d'un modèle AutoRegressif (AR)
 def train_ar_model(data):
-    model = pm.auto_arima(data, seasonal=False)
+    model = pm.auto_arima(data, **AR_PARAMS)
     return model
 
 # Exemple d'un modèle SARIMAX
 def train_sarimax_model(data):
-    model = SARIMAX(data, order=(1,1,1), seasonal_order=(1,1,1,12))
+    model = SARIMAX(data, **SARIMAX_PARAMS)
     return model.fit()
 
-# Exemple d'un filtre de Kalman simple
+# Exemple d'un filtre de Kalman simple (marche aléatoire : F = H = 1)
 def kalman_filter(data):
     kf = KalmanFilter(dim_x=1, dim_z=1)
-    kf.x = data[0]  # État initial
+    kf.x = np.array([[data[0]]], dtype=float)  # État initial
+    kf.F = np.array([[1.]])
+    kf.H = np.array([[1.]])
+    kf.P *= KALMAN_PARAMS["P0"]
+    kf.Q *= KALMAN_PARAMS["Q"]
+    kf.R *= KALMAN_PARAMS["R"]
     return kf
+
+# Application du filtre de Kalman sur tout l'historique (moteur vectorisé)
+def run_kalman_filter(data):
+    filtered, x, P = kalman_filter_array(
+        data, KALMAN_PARAMS["Q"], KALMAN_PARAMS["R"], P0=KALMAN_PARAMS["P0"]
+    )
+    return {
+        "filtered": filtered,
+        "state": {"x": float(x), "P": float(P), "n_obs": len(data)}
+    }
+
+# Mise à jour en ligne de l'état (x, P) : coût constant par observation
+def kalman_update(state, observations):
+    if len(observations) == 0:
+        return state
+    _, x, P = kalman_filter_array(
+        observations, KALMAN_PARAMS["Q"], KALMAN_PARAMS["R"], x0=state["x"], P0=state["P"]
+    )
+    return {"x": float(x), "P": float(P), "n_obs": state["n_obs"] + len(observations)}
+
+# Prévision de la marche aléatoire : estimation constante, variance croissante
+def kalman_forecast(state, steps):
+    return {
+        "mean": [state["x"]] * steps,
+        "variance": [state["P"] + KALMAN_PARAMS["Q"] * h for h in range(1, steps + 1)]
+    }
@@ -1,20 +1,171 @@
-import pandas as pd
-from backend.models import train_ar_model, train_sarimax_model, kalman_filter
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-def make_predictions(data):
-    ar_model = train_ar_model(data)
-    sarimax_model = train_sarimax_model(data)
-    kf = kalman_filter(data)
+import numpy as np
+from backend.models import (
+    train_ar_model, train_sarimax_model, run_kalman_filter,
+    kalman_update, kalman_forecast,
+    AR_PARAMS, SARIMAX_PARAMS, KALMAN_PARAMS
+)
+from backend.instrumentation import instrument
+from backend.registry import ModelRegistry, data_fingerprint
 
-    # Appliquer le filtre de Kalman
-    filtered_values = []
-    for consommation in data:
-        kf.predict()
-        kf.update([[consommation]])
-        filtered_values.append(kf.x[0, 0])
+def fit_models(data, registry):
+    """
+    Entraîne les modèles AR, SARIMAX et Kalman, ou les recharge depuis le registre.
 
+    Args:
+        data (list): Série de consommation.
+        registry (ModelRegistry): Registre des modèles.
+
+    Returns:
+        dict: Modèles entraînés, indexés par nom.
+    """
+    return {
+        "AR": registry.get_or_fit("ar", data, train_ar_model, AR_PARAMS),
+        "SARIMAX": registry.get_or_fit("sarimax", data, train_sarimax_model, SARIMAX_PARAMS),
+        "Kalman": registry.get_or_fit("kalman", data, run_kalman_filter, KALMAN_PARAMS),
+    }
+
+def prune_models(data, registry):
+    """
+    Supprime du registre les modèles AR, SARIMAX et Kalman ajustés sur d'autres données.
+
+    Args:
+        data (list): Série de consommation courante.
+        registry (ModelRegistry): Registre des modèles.
+
+    Returns:
+        int: Nombre de modèles supprimés.
+    """
+    params = {"ar": AR_PARAMS, "sarimax": SARIMAX_PARAMS, "kalman": KALMAN_PARAMS, "kalman_online": KALMAN_PARAMS}
+    return sum(registry.prune(name, {data_fingerprint(data, p)}) for name, p in params.items())
+
+def load_models(data, registry):
+    """
+    Recharge les modèles AR, SARIMAX et Kalman depuis le registre, sans entraînement.
+
+    Args:
+        data (list): Série de consommation.
+        registry (ModelRegistry): Registre des modèles.
+
+    Returns:
+        dict: Modèles indexés par nom, ou None si l'un d'eux n'est pas encore entraîné.
+    """
+    models = {
+        "AR": registry.get("ar", data_fingerprint(data, AR_PARAMS)),
+        "SARIMAX": registry.get("sarimax", data_fingerprint(data, SARIMAX_PARAMS)),
+        "Kalman": registry.get("kalman", data_fingerprint(data, KALMAN_PARAMS)),
+    }
+    return None if any(model is None for model in models.values()) else models
+
+@instrument()
+def forecast_arrays(models, steps=10):
+    """
+    Calcule les prévisions à partir de modèles déjà entraînés, sans conversion en listes.
+
+    Args:
+        models (dict): Modèles retournés par `fit_models`.
+        steps (int): Nombre de pas à prédire.
+
+    Returns:
+        dict: Tableaux numpy de chaque modèle ("Kalman" couvre tout l'historique filtré).
+    """
     return {
-        "AR": ar_model.predict(10).tolist(),
-        "SARIMAX": sarimax_model.forecast(10).tolist(),
-        "Kalman": filtered_values
+        "AR": np.asarray(models["AR"].predict(steps), dtype=np.float64),
+        "SARIMAX": np.asarray(models["SARIMAX"].forecast(steps), dtype=np.float64),
+        "Kalman": np.asarray(models["Kalman"]["filtered"], dtype=np.float64)
+    }
+
+def forecast(models, steps=10):
+    """
+    Calcule les prévisions à partir de modèles déjà entraînés.
+
+    Args:
+        models (dict): Modèles retournés par `fit_models`.
+        steps (int): Nombre de pas à prédire.
+
+    Returns:
+        dict: Prévisions de chaque modèle.
+    """
+    return {name: values.tolist() for name, values in forecast_arrays(models, steps).items()}
+
+def batch_forecast(queries, forecasters, max_workers=None):
+    """
+    Répond à un lot de requêtes (modèle, horizon) avec une seule prévision par modèle.
+
+    Les requêtes sont regroupées par modèle ajusté : chaque modèle prévoit une
+    fois l'horizon le plus long demandé, puis le résultat est découpé pour les
+    autres horizons. Les modèles indépendants tournent en parallèle dans un pool
+    de threads (statsmodels libère le GIL dans son algèbre linéaire).
+
+    Args:
+        queries (list): Couples (clé du modèle, horizon en pas).
+        forecasters (dict): Clé du modèle -> fonction `steps -> prévisions`.
+        max_workers (int): Nombre de threads (par défaut, un par modèle dans la limite des cœurs).
+
+    Returns:
+        list: Prévisions (np.ndarray) dans l'ordre des requêtes.
+    """
+    groups = {}
+    for i, (key, _) in enumerate(queries):
+        groups.setdefault(key, []).append(i)
+
+    def run(key):
+        steps = max(queries[i][1] for i in groups[key])
+        return key, np.asarray(forecasters[key](steps), dtype=np.float64)
+
+    results = [None] * len(queries)
+    if not groups:
+        return results
+    max_workers = max_workers or min(len(groups), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for key, predictions in executor.map(run, groups):
+            for i in groups[key]:
+                results[i] = predictions[:queries[i][1]]
+    return results
+
+@instrument(counts=lambda result, data, *args, **kwargs: {"rows": len(data)})
+def make_predictions(data, registry=None):
+    registry = registry or ModelRegistry()
+    return forecast(fit_models(data, registry))
+
+def load_kalman_state(data, registry):
+    """
+    Retourne l'état courant (x, P) du filtre de Kalman.
+
+    L'état mis à jour en ligne est rechargé s'il existe ; sinon l'historique
+    complet est rejoué une seule fois (démarrage à froid).
+
+    Args:
+        data (list): Série de consommation ayant servi au démarrage à froid.
+        registry (ModelRegistry): Registre des modèles.
+
+    Returns:
+        tuple: (clé du registre, état du filtre)
+    """
+    key = data_fingerprint(data, KALMAN_PARAMS)
+    state = registry.get("kalman_online", key)
+    if state is None:
+        state = registry.get_or_fit("kalman", data, run_kalman_filter, KALMAN_PARAMS)["state"]
+    return key, state
+
+def update_kalman(state, observations, steps=10):
+    """
+    Avance le filtre avec les dernières observations et prévoit `steps` pas.
+
+    Args:
+        state (dict): État courant du filtre.
+        observations (list): Nouvelles observations de consommation.
+        steps (int): Horizon de prévision.
+
+    Returns:
+        tuple: (nouvel état, réponse de l'API)
+    """
+    state = kalman_update(state, observations)
+    return state, {
+        "estimate": state["x"],
+        "variance": state["P"],
+        "n_obs": state["n_obs"],
+        "forecast": kalman_forecast(state, steps)
     }
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Prétraitement des séries au pas de 15 minutes.
+#
+# Les fichiers RTE sont en heure locale : le passage à l'heure d'été supprime
+# quatre quarts d'heure, celui à l'heure d'hiver en double quatre, et certains
+# quarts d'heure manquent. Les modèles saisonniers supposent 96 pas par jour :
+# les données sont donc replacées sur une grille explicite avant d'être comblées.
+
+STEP = pd.Timedelta('15min')
+
+
+def to_regular_grid(df, step=STEP):
+    """
+    Replace un DataFrame indexé par datetime sur une grille régulière, en une passe.
+
+    Les horodatages hors grille sont ignorés, les pas absents valent NaN. Si
+    l'index est déjà régulier, le DataFrame est retourné tel quel (sans copie).
+
+    Args:
+        df (pd.DataFrame): Données triées par datetime.
+        step (pd.Timedelta): Pas de la grille.
+
+    Returns:
+        tuple: (DataFrame sur la grille, nombre de pas ajoutés, nombre de lignes hors grille)
+    """
+    if len(df) < 2:
+        return df, 0, 0
+    ticks = df.index.values.astype('datetime64[ns]').view(np.int64)
+    if (np.diff(ticks) == step.value).all():
+        return df, 0, 0
+    offsets, remainder = np.divmod(ticks - ticks[0], step.value)
+    on_grid = remainder == 0
+    values = np.full((offsets[-1] + 1, df.shape[1]), np.nan, dtype=np.result_type(*df.dtypes))
+    values[offsets[on_grid]] = df.to_numpy()[on_grid]
+    index = pd.date_range(df.index[0], periods=len(values), freq=step, name=df.index.name)
+    added = len(values) - np.unique(offsets[on_grid]).size
+    return pd.DataFrame(values, index=index, columns=df.columns, copy=False), added, int((~on_grid).sum())
+
+
+def gap_runs(df):
+    """
+    Liste les plages de valeurs manquantes par encodage par plages (RLE) vectorisé.
+
+    Args:
+        df (pd.DataFrame): Données sur une grille régulière.
+
+    Returns:
+        pd.DataFrame: Une ligne par trou : colonne, début, fin, nombre de pas.
+    """
+    missing = np.isnan(df.to_numpy(dtype=np.float64))
+    padded = np.zeros((len(df) + 2, df.shape[1]), dtype=np.int8)
+    padded[1:-1] = missing
+    # Début (+1) et fin (-1) de chaque plage, colonne par colonne
+    rows, cols = np.nonzero(np.diff(padded, axis=0).T)
+    starts, stops = cols[0::2], cols[1::2]
+    return pd.DataFrame({
+        "colonne": df.columns[rows[0::2]],
+        "début": df.index[starts],
+        "fin": df.index[stops - 1],
+        "pas": stops - starts
+    })
+
+
+def fill_gaps(values):
+    """
+    Comble les valeurs manquantes de toutes les colonnes en une opération 2-D.
+
+    Interpolation linéaire entre les valeurs connues qui encadrent chaque trou
+    (identique à `interpolate(method='time')` sur une grille régulière), valeur
+    la plus proche aux extrémités (comme `bfill().ffill()`).
+
+    Args:
+        values (np.ndarray): Matrice (n, colonnes) avec des NaN.
+
+    Returns:
+        np.ndarray: Nouvelle matrice comblée (même dtype).
+    """
+    n = len(values)
+    valid = ~np.isnan(values)
+    position = np.arange(n)[:, None]
+    # Position de la dernière valeur connue avant (ou à) chaque pas, et de la suivante
+    before = np.maximum.accumulate(np.where(valid, position, -1), axis=0)
+    after = np.minimum.accumulate(np.where(valid, position, n)[::-1], axis=0)[::-1]
+    columns = np.arange(values.shape[1])
+    left = values[np.clip(before, 0, n - 1), columns]
+    right = values[np.clip(after, 0, n - 1), columns]
+    has_left, has_right = before >= 0, after < n
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = (position - before) / (after - before)
+        interpolated = left + weight * (right - left)
+    filled = np.where(has_left & has_right, interpolated, np.where(has_left, left, right))
+    filled = np.where(valid, values, filled)
+    filled[~(has_left | has_right)] = np.nan
+    return filled.astype(values.dtype, copy=False)
+
+
+# Termes de Fourier des saisonnalités journalière et hebdomadaire
+FOURIER_TERMS = {96: 10, 672: 5}  # période (pas de 15 min) -> nombre d'harmoniques
+
+
+def fourier_terms(start, steps, terms=FOURIER_TERMS):
+    """
+    Calcule les régresseurs de Fourier des saisonnalités journalière et hebdomadaire.
+
+    Les termes dépendent uniquement de la position dans la série : ceux de
+    l'horizon de prévision sont la suite directe de ceux de l'entraînement.
+
+    Args:
+        start (int): Position du premier pas.
+        steps (int): Nombre de pas.
+        terms (dict): Période -> nombre d'harmoniques.
+
+    Returns:
+        np.ndarray: Matrice (steps, 2 * nombre total d'harmoniques).
+    """
+    t = np.arange(start, start + steps, dtype=np.float64)[:, None]
+    columns = []
+    for period, harmonics in terms.items():
+        angle = 2 * np.pi * t * np.arange(1, harmonics + 1) / period
+        columns += [np.sin(angle), np.cos(angle)]
+    return np.hstack(columns)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from backend.instrumentation import stage
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MODELS_DIR = PROJECT_ROOT / "models"
+LATEST_FILE = "latest_jobs.json"
+MAX_LOADED = 16  # modèles gardés en mémoire (les moins récemment utilisés sont relâchés)
+
+
+def data_fingerprint(data, params=None):
+    """
+    Calcule l'empreinte des données d'entraînement et des hyperparamètres.
+
+    Args:
+        data (array-like): Série d'entraînement.
+        params (dict): Hyperparamètres du modèle.
+
+    Returns:
+        str: Empreinte hexadécimale (16 caractères).
+    """
+    values = np.ascontiguousarray(np.asarray(data, dtype=np.float64))
+    digest = hashlib.sha256(values.tobytes())
+    digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+class ModelRegistry:
+    """
+    Registre des modèles entraînés, conservés en mémoire et sur disque.
+
+    Chaque modèle est identifié par son nom et l'empreinte de ses données
+    d'entraînement : un modèle n'est réentraîné que si cette empreinte change.
+    Les modèles sont chargés depuis le disque à la première demande et au plus
+    `max_loaded` restent en mémoire.
+
+    Args:
+        save_dir (str/Path): Répertoire des modèles.
+        max_loaded (int): Nombre maximal de modèles gardés en mémoire.
+    """
+
+    def __init__(self, save_dir=MODELS_DIR, max_loaded=MAX_LOADED):
+        self.save_dir = Path(save_dir)
+        self.max_loaded = max_loaded
+        self._models = OrderedDict()
+
+    def _path(self, name, key):
+        return self.save_dir / f"{name}_{key}.joblib"
+
+    def _remember(self, name, key, model):
+        self._models[(name, key)] = model
+        self._models.move_to_end((name, key))
+        while len(self._models) > self.max_loaded:
+            self._models.popitem(last=False)
+
+    def prune(self, name, keep):
+        """
+        Supprime (mémoire et disque) les modèles `name` dont l'empreinte n'est pas dans `keep`.
+
+        Args:
+            name (str): Nom du modèle.
+            keep (set): Empreintes à conserver (celles des données courantes).
+
+        Returns:
+            int: Nombre de fichiers supprimés.
+        """
+        for loaded in [k for k in self._models if k[0] == name and k[1] not in keep]:
+            del self._models[loaded]
+        removed = 0
+        for file in self.save_dir.glob(f"{name}_*.joblib"):
+            model_name, _, key = file.stem.rpartition("_")
+            if model_name == name and key not in keep:
+                file.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def get(self, name, key):
+        """
+        Retourne le modèle enregistré, ou None s'il n'existe pas.
+        """
+        if (name, key) in self._models:
+            self._models.move_to_end((name, key))
+            return self._models[(name, key)]
+        path = self._path(name, key)
+        if path.exists():
+            model = joblib.load(path)
+            self._remember(name, key, model)
+            return model
+        return None
+
+    def put(self, name, key, model):
+        """
+        Enregistre un modèle en mémoire et sur disque.
+        """
+        os.makedirs(self.save_dir, exist_ok=True)
+        path = self._path(name, key)
+        # Écriture dans un fichier temporaire pour ne jamais laisser un fichier tronqué
+        tmp_path = path.with_suffix(".tmp")
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+        self._remember(name, key, model)
+
+    def set_latest(self, kind, record):
+        """
+        Enregistre sur disque la dernière tâche terminée d'une catégorie (modèle courant de l'API).
+
+        Args:
+            kind (str): Catégorie de tâche ('train', 'baseline', ...).
+            record (dict): Statut de la tâche (sérialisable en JSON).
+        """
+        os.makedirs(self.save_dir, exist_ok=True)
+        latest = self.latest()
+        latest[kind] = record
+        path = self.save_dir / LATEST_FILE
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(latest, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def latest(self):
+        """
+        Dernières tâches terminées enregistrées par `set_latest`.
+
+        Returns:
+            dict: Catégorie -> statut de la tâche (vide si rien n'est enregistré).
+        """
+        try:
+            return json.loads((self.save_dir / LATEST_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def get_or_fit(self, name, data, fit_fn, params=None):
+        """
+        Retourne le modèle correspondant aux données, en l'entraînant si nécessaire.
+
+        Args:
+            name (str): Nom du modèle.
+            data (array-like): Données d'entraînement.
+            fit_fn (callable): Fonction d'entraînement appelée avec `data`.
+            params (dict): Hyperparamètres intervenant dans l'empreinte.
+
+        Returns:
+            Modèle entraîné.
+        """
+        key = data_fingerprint(data, params)
+        model = self.get(name, key)
+        if model is None:
+            with stage(f"fit_{name}", rows=len(data)):
+                model = fit_fn(data)
+            self.put(name, key, model)
+        return model
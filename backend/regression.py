@@ -0,0 +1,192 @@
+import copy
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from backend.chargement_donnes import load_temperature
+
+# Modèle de régression sur variables explicatives.
+#
+# La consommation au pas t est expliquée par une matrice construite sans boucle :
+# retards (96 et 672 pas), moyennes glissantes sur un jour et une semaine arrêtées
+# à t - 96, calendrier, température journalière diffusée aux pas de 15 minutes et,
+# si elles sont fournies, les prévisions RTE. Toutes ces variables sont connues un
+# jour à l'avance : les prévisions avancent par blocs de 96 pas, un seul appel à
+# l'estimateur par bloc. Le retard 1 n'intervient que par un terme AR(1) sur les
+# résidus, propagé pas à pas sans appel à l'estimateur.
+
+LAGS = (96, 672)
+WINDOWS = (96, 672)
+BLOCK = min(LAGS)  # pas prévus d'un seul appel ; les fenêtres s'arrêtent à t - BLOCK
+HISTORY = max(max(LAGS), max(WINDOWS) + BLOCK - 1)  # nombre d'observations nécessaires aux retards
+STEP = pd.Timedelta('15min')
+
+
+def lag_features(y, start, stop):
+    """
+    Retards et moyennes glissantes des positions [start, stop) de `y`.
+
+    Seules les valeurs antérieures à `stop - BLOCK` sont lues.
+
+    Args:
+        y (np.ndarray): Série (au moins HISTORY valeurs avant `start`).
+        start (int): Première position.
+        stop (int): Position de fin (exclue).
+
+    Returns:
+        np.ndarray: Matrice (stop - start, len(LAGS) + len(WINDOWS)).
+    """
+    positions = np.arange(start, stop)
+    end = positions - BLOCK + 1  # fin (exclue) de chaque fenêtre
+    cumsum = np.concatenate([[0.0], np.cumsum(y[:end[-1]])])
+    columns = [y[positions - lag] for lag in LAGS]
+    columns += [(cumsum[end] - cumsum[end - window]) / window for window in WINDOWS]
+    return np.column_stack(columns)
+
+
+def temperature_at(times, temperature):
+    """
+    Température journalière de chaque pas de 15 minutes.
+
+    Les jours absents du fichier reçoivent la normale de leur jour de l'année
+    (moyenne des années disponibles).
+
+    Args:
+        times (pd.DatetimeIndex): Horodatages.
+        temperature (pd.Series): Température indexée par jour.
+
+    Returns:
+        np.ndarray: Température de chaque pas.
+    """
+    days = times.normalize()
+    values = temperature.reindex(days).to_numpy(dtype=np.float64, copy=True)
+    missing = np.isnan(values)
+    if missing.any():
+        normals = temperature.groupby(temperature.index.dayofyear).mean()
+        values[missing] = normals.reindex(days.dayofyear[missing]).to_numpy()
+        values[np.isnan(values)] = temperature.mean()
+    return values
+
+
+def calendar_features(times):
+    """Quart d'heure de la journée, jour de la semaine, week-end, jour de l'année, mois."""
+    slot = times.hour * 4 + times.minute // 15
+    weekday = times.dayofweek
+    return np.column_stack([slot, weekday, weekday >= 5, times.dayofyear, times.month]).astype(np.float64)
+
+
+class LagRegressionModel:
+    """
+    Régression (gradient boosting ou ridge) sur retards, calendrier, température et prévisions RTE.
+
+    Les résidus suivent un AR(1) de coefficient `phi`, estimé sur les résidus
+    d'ajustement ; `residual` est le résidu de la dernière observation.
+
+    Args:
+        method (str): 'hgb' (HistGradientBoostingRegressor, multithread) ou 'ridge'.
+        temperature (pd.Series): Températures journalières (par défaut, `load_temperature()`).
+        **params: Hyperparamètres de l'estimateur scikit-learn.
+    """
+
+    def __init__(self, method='hgb', temperature=None, **params):
+        if method == 'hgb':
+            self.estimator = HistGradientBoostingRegressor(**{"max_iter": 300, "learning_rate": 0.1, **params})
+        elif method == 'ridge':
+            self.estimator = make_pipeline(StandardScaler(), Ridge(**{"alpha": 1.0, **params}))
+        else:
+            raise ValueError(f"Méthode inconnue : {method}")
+        self.method = method
+        self.temperature = load_temperature() if temperature is None else temperature
+        self.exog_columns = []
+
+    def _design(self, times, exog):
+        # Variables connues à l'avance : calendrier, température, prévisions RTE
+        columns = [calendar_features(times), temperature_at(times, self.temperature)[:, None]]
+        if self.exog_columns:
+            if exog is None:
+                raise ValueError("Des données exogènes sont nécessaires pour ce modèle")
+            exog = np.asarray(exog, dtype=np.float64)
+            if len(exog) < len(times):
+                raise ValueError(f"Besoin d'au moins {len(times)} observations exogènes")
+            columns.append(exog[:len(times)])
+        return np.hstack(columns)
+
+    def fit(self, series, exog=None):
+        """
+        Ajuste le modèle sur une série indexée par datetime (pas de 15 minutes).
+
+        Args:
+            series (pd.Series): Consommation.
+            exog (pd.DataFrame): Prévisions RTE alignées sur `series` (optionnel).
+
+        Returns:
+            LagRegressionModel: Le modèle ajusté.
+        """
+        y = series.to_numpy(dtype=np.float64)
+        if len(y) <= HISTORY:
+            raise ValueError(f"Au moins {HISTORY + 1} observations sont nécessaires")
+        self.exog_columns = list(exog.columns) if exog is not None else []
+        times = pd.DatetimeIndex(series.index)
+        X = np.hstack([
+            lag_features(y, HISTORY, len(y)),
+            self._design(times[HISTORY:], None if exog is None else np.asarray(exog)[HISTORY:])
+        ])
+        self.estimator.fit(X, y[HISTORY:])
+        residuals = y[HISTORY:] - self.estimator.predict(X)
+        self.phi = float(residuals[1:] @ residuals[:-1] / (residuals[:-1] @ residuals[:-1]))
+        self.residual = float(residuals[-1])
+        self._history = y[-HISTORY:].copy()
+        self._last_time = times[-1]
+        self.nobs = len(y)
+        return self
+
+    def extend(self, values, exog=None):
+        """
+        Ajoute de nouvelles observations sans réajuster (comme `SARIMAXResults.extend`).
+
+        Returns:
+            LagRegressionModel: Copie du modèle avec l'historique prolongé.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        extended = copy.copy(self)
+        if len(values):
+            # Résidu de la dernière nouvelle observation, point de départ du terme AR(1)
+            y = np.concatenate([self._history, values])
+            last = self._last_time + STEP * len(values)
+            if exog is not None:
+                exog = np.asarray(exog, dtype=np.float64)[-1:]
+            X = np.hstack([lag_features(y, len(y) - 1, len(y)), self._design(pd.DatetimeIndex([last]), exog)])
+            extended.residual = float(values[-1] - self.estimator.predict(X)[0])
+        extended._history = np.concatenate([self._history, values])[-HISTORY:]
+        extended._last_time = self._last_time + STEP * len(values)
+        extended.nobs = self.nobs + len(values)
+        return extended
+
+    def forecast(self, steps, exog=None):
+        """
+        Prévision de `steps` pas après la dernière observation.
+
+        Chaque bloc de BLOCK pas est prédit en un appel, à partir des valeurs
+        prévues des blocs précédents ; le résidu décroît en `phi ** k`.
+
+        Args:
+            steps (int): Nombre de pas.
+            exog (pd.DataFrame): Prévisions RTE des pas futurs (si le modèle en utilise).
+
+        Returns:
+            pd.Series: Prévisions indexées par datetime.
+        """
+        times = pd.date_range(self._last_time + STEP, periods=steps, freq=STEP)
+        known = self._design(times, exog)
+        buffer = np.concatenate([self._history, np.empty(steps)])
+        n = len(self._history)
+        residuals = self.residual * self.phi ** np.arange(1, steps + 1)
+        for start in range(0, steps, BLOCK):
+            stop = min(start + BLOCK, steps)
+            X = np.hstack([lag_features(buffer, n + start, n + stop), known[start:stop]])
+            buffer[n + start:n + stop] = self.estimator.predict(X) + residuals[start:stop]
+        return pd.Series(buffer[n:], index=times)
@@ -0,0 +1,176 @@
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+
+from backend.downsampling import range_bounds
+from backend.instrumentation import instrument
+
+# Formats de réponse des séries de l'API.
+#
+# - "json" : {"nom": [valeurs, ...]} (format historique) ;
+# - "ndjson" : une ligne JSON par bloc de points, envoyée au fil de l'eau ;
+# - "binary" : en-tête JSON (début, pas et longueur de chaque série) puis les
+#   valeurs float32 en little-endian ; les horodatages ne sont pas transmis.
+#
+# Toutes les séries peuvent être restreintes à une fenêtre [start, end] et
+# décimées (un point sur `step`) avant l'encodage.
+
+FORMATS = ("json", "ndjson", "binary")
+MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "binary": "application/octet-stream"
+}
+CHUNK_SIZE = 10000
+
+
+def to_series(values, times):
+    """
+    Associe des valeurs à leurs horodatages.
+
+    Args:
+        values (array-like): Valeurs de la série.
+        times (np.ndarray): Horodatages int64 (ns), même longueur.
+
+    Returns:
+        tuple: (horodatages int64, valeurs float64)
+    """
+    return np.asarray(times, dtype=np.int64), np.asarray(values, dtype=np.float64)
+
+
+def forecast_times(last_time, steps, freq='15min'):
+    """Horodatages int64 (ns) des `steps` pas suivant `last_time`."""
+    index = pd.date_range(pd.Timestamp(last_time), periods=steps + 1, freq=freq)[1:]
+    return index.values.astype('datetime64[ns]').view(np.int64)
+
+
+def select(series, start=None, end=None, step=1):
+    """
+    Restreint chaque série à une fenêtre de dates et garde un point sur `step`.
+
+    Args:
+        series (dict): Nom -> (horodatages int64, valeurs).
+        start, end: Bornes de la fenêtre (incluses), None pour les extrémités.
+        step (int): Pas de décimation.
+
+    Returns:
+        dict: Nom -> (horodatages, valeurs), vues sans copie.
+    """
+    selected = {}
+    for name, (times, values) in series.items():
+        lo, hi = range_bounds(times, start, end)
+        selected[name] = (times[lo:hi:step], values[lo:hi:step])
+    return selected
+
+
+def encode_json(series):
+    """Format historique : {"nom": [valeurs, ...]}."""
+    return {name: values.tolist() for name, (_, values) in series.items()}
+
+
+def iter_ndjson(series, chunk_size=CHUNK_SIZE):
+    """
+    Encode les séries en NDJSON, par blocs de `chunk_size` points.
+
+    Chaque ligne : {"series", "offset", "time" (secondes epoch), "values"}.
+
+    Yields:
+        bytes: Une ligne JSON terminée par un saut de ligne.
+    """
+    for name, (times, values) in series.items():
+        seconds = times // 10**9
+        for offset in range(0, len(values), chunk_size):
+            line = {
+                "series": name,
+                "offset": offset,
+                "time": seconds[offset:offset + chunk_size].tolist(),
+                "values": values[offset:offset + chunk_size].tolist()
+            }
+            yield json.dumps(line).encode() + b"\n"
+
+
+def _grid(times):
+    """
+    Grille régulière portant la série : (pas en secondes, position de chaque point).
+
+    Une série à trous (pas multiples du plus petit) reste sur sa grille ; None si
+    elle n'a pas de pas commun en secondes ou si la grille doublerait sa taille.
+    """
+    if len(times) < 2:
+        return 0, np.arange(len(times))
+    steps = np.diff(times)
+    step = int(steps.min())
+    if step <= 0 or step % 10**9 or np.any(steps % step):
+        return None
+    positions = (times - times[0]) // step
+    if positions[-1] + 1 > 2 * len(times):
+        return None
+    return step // 10**9, positions
+
+
+@instrument()
+def encode_binary(series):
+    """
+    Encode les séries en binaire compact.
+
+    Disposition : longueur de l'en-tête (uint32), en-tête JSON
+    {"series": [{"name", "start" (secondes epoch), "step" (secondes), "length"}, ...]},
+    puis pour chaque série `length` valeurs float32 : le point i est daté de
+    `start + i * step`, les pas absents de la série valent NaN (`"gaps": true`).
+    Une série sans pas commun a `"step": null` et ses `length` décalages uint32
+    (secondes depuis `start`) précèdent ses valeurs.
+
+    Returns:
+        bytes: Charge utile.
+    """
+    items, parts = [], []
+    for name, (times, values) in series.items():
+        start = int(times[0] // 10**9) if len(times) else 0
+        grid = _grid(times)
+        if grid is None:
+            items.append({"name": name, "start": start, "step": None, "length": len(values)})
+            parts.append((times // 10**9 - start).astype('<u4').tobytes())
+            parts.append(values.astype('<f4').tobytes())
+            continue
+        step, positions = grid
+        length = int(positions[-1]) + 1 if len(positions) else 0
+        item = {"name": name, "start": start, "step": step, "length": length}
+        if length > len(values):
+            item["gaps"] = True
+            filled = np.full(length, np.nan, dtype='<f4')
+            filled[positions] = values
+            values = filled
+        items.append(item)
+        parts.append(values.astype('<f4').tobytes())
+    header = json.dumps({"series": items}).encode()
+    return b"".join([struct.pack("<I", len(header)), header] + parts)
+
+
+def decode_binary(payload):
+    """
+    Décode une charge utile de `encode_binary` (côté client).
+
+    Returns:
+        dict: Nom -> (pd.DatetimeIndex, np.ndarray float32).
+    """
+    (size,) = struct.unpack_from("<I", payload)
+    header = json.loads(payload[4:4 + size])
+    position = 4 + size
+    series = {}
+    for item in header["series"]:
+        n, start = item["length"], pd.Timestamp(item["start"], unit='s')
+        if item["step"] is None:
+            offsets = np.frombuffer(payload, dtype='<u4', count=n, offset=position)
+            position += 4 * n
+            index = start + pd.to_timedelta(offsets.astype(np.int64), unit='s')
+        else:
+            index = pd.date_range(start, periods=n, freq=pd.Timedelta(seconds=item["step"] or 1))
+        values = np.frombuffer(payload, dtype='<f4', count=n, offset=position)
+        position += 4 * n
+        if item.get("gaps"):
+            keep = ~np.isnan(values)
+            index, values = index[keep], values[keep]
+        series[item["name"]] = (index, values)
+    return series
@@ -0,0 +1,161 @@
+import copy
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from threadpoolctl import threadpool_limits
+
+from backend.chargement_donnes import load_temperature
+from backend.regression import temperature_at
+
+# Un petit modèle par quart d'heure de la journée.
+#
+# Au lieu d'un SARIMA m=96 qui porte toute la saisonnalité intrajournalière, chaque
+# quart d'heure (00:00, 00:15, ..., 23:45) a sa propre série journalière d'environ
+# 800 points, modélisée par une régression sur la température à erreurs
+# SARIMA(1,0,0)(1,0,0,7) avec constante :
+#
+#     y_t = β'x_t + u_t,   u_t = c + φ u_{t-1j} + Φ u_{t-7j} - φΦ u_{t-8j} + ε_t
+#
+# Les 96 ajustements sont indépendants et répartis sur un pool de processus ; les
+# paramètres sont rangés dans une matrice (96, k). Au pas de 15 minutes, les retards
+# d'un jour valent 96 pas : les 96 pas d'un même jour de l'horizon ne dépendent que
+# des jours précédents et sont prévus ensemble, par une opération vectorisée.
+
+STEPS_PER_DAY = 96
+STEP = pd.Timedelta('15min')
+HISTORY_DAYS = 798  # 114 semaines : environ 800 points par quart d'heure
+MIN_DAYS = 28
+ORDER = (1, 0, 0)
+SEASONAL_ORDER = (1, 0, 0, 7)
+HEATING_THRESHOLD = 15.0  # °C, seuil des degrés-jours de chauffage
+# Colonnes de la matrice des paramètres (ordre de statsmodels)
+PARAMS = ('intercept', 'temperature', 'heating', 'ar.L1', 'ar.S.L7', 'sigma2')
+LAGS = (STEPS_PER_DAY, 7 * STEPS_PER_DAY, 8 * STEPS_PER_DAY)  # u_{t-1j}, u_{t-7j}, u_{t-8j}
+
+
+def day_slots(times):
+    """Quart d'heure de la journée (0 à 95) de chaque horodatage."""
+    return times.hour * 4 + times.minute // 15
+
+
+def _init_worker():
+    threadpool_limits(1)
+
+
+def _fit_slots(chunk):
+    """Ajuste les modèles d'un groupe de quarts d'heure ; retourne une ligne de paramètres par quart d'heure."""
+    rows = []
+    for values, exog in chunk:
+        # Série ramenée à l'ordre de l'unité : l'optimiseur converge (et plus vite) ;
+        # constante, coefficients de régression et variance sont remis à l'échelle ensuite
+        scale = np.abs(values).mean()
+        results = SARIMAX(values / scale, exog=exog, order=ORDER, seasonal_order=SEASONAL_ORDER, trend='c').fit(disp=False)
+        rows.append(results.params * np.array([scale, scale, scale, 1, 1, scale ** 2]))
+    return rows
+
+
+class PerSlotModel:
+    """
+    96 modèles SARIMA journaliers indépendants, un par quart d'heure de la journée.
+
+    Args:
+        max_workers (int): Nombre de processus d'ajustement (par défaut, tous les cœurs ;
+            1 pour ajuster dans le processus courant, comme dans un processus du pool).
+        temperature (pd.Series): Températures journalières (par défaut, `load_temperature()`).
+    """
+
+    def __init__(self, max_workers=None, temperature=None):
+        self.max_workers = max_workers
+        self.temperature = load_temperature() if temperature is None else temperature
+
+    def _exog(self, times):
+        temperature = temperature_at(times, self.temperature)
+        return np.column_stack([temperature, np.maximum(HEATING_THRESHOLD - temperature, 0)])
+
+    def fit(self, series, exog=None):
+        """
+        Ajuste les 96 modèles sur une série indexée par datetime (pas de 15 minutes).
+
+        Args:
+            series (pd.Series): Consommation.
+            exog: Ignoré (la température est connue du modèle).
+
+        Returns:
+            PerSlotModel: Le modèle ajusté.
+        """
+        y = series.to_numpy(dtype=np.float64)
+        days = min(len(y) // STEPS_PER_DAY, HISTORY_DAYS)
+        if days < MIN_DAYS:
+            raise ValueError(f"Au moins {MIN_DAYS} jours d'observations sont nécessaires")
+        times = pd.DatetimeIndex(series.index)
+        window = slice(len(y) - days * STEPS_PER_DAY, len(y))
+        values, exog_values = y[window].reshape(days, STEPS_PER_DAY), self._exog(times[window])
+        exog_values = exog_values.reshape(days, STEPS_PER_DAY, -1)
+        # Colonne j du bloc = quart d'heure de la journée slots[j]
+        slots = day_slots(times[window][:STEPS_PER_DAY]).to_numpy()
+        tasks = [(values[:, j], exog_values[:, j]) for j in range(STEPS_PER_DAY)]
+
+        max_workers = self.max_workers or os.cpu_count()
+        # Déjà dans un processus du pool (JobManager, backtest) : pas de pool imbriqué
+        if max_workers == 1 or multiprocessing.parent_process() is not None:
+            rows = _fit_slots(tasks)
+        else:
+            chunks = [tasks[i::max_workers] for i in range(max_workers)]
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+                results = list(executor.map(_fit_slots, chunks))
+            rows = [None] * STEPS_PER_DAY
+            for i, chunk_rows in enumerate(results):
+                rows[i::max_workers] = chunk_rows
+
+        self.params = np.empty((STEPS_PER_DAY, len(PARAMS)))
+        self.params[slots] = np.vstack(rows)
+        self._history = y[-LAGS[-1]:].copy()
+        self._last_time = times[-1]
+        self.nobs = len(y)
+        return self
+
+    def extend(self, values, exog=None):
+        """
+        Ajoute de nouvelles observations sans réajuster (comme `SARIMAXResults.extend`).
+
+        Returns:
+            PerSlotModel: Copie du modèle avec l'historique prolongé.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        extended = copy.copy(self)
+        extended._history = np.concatenate([self._history, values])[-LAGS[-1]:]
+        extended._last_time = self._last_time + STEP * len(values)
+        extended.nobs = self.nobs + len(values)
+        return extended
+
+    def forecast(self, steps, exog=None):
+        """
+        Prévision de `steps` pas après la dernière observation, tous les quarts d'heure d'un jour à la fois.
+
+        Args:
+            steps (int): Nombre de pas.
+            exog: Ignoré.
+
+        Returns:
+            pd.Series: Prévisions indexées par datetime.
+        """
+        n = len(self._history)
+        days = -(-steps // STEPS_PER_DAY)
+        times = pd.date_range(self._last_time - STEP * (n - 1), periods=n + days * STEPS_PER_DAY, freq=STEP)
+        params = self.params[day_slots(times).to_numpy()]
+        intercept, beta, ar, seasonal_ar = params[:, 0], params[:, 1:3], params[:, 3], params[:, 4]
+        regression = (self._exog(times) * beta).sum(axis=1)
+
+        # Erreurs SARIMA u = y - β'x, prolongées jour par jour (96 pas par opération)
+        u = np.empty(len(times))
+        u[:n] = self._history - regression[:n]
+        for start in range(n, len(times), STEPS_PER_DAY):
+            p = np.arange(start, start + STEPS_PER_DAY)
+            u[p] = (intercept[p] + ar[p] * u[p - LAGS[0]] + seasonal_ar[p] * u[p - LAGS[1]]
+                    - ar[p] * seasonal_ar[p] * u[p - LAGS[2]])
+        forecast = (regression + u)[n:n + steps]
+        return pd.Series(forecast, index=times[n:n + steps])
@@ -1,51 +1,72 @@
 import os
+import sys
 import joblib
 from pathlib import Path
 from statsmodels.tsa.arima.model import ARIMA
 from statsmodels.tsa.statespace.sarimax import SARIMAX
-from chargement_donnes import load_consumption_data
+from backend.chargement_donnes import CompactFrame, load_consumption_data
+from backend.instrumentation import instrument, profile_run, rows
+from backend.preprocessing import FOURIER_TERMS, fill_gaps, fourier_terms, gap_runs, to_regular_grid
+from backend.hierarchy import HierarchicalModel
+from backend.regression import LagRegressionModel
+from backend.slot_models import PerSlotModel
 import pandas as pd 
 import plotly.express as px
 from pmdarima import auto_arima
-from statsmodels.tsa.seasonal import seasonal_decompose
 from sklearn.metrics import mean_absolute_error
 import numpy as np
 
-# Filter data to handle missing values and seasonal decomposition
+# Types de modèle -> choix de train_model
+MODEL_CHOICES = {'auto_arima': '1', 'sarima': '2', 'sarimax': '3', 'fourier': '4', 'gbm': '5', 'hierarchical': '6', 'per_slot': '7'}
+# Types de modèle utilisant les prévisions RTE (PrévisionsJ-1, PrévisionsJ)
+EXOG_MODELS = ('sarimax', 'gbm')
+# Horizons usuels (pas de 15 minutes) : J+1 et semaine suivante
+HORIZONS = {'day_ahead': 96, 'week_ahead': 672}
+
+# Filter data: regular 15-minute grid and missing values
+FILL_COLUMNS = ['PrévisionsJ-1', 'PrévisionsJ', 'Consommation']
+
+@instrument(counts=rows)
 def filter_data(data, cutoff_date):
     """
-    Filtre les données jusqu'à une date donnée et gère les valeurs manquantes.
+    Filtre les données jusqu'à une date donnée, les replace sur la grille de
+    15 minutes et comble les valeurs manquantes.
+
+    Le rapport des trous (une ligne par plage manquante) est conservé dans
+    `filtered_data.attrs['gaps']`.
     
     Args:
-        data (pd.DataFrame): Données à filtrer.
+        data (pd.DataFrame | CompactFrame): Données à filtrer.
         cutoff_date (str): Date limite pour le filtrage au format 'YYYY-MM-DD HH:MM:SS'.
     
     Returns:
-        pd.DataFrame: Données filtrées et traitées.
+        pd.DataFrame: Données filtrées et traitées (les colonnes sans trou ne sont pas copiées si la grille est déjà régulière).
     """
+    # Représentation compacte : vue float32 sur la période demandée
+    if isinstance(data, CompactFrame):
+        data = data.slice(None, cutoff_date).to_frame()
+
     # Convertir la colonne datetime en index
     if 'datetime' in data.columns:
         data['datetime'] = pd.to_datetime(data['datetime'])
         data.set_index('datetime', inplace=True)
     
-    # Filtrer les données
-    filtered_data = data.loc[:cutoff_date].copy()
-    
-    # Gérer les valeurs manquantes
-    for col in ['PrévisionsJ-1', 'PrévisionsJ', 'Consommation']:
-        if col in filtered_data.columns:
-            filtered_data.loc[:, col] = filtered_data[col].interpolate(method='time').bfill().ffill()
+    # Filtrer les données (vue, pas de copie) et les replacer sur la grille régulière
+    filtered_data, added, off_grid = to_regular_grid(data.loc[:cutoff_date])
     
-    # Seasonal decomposition
-    if 'Consommation' in filtered_data.columns:
-        try:
-            result = seasonal_decompose(filtered_data['Consommation'], model='additive', period=96)
-        except ValueError as e:
-            print(f"Decomposition failed: {e}")
+    # Gérer les valeurs manquantes : seules les colonnes à trous sont remplacées ; avec le
+    # copy-on-write de pandas, les autres ne sont pas copiées et `data` n'est pas modifié
+    columns = [col for col in FILL_COLUMNS if col in filtered_data.columns]
+    gaps = gap_runs(filtered_data[columns])
+    if len(gaps):
+        holed = [col for col in columns if col in set(gaps['colonne'])]
+        values = fill_gaps(filtered_data[holed].to_numpy())
+        for i, col in enumerate(holed):
+            filtered_data[col] = values[:, i]
+    filtered_data.attrs['gaps'] = gaps
     
-    # Check for missing values
-    print("Missing values after processing:")
-    print(filtered_data.isnull().sum())
+    print(f"Grille de 15 min : {added} pas ajoutés, {off_grid} lignes hors grille ignorées, "
+          f"{len(gaps)} trous comblés (plus long : {gaps['pas'].max() if len(gaps) else 0} pas)")
     
     return filtered_data
 # Message for user input
@@ -60,15 +81,29 @@ def user_input():
     print("1. ARIMA (auto)")
     print("2. SARIMA (manual)")
     print("3. SARIMAX (with exog variables)")
+    print("4. ARIMA + Fourier (daily and weekly seasonality)")
+    print("5. Gradient boosting (lags, calendar, temperature, RTE forecasts)")
+    print("6. Hierarchical (daily, hourly and intraday profile models, reconciled)")
+    print("7. Per-slot (one daily SARIMA per quarter-hour, fitted in parallel)")
     choice = input("Entrez le numéro correspondant à votre choix : ")
     return choice
+def _fit_counts(result, choice, train_series, exog_data=None):
+    # Lignes d'entraînement, itérations de l'optimiseur et évaluations de la vraisemblance
+    model = result[0]
+    retvals = getattr(getattr(model, 'arima_res_', model), 'mle_retvals', None) or {}
+    return {
+        "rows": len(train_series),
+        "iterations": retvals.get('iterations', getattr(getattr(model, 'estimator', None), 'n_iter_', None)),
+        "likelihood_evaluations": retvals.get('fcalls')
+    }
 # Training models
+@instrument(counts=_fit_counts)
 def train_model(choice, train_series, exog_data=None):
     """
     Entraîne le modèle sélectionné.
     
     Args:
-        choice (str): Choix du modèle ('1', '2', ou '3')
+        choice (str): Choix du modèle ('1' à '7')
         train_series (pd.Series): Série temporelle d'entraînement
         exog_data (pd.DataFrame): Données exogènes (pour SARIMAX)
     
@@ -120,9 +155,45 @@ def train_model(choice, train_series, exog_data=None):
         print(results.summary())
         return results, model_name, 'sarimax'
     
+    elif choice == "4":
+        # Saisonnalités portées par des régresseurs de Fourier plutôt que par m=96
+        model_name = "ARIMA(2,1,1) + Fourier"
+        print(f"Entraînement du modèle {model_name}...")
+        model = SARIMAX(
+            train_series,
+            exog=fourier_terms(0, len(train_series)),
+            order=(2, 1, 1),
+            enforce_stationarity=False
+        )
+        results = model.fit()
+        print(results.summary())
+        return results, model_name, 'fourier'
+    
+    elif choice == "5":
+        # Régression sur retards, calendrier, température et prévisions RTE (exog optionnelles)
+        model_name = "Gradient boosting (retards + température)"
+        print(f"Entraînement du modèle {model_name}...")
+        model = LagRegressionModel().fit(train_series, exog_data)
+        return model, model_name, 'gbm'
+    
+    elif choice == "6":
+        # Modèles journalier, horaire et profil intrajournalier, réconciliés au pas de 15 minutes
+        model_name = "Hiérarchique (jour, heure, profil)"
+        print(f"Entraînement du modèle {model_name}...")
+        model = HierarchicalModel().fit(train_series)
+        return model, model_name, 'hierarchical'
+    
+    elif choice == "7":
+        # Un SARIMA(1,0,0)(1,0,0,7) journalier par quart d'heure, sur un pool de processus
+        model_name = "SARIMA par quart d'heure (96 modèles)"
+        print(f"Entraînement du modèle {model_name}...")
+        model = PerSlotModel().fit(train_series)
+        return model, model_name, 'per_slot'
+    
     else:
         raise ValueError("Choix de modèle invalide")
 # Evaluate the model 
+@instrument(counts=lambda result, model, test_data, *args, **kwargs: {"rows": len(test_data)})
 def evaluate_model(model, test_data, model_type, exog_test=None):
     """
     Évalue le modèle sur les données de test.
@@ -130,8 +201,8 @@ def evaluate_model(model, test_data, model_type, exog_test=None):
     Args:
         model: Modèle entraîné
         test_data (pd.Series): Données de test
-        model_type (str): Type de modèle ('auto_arima', 'sarima', 'sarimax')
-        exog_test (pd.DataFrame): Données exogènes de test (pour SARIMAX)
+        model_type (str): Type de modèle ('auto_arima', 'sarima', 'sarimax', 'fourier', 'gbm', 'hierarchical', 'per_slot')
+        exog_test (pd.DataFrame): Données exogènes de test (pour SARIMAX et gbm)
     
     Returns:
         tuple: (prédictions, MAE)
@@ -144,12 +215,20 @@ def evaluate_model(model, test_data, model_type, exog_test=None):
         if exog_test is None:
             raise ValueError("Des données exogènes sont nécessaires pour SARIMAX")
         predictions = model.get_forecast(steps=len(test_data), exog=exog_test).predicted_mean
+    elif model_type == 'fourier':
+        exog = fourier_terms(model.model.nobs, len(test_data))
+        predictions = model.get_forecast(steps=len(test_data), exog=exog).predicted_mean
+    elif model_type == 'gbm':
+        predictions = model.forecast(len(test_data), exog_test)
+    elif model_type in ('hierarchical', 'per_slot'):
+        predictions = model.forecast(len(test_data))
     
     mae = mean_absolute_error(test_data, predictions)
     print(f"MAE on test set: {mae:.2f}")
     return predictions, mae
 # Make future predictions
-def make_future_predictions(model, model_type, steps, last_exog=None):
+@instrument(counts=lambda result, model, model_type, steps, *args, **kwargs: {"rows": steps})
+def make_future_predictions(model, model_type, steps, last_exog=None, reconciliation=None):
     """
     Fait des prédictions futures.
     
@@ -158,6 +237,8 @@ def make_future_predictions(model, model_type, steps, last_exog=None):
         model_type (str): Type de modèle
         steps (int): Nombre de pas à prédire
         last_exog (pd.DataFrame): Dernières données exogènes (pour SARIMAX)
+        reconciliation (str): Pour 'hierarchical' : 'bottom_up', 'ols' ou 'wls'
+            (par défaut, la méthode choisie à l'entraînement)
     
     Returns:
         pd.Series: Prédictions futures
@@ -172,6 +253,14 @@ def make_future_predictions(model, model_type, steps, last_exog=None):
         if len(last_exog) < steps:
             raise ValueError(f"Besoin d'au moins {steps} observations exogènes")
         return model.get_forecast(steps=steps, exog=last_exog.iloc[:steps]).predicted_mean
+    elif model_type == 'fourier':
+        return model.get_forecast(steps=steps, exog=fourier_terms(model.model.nobs, steps)).predicted_mean
+    elif model_type == 'gbm':
+        return model.forecast(steps, last_exog)
+    elif model_type == 'hierarchical':
+        return model.forecast(steps, method=reconciliation)
+    elif model_type == 'per_slot':
+        return model.forecast(steps)
 # Visualize predictions
 def visualize_predictions(actual_series, predictions, model_name, freq='15T'):
     """
@@ -228,19 +317,20 @@ def visualize_predictions(actual_series, predictions, model_name, freq='15T'):
     #print(f"Modèle sauvegardé sous {filename}")
 
 # Main function to run the training and evaluation (initialization of all parameters))
-def main():
-    # Charger et préparer les données
+def main(export_csv=False):
+    # Charger et préparer les données (cache binaire : pas de CSV intermédiaire,
+    # sauf export explicite avec --export-csv)
     PROJECT_ROOT = Path(__file__).parent.parent
     DATA_DIR = PROJECT_ROOT / "data"
     data = load_consumption_data(str(DATA_DIR))
-    
-    # Sauvegarder les données brutes
-    data.to_csv(DATA_DIR / "combined_energy_data.csv")
+    if export_csv:
+        data.to_csv(DATA_DIR / "combined_energy_data.csv")
     
     # Filtrer et prétraiter les données
     cutoff_date = pd.to_datetime("2025-02-24 10:15:00")
     filtered_data = filter_data(data, cutoff_date)
-    filtered_data.to_csv(DATA_DIR / "filtered_energy_data.csv")
+    if export_csv:
+        filtered_data.to_csv(DATA_DIR / "filtered_energy_data.csv")
     
     # Préparer les séries pour l'entraînement
     consumption_series = filtered_data['Consommation']
@@ -265,7 +355,7 @@ def main():
             model, 
             test, 
             model_type,
-            exog_test if model_type == 'sarimax' else None
+            exog_test if model_type in EXOG_MODELS else None
         )
         
         # Prédictions futures
@@ -274,7 +364,7 @@ def main():
             model,
             model_type,
             future_steps,
-            filtered_data[['PrévisionsJ-1', 'PrévisionsJ']].iloc[-future_steps:] if model_type == 'sarimax' else None
+            filtered_data[['PrévisionsJ-1', 'PrévisionsJ']].iloc[-future_steps:] if model_type in EXOG_MODELS else None
         )
         
         # Visualisation
@@ -289,4 +379,6 @@ def main():
         return
 
 if __name__ == "__main__":
-    main()
+    # Profil JSON de l'exécution (durées, lignes, itérations) dans profiles/
+    with profile_run():
+        main(export_csv='--export-csv' in sys.argv)
@@ -0,0 +1,68 @@
+"""
+Benchmark du filtre de Kalman scalaire : boucle `filterpy`, boucle du notebook
+(`.iloc[t]`) et moteur vectorisé `backend.kalman.kalman_filter_array`.
+
+Usage : python -m benchmarks.bench_kalman [nombre_de_points]
+"""
+import sys
+import time
+
+import numpy as np
+
+from backend.kalman import kalman_filter_array, kalman_filter_frame
+from backend.models import KALMAN_PARAMS, kalman_filter
+from benchmarks.common import make_frame
+
+COLUMNS = ['Consommation', 'PrévisionsJ-1', 'PrévisionsJ']
+
+
+def filterpy_loop(values):
+    kf = kalman_filter(values)
+    filtered = []
+    for z in values:
+        kf.predict()
+        kf.update([[z]])
+        filtered.append(kf.x[0, 0])
+    return np.asarray(filtered)
+
+
+def notebook_loop(data, column):
+    n = len(data)
+    x_hat = np.zeros(n)
+    P = KALMAN_PARAMS["P0"]
+    x_hat[0] = data[column].iloc[0]
+    for t in range(1, n):
+        x_hat[t] = x_hat[t - 1]
+        P = P + KALMAN_PARAMS["Q"]
+        K = P / (P + KALMAN_PARAMS["R"])
+        x_hat[t] = x_hat[t] + K * (data[column].iloc[t] - x_hat[t])
+        P = (1 - K) * P
+    return x_hat
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(n=75000):
+    df = make_frame(n, start='2023-01-01')
+    values = df['Consommation'].to_numpy()
+    Q, R, P0 = KALMAN_PARAMS["Q"], KALMAN_PARAMS["R"], KALMAN_PARAMS["P0"]
+    print(f"{n} points")
+
+    t_ref, ref = timed(filterpy_loop, values)
+    t_vec, (vec, _, _) = timed(kalman_filter_array, values, Q, R, None, P0)
+    print(f"filterpy        : {t_ref:8.3f} s")
+    print(f"vectorisé       : {t_vec:8.4f} s | x{t_ref / t_vec:,.0f} | écart max {np.abs(ref - vec).max():.2e}")
+
+    t_nb, _ = timed(notebook_loop, df, 'Consommation')
+    print(f"notebook .iloc  : {t_nb:8.3f} s")
+
+    t_batch, _ = timed(kalman_filter_frame, df, Q, R, COLUMNS, P0)
+    print(f"vectorisé x{len(COLUMNS)} col. : {t_batch:8.4f} s (contre ~{len(COLUMNS) * t_ref:.1f} s avec filterpy)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 75000)
@@ -0,0 +1,68 @@
+"""
+Pic de mémoire (RSS maximal) de l'entraînement et du service, avec les données
+en float64 (DataFrame du cache) ou en représentation compacte (`CompactFrame` :
+float32 sur grille régulière, index implicite, masque de bits des absences).
+
+Chaque scénario tourne dans un processus séparé.
+
+Usage : python -m benchmarks.bench_memory
+"""
+import contextlib
+import io
+import multiprocessing
+import time
+import warnings
+from pathlib import Path
+
+from backend.chargement_donnes import load_consumption_data
+from backend.downsampling import build_pyramid, downsample_range
+from backend.training import evaluate_model, filter_data, train_model
+from benchmarks.common import peak_mb
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CUTOFF = "2025-02-24 10:15:00"
+
+
+def _training(compact):
+    data = load_consumption_data(str(DATA_DIR), compact=compact)
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter("ignore")
+        filtered = filter_data(data, CUTOFF)
+        series = filtered['Consommation']
+        exog = filtered[['PrévisionsJ-1', 'PrévisionsJ']]
+        model, _, model_type = train_model('5', series[:-96], exog[:-96])
+        evaluate_model(model, series[-96:], model_type, exog[-96:])
+    return data
+
+
+def _serving(compact):
+    data = load_consumption_data(str(DATA_DIR), compact=compact)
+    df = data.to_frame() if compact else data
+    pyramid = build_pyramid(df, ['Consommation', 'PrévisionsJ-1', 'PrévisionsJ'])
+    for start, end in [(None, None), ("2024-01-01", "2024-03-01"), ("2024-06-01", "2024-06-02")]:
+        downsample_range(pyramid, 'Consommation', start, end)
+    return data
+
+
+def _run(scenario, compact, queue):
+    start = time.perf_counter()
+    data = {"entraînement": _training, "service": _serving}[scenario](compact)
+    nbytes = data.nbytes if compact else data.memory_usage(index=True).sum()
+    queue.put((time.perf_counter() - start, nbytes / 2**20, peak_mb()))
+
+
+def main():
+    print(f"{'scénario':<16}{'données':<10}{'durée (s)':>10}{'données (Mo)':>14}{'RSS max (Mo)':>14}")
+    queue = multiprocessing.Queue()
+    for scenario in ("entraînement", "service"):
+        for compact in (False, True):
+            process = multiprocessing.Process(target=_run, args=(scenario, compact, queue))
+            process.start()
+            seconds, data_mb, peak_mb = queue.get()
+            process.join()
+            label = "float32" if compact else "float64"
+            print(f"{scenario:<16}{label:<10}{seconds:>10.1f}{data_mb:>14.1f}{peak_mb:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark des lecteurs de blocs « Journée du ... » : boucles historiques
+(`read_excel.read_special_excel`, `front_end_07_03_25.load_data`) contre
+`backend.chargement_donnes.parse_rte_day_blocks`.
+
+Usage : python -m benchmarks.bench_parsing [nombre_de_jours]
+"""
+import re
+import sys
+import tempfile
+import time as timer
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from backend.chargement_donnes import parse_rte_day_blocks
+
+
+def make_raw_blocks(days, excel=True):
+    """Construit un export RTE synthétique de `days` jours (96 lignes par jour)."""
+    rng = np.random.default_rng(0)
+    start = datetime(2023, 1, 1)
+    rows = []
+    for d in range(days):
+        day = start + timedelta(days=d)
+        rows.append([f"Journée du {day:%d/%m/%Y}", np.nan, np.nan, np.nan])
+        rows.append(["Heures", "PrévisionJ-1", "PrévisionJ", "Consommation"])
+        for q in range(96):
+            hour = time(q // 4, 15 * (q % 4))
+            label = hour if excel else f"{hour.hour}:{hour.minute:02d}"
+            rows.append([label, *rng.normal(50000, 5000, 3).round()])
+        rows.append([np.nan] * 4)
+        rows.append([np.nan] * 4)
+    return pd.DataFrame(rows)
+
+
+# Boucle historique de read_excel.read_special_excel (sur le DataFrame brut)
+def legacy_read_special_excel(df):
+    current_date = None
+    data = []
+    daily_data = []
+    for index, row in df.iterrows():
+        if str(row[0]).startswith('Journée du'):
+            try:
+                current_date = datetime.strptime(row[0].split('du ')[1], '%d/%m/%Y')
+            except ValueError:
+                current_date = None
+            continue
+        if (isinstance(row[0], time) or (isinstance(row[0], str) and ':' in str(row[0]))):
+            try:
+                if isinstance(row[0], str):
+                    time_value = datetime.strptime(row[0], '%H:%M').time()
+                else:
+                    time_value = row[0].time() if isinstance(row[0], datetime) else row[0]
+                dt = datetime.combine(current_date, time_value)
+                daily_data.append({
+                    'datetime': dt,
+                    'PrévisionsJ-1': row[1],
+                    'PrévisionsJ': row[2],
+                    'Consommation': row[3]
+                })
+            except Exception:
+                continue
+        if pd.isna(row[0]):
+            if index + 1 < len(df) and pd.isna(df.iloc[index + 1][0]):
+                if daily_data and current_date:
+                    data.extend(daily_data)
+                    daily_data = []
+                current_date = None
+    return pd.DataFrame(data).set_index('datetime') if data else pd.DataFrame()
+
+
+# Boucle historique de front_end_07_03_25.load_data (sur le DataFrame brut)
+def legacy_front_end_load(df):
+    data_list = []
+    current_date = None
+    for i in range(len(df)):
+        row = df.iloc[i]
+        if isinstance(row[0], str) and "Journée du" in row[0]:
+            match = re.search(r"(\d{2}/\d{2}/\d{4})", row[0])
+            if match:
+                current_date = match.group(1)
+        elif isinstance(row[0], str) and re.match(r"\d{1,2}:\d{2}", row[0]):
+            if current_date:
+                full_datetime = pd.to_datetime(f"{current_date} {row[0]}", format="%d/%m/%Y %H:%M")
+                data_list.append([full_datetime, row[1], row[2], row[3]])
+    return pd.DataFrame(data_list, columns=["date", "prevision_j_1", "prevision_j", "consommation"])
+
+
+def best_of(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        result = func(*args)
+        best = min(best, timer.perf_counter() - start)
+    return best, result
+
+
+def main(days=365):
+    excel_raw = make_raw_blocks(days, excel=True)
+    with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+        make_raw_blocks(days, excel=False).to_csv(f, header=False, index=False)
+        csv_path = f.name
+    csv_raw = pd.read_csv(
+        csv_path, header=None, names=range(4), usecols=range(4),
+        dtype=str, keep_default_na=False, na_values=['']
+    )
+    print(f"{days} jours, {days * 96} lignes horaires")
+
+    t_old, old = best_of(legacy_read_special_excel, excel_raw, repeat=1)
+    t_new, new = best_of(parse_rte_day_blocks, excel_raw)
+    assert np.allclose(old.to_numpy(dtype=float), new.to_numpy()) and old.index.equals(new.index)
+    print(f"Excel    : boucle {t_old:8.3f} s | vectorisé {t_new:8.4f} s | x{t_old / t_new:,.0f}")
+
+    t_old, old = best_of(legacy_front_end_load, csv_raw, repeat=1)
+    t_new, new = best_of(parse_rte_day_blocks, csv_raw)
+    assert np.allclose(old.iloc[:, 1:].to_numpy(dtype=float), new.to_numpy())
+    print(f"CSV      : boucle {t_old:8.3f} s | vectorisé {t_new:8.4f} s | x{t_old / t_new:,.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 365)
@@ -0,0 +1,46 @@
+"""
+Comparaison du coût d'ajustement : SARIMA(1,1,1)(1,1,1,96) contre
+ARIMA(2,1,1) + régresseurs de Fourier (choix '2' et '4' de `train_model`).
+
+Chaque modèle est ajusté dans un processus séparé pour mesurer proprement
+le pic de mémoire (RSS maximal) et le temps d'ajustement.
+
+Usage : python -m benchmarks.bench_seasonality [nombre_de_jours]
+"""
+import contextlib
+import io
+import multiprocessing
+import sys
+import time
+import warnings
+
+from backend.training import evaluate_model, train_model
+from benchmarks.common import STEPS_PER_DAY, make_frame, peak_mb
+
+
+def _fit(choice, days, queue):
+    series = make_frame(days * STEPS_PER_DAY, start='2023-01-01')['Consommation']
+    train, test = series[:-STEPS_PER_DAY], series[-STEPS_PER_DAY:]
+    start = time.perf_counter()
+    with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+        warnings.simplefilter("ignore")
+        model, name, model_type = train_model(choice, train)
+        fit_seconds = time.perf_counter() - start
+        _, mae = evaluate_model(model, test, model_type)
+    queue.put((name, fit_seconds, peak_mb(), mae))
+
+
+def main(days=28):
+    print(f"{days} jours ({days * 96} pas de 15 minutes), horizon 96 pas")
+    print(f"{'modèle':<28}{'ajustement (s)':>16}{'RSS max (Mo)':>14}{'MAE J+1':>10}")
+    queue = multiprocessing.Queue()
+    for choice in ("2", "4"):
+        process = multiprocessing.Process(target=_fit, args=(choice, days, queue))
+        process.start()
+        name, fit_seconds, peak_mb, mae = queue.get()
+        process.join()
+        print(f"{name:<28}{fit_seconds:>16.1f}{peak_mb:>14.0f}{mae:>10.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 28)
@@ -0,0 +1,208 @@
+"""
+Suite de benchmarks de bout en bout sur des données synthétiques.
+
+Pour chaque longueur de série (1 à 10 ans au pas de 15 minutes), mesure le
+temps, le débit et le pic de mémoire (RSS maximal du processus à la fin de
+l'étape) de :
+
+- `load_consumption_data` (sans cache, construction du cache, cache chaud) ;
+- `filter_data` ;
+- chaque choix de `train_model` et `evaluate_model` (sur les `--fit-days`
+  derniers jours pour les modèles statsmodels, qui ne passent pas à
+  l'échelle ; sur tout l'historique pour 'gbm', 'hierarchical' et 'per_slot') ;
+- `make_predictions` (sur les `--predict-days` derniers jours) ;
+- l'endpoint `/predict/` via le TestClient de FastAPI (première requête,
+  puis latence médiane et p95 en JSON et en binaire).
+
+Les résultats sont écrits en JSON ; avec `--baseline`, chaque étape plus lente
+que la référence au-delà de la tolérance est signalée (code de sortie 1).
+
+Usage :
+    python -m benchmarks.bench_suite --years 1 3 --output bench.json
+    python -m benchmarks.bench_suite --years 1 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_suite --years 1 --baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.chargement_donnes import load_consumption_data
+from backend.predictions import make_predictions
+from backend.registry import ModelRegistry
+from backend.serialization import decode_binary
+from backend.training import EXOG_MODELS, MODEL_CHOICES, evaluate_model, filter_data, train_model
+from benchmarks.common import STEPS_PER_DAY, make_frame, peak_mb
+
+# SARIMA/SARIMAX (m=96) : plus de 2 minutes sur 3 jours, auto_arima : bien davantage (--choices pour les inclure)
+DEFAULT_CHOICES = ['fourier', 'gbm', 'hierarchical']
+FULL_HISTORY_CHOICES = ('gbm', 'hierarchical', 'per_slot')  # modèles entraînés sur tout l'historique
+
+
+def write_csv(df, file):
+    """Écrit un fichier `energy_data*.csv` (séparateur `;`, dates jj/mm/aaaa)."""
+    out = df.copy()
+    out.index = out.index.strftime('%d/%m/%Y %H:%M')
+    out.to_csv(file, sep=';', index_label='datetime')
+
+
+class Recorder:
+    """Chronomètre les étapes et accumule les mesures."""
+
+    def __init__(self):
+        self.results = []
+
+    def measure(self, stage, years, items, fn, *args, **kwargs):
+        with warnings.catch_warnings(), contextlib.redirect_stdout(io.StringIO()):
+            warnings.simplefilter("ignore")
+            start = time.perf_counter()
+            value = fn(*args, **kwargs)
+            seconds = time.perf_counter() - start
+        self.add(stage, years, seconds, items)
+        return value
+
+    def add(self, stage, years, seconds, items=None, **extra):
+        result = {"stage": stage, "years": years, "seconds": seconds, "peak_rss_mb": peak_mb()}
+        if items:
+            result["items"] = items
+            result["throughput"] = items / seconds if seconds > 0 else None
+        result.update(extra)
+        self.results.append(result)
+        print(f"{stage:<32}{years:>6}{seconds:>12.3f}{result['peak_rss_mb']:>10.0f}", flush=True)
+
+
+def bench_api(recorder, years, frame, workdir, requests):
+    """Latence de `/predict/` avec des modèles déjà entraînés."""
+    from fastapi.testclient import TestClient
+    import main
+
+    api_file = workdir / "api_data.csv"
+    write_csv(frame, api_file)
+    main.DATA_FILE = str(api_file)
+    main.registry = ModelRegistry(workdir / "api_models")
+    data, _, _ = main.load_series()
+    recorder.measure("make_predictions", years, len(data), make_predictions, data, main.registry)
+
+    with warnings.catch_warnings(), TestClient(main.app) as client:
+        warnings.simplefilter("ignore")
+        for fmt in ("json", "binary"):
+            main.forecast_cache.invalidate()
+            start = time.perf_counter()
+            client.post("/predict/", params={"format": fmt}).raise_for_status()
+            recorder.add(f"api_predict_first[{fmt}]", years, time.perf_counter() - start)
+            latencies = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = client.post("/predict/", params={"format": fmt})
+                latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+            if fmt == "binary":
+                # Le binaire (début, pas, valeurs float32) doit redonner les séries JSON
+                expected = client.post("/predict/").json()["predictions"]
+                decoded = decode_binary(response.content)
+                assert decoded.keys() == expected.keys()
+                for name, (index, values) in decoded.items():
+                    assert len(index) == len(values) == len(expected[name])
+                    np.testing.assert_allclose(values, expected[name], rtol=1e-6)
+            recorder.add(
+                f"api_predict[{fmt}]", years, float(np.median(latencies)),
+                p95=float(np.percentile(latencies, 95)), throughput=requests / sum(latencies), bytes=len(response.content)
+            )
+
+
+def run(years_list, choices, fit_days, predict_days, requests):
+    recorder = Recorder()
+    print(f"{'étape':<32}{'années':>6}{'durée (s)':>12}{'RSS (Mo)':>10}")
+    for years in years_list:
+        frame = make_frame(years * 365 * STEPS_PER_DAY)
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            data_dir = workdir / "data"
+            data_dir.mkdir()
+            # Un fichier par année, comme dans data/
+            for year, chunk in frame.groupby(frame.index.year):
+                write_csv(chunk, data_dir / f"energy_data{year}.csv")
+            rows = len(frame)
+
+            recorder.measure("load_consumption_data[no_cache]", years, rows, load_consumption_data, str(data_dir), False)
+            recorder.measure("load_consumption_data[build]", years, rows, load_consumption_data, str(data_dir))
+            data = recorder.measure("load_consumption_data[cached]", years, rows, load_consumption_data, str(data_dir))
+            filtered = recorder.measure("filter_data", years, rows, filter_data, data, data.index[-1])
+
+            exog_columns = ['PrévisionsJ-1', 'PrévisionsJ']
+            for model_type in choices:
+                window = filtered if model_type in FULL_HISTORY_CHOICES else filtered.iloc[-(fit_days + 1) * STEPS_PER_DAY:]
+                train, test = window.iloc[:-STEPS_PER_DAY], window.iloc[-STEPS_PER_DAY:]
+                model, _, _ = recorder.measure(
+                    f"train_model[{model_type}]", years, len(train), train_model,
+                    MODEL_CHOICES[model_type], train['Consommation'], train[exog_columns]
+                )
+                exog = test[exog_columns] if model_type in EXOG_MODELS else None
+                _, mae = recorder.measure(
+                    f"evaluate_model[{model_type}]", years, len(test), evaluate_model,
+                    model, test['Consommation'], model_type, exog
+                )
+                recorder.results[-1]["mae"] = float(mae)
+
+            bench_api(recorder, years, frame.iloc[-predict_days * STEPS_PER_DAY:], workdir, requests)
+    return recorder.results
+
+
+def compare(results, baseline, tolerance, min_delta=0.005):
+    """Étapes plus lentes que la référence de plus de `tolerance` (fraction) et de `min_delta` secondes."""
+    reference = {(r["stage"], r["years"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = reference.get((result["stage"], result["years"]))
+        if before and result["seconds"] > before * (1 + tolerance) and result["seconds"] - before > min_delta:
+            regressions.append({**result, "baseline_seconds": before, "ratio": result["seconds"] / before})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 3], help="longueurs de série (années)")
+    parser.add_argument("--choices", nargs="+", default=DEFAULT_CHOICES, choices=list(MODEL_CHOICES))
+    parser.add_argument("--fit-days", type=int, default=3, help="jours d'entraînement de train_model")
+    parser.add_argument("--predict-days", type=int, default=7, help="jours de données de make_predictions et /predict/")
+    parser.add_argument("--requests", type=int, default=50, help="requêtes /predict/ par format")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="fichier JSON de référence à comparer")
+    parser.add_argument("--save-baseline", help="enregistrer les résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="ralentissement toléré (0.25 = +25 %%)")
+    parser.add_argument("--min-delta", type=float, default=0.005, help="écart minimal signalé (s), contre le bruit")
+    args = parser.parse_args(argv)
+
+    results = run(args.years, args.choices, args.fit_days, args.predict_days, args.requests)
+    report = {
+        "created": pd.Timestamp.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "save_baseline")},
+        "results": results
+    }
+    for file in filter(None, (args.output, args.save_baseline)):
+        Path(file).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance, args.min_delta)
+        for r in regressions:
+            print(f"RÉGRESSION {r['stage']} ({r['years']} ans) : {r['seconds']:.3f} s "
+                  f"contre {r['baseline_seconds']:.3f} s (x{r['ratio']:.2f})")
+        if regressions:
+            return 1
+        print("Aucune régression par rapport à la référence")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Outils communs des benchmarks : données synthétiques au format RTE et pic de mémoire.
+"""
+import numpy as np
+import pandas as pd
+
+from backend.instrumentation import peak_rss_bytes
+
+STEPS_PER_DAY = 96
+
+
+def make_frame(periods, start='2015-01-01', seed=0):
+    """
+    Données synthétiques au pas de 15 minutes, au format RTE.
+
+    Consommation (cycles jour, semaine et année + marche aléatoire) et prévisions
+    J-1 et J bruitées.
+
+    Args:
+        periods (int): Nombre de pas.
+        start (str): Premier horodatage.
+        seed (int): Graine du générateur.
+
+    Returns:
+        pd.DataFrame: Colonnes PrévisionsJ-1, PrévisionsJ et Consommation, indexées par datetime.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=int(periods), freq='15min', name='datetime')
+    t = np.arange(len(index))
+    consumption = (
+        55000
+        + 8000 * np.sin(2 * np.pi * t / STEPS_PER_DAY)
+        + 3000 * np.sin(2 * np.pi * t / (7 * STEPS_PER_DAY))
+        + 10000 * np.cos(2 * np.pi * t / (365 * STEPS_PER_DAY))
+        + np.cumsum(rng.normal(0, 30, len(t)))
+    )
+    return pd.DataFrame({
+        'PrévisionsJ-1': consumption + rng.normal(0, 1500, len(t)),
+        'PrévisionsJ': consumption + rng.normal(0, 800, len(t)),
+        'Consommation': consumption
+    }, index=index).round(1)
+
+
+def peak_mb():
+    """RSS maximal du processus, en Mo."""
+    return peak_rss_bytes() / 2**20
@@ -1,80 +1,75 @@
-import pandas as pd
-import re
+from functools import lru_cache
+from pathlib import Path
 import dash
 from dash import dcc, html, Input, Output
 import plotly.express as px
+from backend.chargement_donnes import data_version, load_consumption_data, load_rollups
+from backend.downsampling import build_pyramid, downsample_range
 
-# Fonction pour charger et structurer les données
-def load_data(file_path):
-    df = pd.read_csv(file_path, header=None)  # Lecture brute du fichier sans en-tête
-    data_list = []  # Liste pour stocker les données finales
-    current_date = None  # Variable pour suivre la date courante
+DATA_DIR = Path(__file__).parent / "data"
+MAX_POINTS = 2000  # ≈ largeur du graphique en pixels
+COMPACT_DATA = False  # True : valeurs float32 sur grille régulière (moitié de la mémoire)
 
-    for i in range(len(df)):
-        row = df.iloc[i]
+# Variables du menu -> colonnes du cache de backend.chargement_donnes
+VARIABLES = {
+    'consommation': 'Consommation',
+    'prevision_j_1': 'PrévisionsJ-1',
+    'prevision_j': 'PrévisionsJ'
+}
 
-        # Vérifie si la ligne contient la date avec le format "Journée du XX/XX/XXXX"
-        if isinstance(row[0], str) and "Journée du" in row[0]:
-            match = re.search(r"(\d{2}/\d{2}/\d{4})", row[0])
-            if match:
-                current_date = match.group(1)  # Extraire la date au format XX/XX/XXXX
+# Chargement paresseux : rien n'est lu à l'import. Les données viennent du cache
+# binaire partagé (memory-map), donc chaque worker partage les mêmes pages mémoire
+# au lieu de reparser les CSV ; elles sont rechargées quand le cache change.
+def get_data():
+    version = data_version(DATA_DIR)
+    if version == 0:
+        load_consumption_data(str(DATA_DIR))
+        version = data_version(DATA_DIR)
+    return _load_snapshot(version)
 
-        # Vérifie si la ligne contient les données horaires (ex: "0:00", "12:15")
-        elif isinstance(row[0], str) and re.match(r"\d{1,2}:\d{2}", row[0]):  # Format "H:MM" ou "HH:MM"
-            if current_date:
-                try:
-                    full_datetime = pd.to_datetime(f"{current_date} {row[0]}", format="%d/%m/%Y %H:%M")
-                    data_list.append([
-                        full_datetime,
-                        row[1],  # PrévisionJ-1
-                        row[2],  # PrévisionJ
-                        row[3]   # Consommation
-                    ])
-                except Exception as e:
-                    print(f"Erreur de parsing à la ligne {i}: {e}")
-
-    # Création du DataFrame
-    df_clean = pd.DataFrame(data_list, columns=["date", "prevision_j_1", "prevision_j", "consommation"])
-    
-    return df_clean
-
-# Chargement des fichiers Excel
-conso_2023 = load_data("energy_data2023.csv")
-conso_2024 = load_data("energy_data2024.csv")
-conso_2025 = load_data("energy_data2025.csv")
-
-# Concaténation des données
-df = pd.concat([conso_2023, conso_2024, conso_2025])
-df = df.sort_values("date")  # Tri par date
+@lru_cache(maxsize=1)
+def _load_snapshot(version):
+    df = load_consumption_data(str(DATA_DIR), compact=COMPACT_DATA)
+    if COMPACT_DATA:
+        df = df.to_frame()
+    # Pyramide 15 min / horaire / journalière : les niveaux agrégés viennent des
+    # agrégats maintenus avec le cache, les vues larges ne lisent pas les données brutes
+    return df, build_pyramid(df, list(VARIABLES.values()), load_rollups(str(DATA_DIR)))
 
 # Initialisation de l'application Dash
 app = dash.Dash(__name__)
+server = app.server  # Pour gunicorn : gunicorn front_end_07_03_25:server
 
-app.layout = html.Div([
-    html.H1("Visualisation des données de consommation RTE"),
+def serve_layout():
+    # Layout calculé à l'affichage de la page (les données sont chargées à la première visite)
+    df, _ = get_data()
+    return html.Div([
+        html.H1("Visualisation des données de consommation RTE"),
     
-    dcc.DatePickerRange(
-        id='date-picker',
-        min_date_allowed=df['date'].min(),
-        max_date_allowed=df['date'].max(),
-        start_date=df['date'].min(),
-        end_date=df['date'].max()
-    ),
+        dcc.DatePickerRange(
+            id='date-picker',
+            min_date_allowed=df.index[0],
+            max_date_allowed=df.index[-1],
+            start_date=df.index[0],
+            end_date=df.index[-1]
+        ),
     
-    dcc.Graph(id='time-series-graph'),
+        dcc.Graph(id='time-series-graph'),
+
+        # Ajout d'un menu déroulant pour choisir la variable à afficher
+        dcc.Dropdown(
+            id='variable-selector',
+            options=[
+                {'label': 'Consommation', 'value': 'consommation'},
+                {'label': 'Prévision J-1', 'value': 'prevision_j_1'},
+                {'label': 'Prévision J', 'value': 'prevision_j'}
+            ],
+            value='consommation',
+            clearable=False
+        )
+    ])
 
-    # Ajout d'un menu déroulant pour choisir la variable à afficher
-    dcc.Dropdown(
-        id='variable-selector',
-        options=[
-            {'label': 'Consommation', 'value': 'consommation'},
-            {'label': 'Prévision J-1', 'value': 'prevision_j_1'},
-            {'label': 'Prévision J', 'value': 'prevision_j'}
-        ],
-        value='consommation',
-        clearable=False
-    )
-])
+app.layout = serve_layout
 
 @app.callback(
     Output('time-series-graph', 'figure'),
@@ -83,8 +78,16 @@ app.layout = html.Div([
     Input('variable-selector', 'value')
 )
 def update_graph(start_date, end_date, selected_variable):
-    filtered_df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-    fig = px.line(filtered_df, x='date', y=selected_variable, title=f"Évolution de {selected_variable}")
+    return build_figure(start_date, end_date, selected_variable, data_version(DATA_DIR))
+
+# Mémoïsation des dernières figures (plage, variable, version des données)
+@lru_cache(maxsize=64)
+def build_figure(start_date, end_date, selected_variable, version):
+    _, pyramid = get_data()
+    # Série sous-échantillonnée (min/max par pixel), plage découpée par searchsorted
+    dates, values, level = downsample_range(pyramid, VARIABLES[selected_variable], start_date, end_date, MAX_POINTS)
+    fig = px.line(x=dates, y=values, title=f"Évolution de {selected_variable} (pas : {level})")
+    fig.update_layout(xaxis_title='date', yaxis_title=selected_variable)
     return fig
 
 if __name__ == '__main__':
@@ -1,22 +1,331 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import os
+import threading
+import time
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
 import pandas as pd
-from backend.predictions import make_predictions
+from backend.analysis import NLAGS, analyze
+from backend.chargement_donnes import data_version, load_consumption_data
+from backend.forecast_cache import ForecastCache, exog_fingerprint
+from backend.instrumentation import PROFILES_DIR, instrument, profile_request, render_prometheus, stage
+from backend.jobs import DATA_DIR, EXOG_COLUMNS, JobManager, run_baseline, run_training
+from backend.models import kalman_forecast
+from backend.predictions import batch_forecast, forecast_arrays, load_kalman_state, load_models, prune_models, update_kalman
+from backend.registry import ModelRegistry, data_fingerprint
+from backend.serialization import (
+    FORMATS, MEDIA_TYPES, encode_binary, encode_json, forecast_times, iter_ndjson, select, to_series
+)
+from backend.training import EXOG_MODELS, HORIZONS, MODEL_CHOICES, make_future_predictions
 
-app = FastAPI()
+DATA_FILE = "energy_data2023.csv"
+MAX_HORIZON = 4 * HORIZONS["week_ahead"]  # quatre semaines de pas de 15 minutes
+
+registry = ModelRegistry()
+jobs = JobManager(registry=registry)
+forecast_cache = ForecastCache()
+kalman_lock = threading.Lock()
+state_lock = threading.Lock()
+
+class Observations(BaseModel):
+    observations: list[float] = []
+    horizon: int = Field(10, ge=1, le=MAX_HORIZON)
+
+class ForecastQuery(BaseModel):
+    # "AR", "SARIMAX", "Kalman" (modèles de /predict/) ou un type entraîné via /train
+    model: str
+    horizon: int | str = "day_ahead"  # nombre de pas (1 à MAX_HORIZON), "day_ahead" (96) ou "week_ahead" (672)
+    # Date limite du modèle entraîné (par défaut, le plus récent) ; refusée pour les
+    # modèles de /predict/, toujours ajustés sur toute la série (erreur 400)
+    cutoff: str | None = None
+
+class BatchRequest(BaseModel):
+    queries: list[ForecastQuery]
+
+class TrainRequest(BaseModel):
+    model_type: str = "fourier"
+    cutoff_date: str = "2025-02-24 10:15:00"
+    horizon: int = Field(96, ge=1, le=MAX_HORIZON)
+
+    @field_validator("cutoff_date")
+    @classmethod
+    def check_cutoff_date(cls, value):
+        # Date invalide refusée (422) avant de soumettre la tâche au pool
+        try:
+            valid = not pd.isna(pd.Timestamp(value))
+        except ValueError:
+            valid = False
+        if not valid:
+            raise ValueError(f"Date limite invalide : {value}")
+        return value
+
+def load_series():
+    # Charger les données
+    df = pd.read_csv(DATA_FILE, sep=';')
+
+    # Sélectionner les données de consommation
+    consommation = df.iloc[:, 3].dropna()  # Colonne "Consommation"
+    last_observation = str(df.iloc[consommation.index[-1], 0])
+    # Horodatages (int64, ns) des observations, pour les réponses fenêtrées
+    times = pd.to_datetime(df.iloc[consommation.index, 0], format='%d/%m/%Y %H:%M')
+    return consommation.tolist(), last_observation, times.to_numpy(dtype='datetime64[ns]').view('int64')
+
+def current_data_version():
+    # Change dès que le fichier de l'API ou le cache des données est modifié
+    return os.stat(DATA_FILE).st_mtime_ns, data_version(DATA_DIR)
+
+def load_state(state):
+    # Série, modèles et état de Kalman de la version courante des données ;
+    # les modèles absents du registre sont entraînés en tâche de fond
+    version = current_data_version()
+    data, last_observation, times = load_series()
+    # Modèles des versions précédentes des données : supprimés plutôt que chargés
+    prune_models(data, registry)
+    models = load_models(data, registry)
+    if models is None:
+        jobs.submit("baseline", run_baseline, data, registry.save_dir)
+    kalman_key, kalman_state = load_kalman_state(data, registry)
+    exog = load_consumption_data(str(DATA_DIR))[EXOG_COLUMNS]
+    with kalman_lock:
+        state.data, state.last_observation, state.times = data, last_observation, times
+        # Prévisions RTE de la même version des données, et exogènes futures déjà extraites
+        state.exog, state.future_exog = exog, {}
+        state.data_id = data_fingerprint(data)
+        state.models = models
+        state.kalman_key, state.kalman_state = kalman_key, kalman_state
+    forecast_cache.check_version(version)
+
+def refresh_state():
+    # Nouvelles données (fichier de l'API ou cache ingéré) : état rechargé avant de prévoir
+    if forecast_cache.check_version(current_data_version()):
+        with state_lock:
+            load_state(app.state)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Les modèles déjà entraînés sont chargés à la demande ; les autres sont entraînés en tâche de fond
+    jobs.start()
+    load_state(app.state)
+    yield
+    jobs.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.middleware("http")
+async def profile_header(request: Request, call_next):
+    # En-tête « X-Profile: 1 » : la requête est profilée avec cProfile (fichier .prof dans profiles/)
+    if request.headers.get("x-profile") != "1":
+        return await call_next(request)
+    file = PROFILES_DIR / f"request_{time.strftime('%Y%m%d_%H%M%S')}_{time.monotonic_ns()}.prof"
+    with profile_request(file):
+        response = await call_next(request)
+    if file.exists():  # aucun fichier si la requête n'a exécuté aucune étape instrumentée
+        response.headers["X-Profile-File"] = str(file)
+    return response
+
+def current_models():
+    # Modèles issus du dernier entraînement terminé (jamais d'ajustement ici)
+    if app.state.models is None and jobs.latest("baseline") is not None:
+        app.state.models = load_models(app.state.data, registry)
+    return app.state.models
 
 @app.get("/")
 def home():
     return {"message": "API de prévision de consommation"}
 
 @app.post("/predict/")
-def predict():
-    # Charger les données
-    df = pd.read_csv("energy_data2023.csv")
+@instrument("api_predict")
+def predict(format: str = "json", start: str | None = None, end: str | None = None, step: int = 1):
+    # format : json (par défaut), ndjson (par blocs, en flux) ou binary (float32) ;
+    # start/end restreignent les séries à une fenêtre, step garde un point sur `step`
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format inconnu : {format}")
+    if step < 1:
+        raise HTTPException(status_code=400, detail="step doit être >= 1")
+    # Une seule prévision par intervalle de données, quel que soit le nombre d'appels
+    refresh_state()
+    models = current_models()
+    if models is None:
+        raise HTTPException(status_code=503, detail="Modèles en cours d'entraînement, réessayer plus tard")
+    latest = jobs.latest("train")
+    steps = 10
+    exog = exog_id = None
+    if latest is not None and latest["result"]["model_type"] in EXOG_MODELS:
+        # Le dernier modèle entraîné est reprévu avec les prévisions RTE courantes
+        result = latest["result"]
+        exog, exog_id = future_exog(pd.Timestamp(result["forecast"]["index"][0]) - STEP, len(result["forecast"]["values"]))
 
-    # Sélectionner les données de consommation
-    data = df.iloc[:, 3].dropna().tolist()  # Colonne "Consommation"
+    def compute():
+        # Faire les prédictions à partir des modèles déjà entraînés
+        times = app.state.times
+        future = forecast_times(times[-1], steps)
+        series = {}
+        for name, values in forecast_arrays(models, steps).items():
+            # Le filtre de Kalman couvre l'historique, les autres modèles l'horizon
+            series[name] = to_series(values, times if name == "Kalman" else future)
+        if latest is not None:
+            result = latest["result"]
+            index = pd.to_datetime(result["forecast"]["index"]).values.astype('datetime64[ns]').view('int64')
+            values = result["forecast"]["values"]
+            if exog is not None:
+                fitted = registry.get(result["model_type"], result["registry_key"])
+                values = make_future_predictions(fitted, result["model_type"], len(values), exog)
+            series[result["model_name"]] = to_series(values, index)
+        return series
+
+    model_id = (app.state.data_id, latest["job_id"] if latest else None)
+    key = (model_id, app.state.last_observation, steps, exog_id)
+    series = forecast_cache.get_or_compute(key, compute)
+
+    try:
+        series = select(series, start, end, step)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates start/end invalides")
+    if format == "ndjson":
+        return StreamingResponse(iter_ndjson(series), media_type=MEDIA_TYPES[format])
+    if format == "binary":
+        return Response(encode_binary(series), media_type=MEDIA_TYPES[format])
+    # Réponse JSON construite directement (sans passer par jsonable_encoder)
+    with stage("encode_json", rows=sum(len(values) for _, values in series.values())):
+        return JSONResponse({"predictions": encode_json(series)})
+
+BASELINE_MODELS = ("AR", "SARIMAX", "Kalman")
+STEP = pd.Timedelta("15min")
+
+def future_exog(last_time, steps):
+    """
+    Prévisions RTE disponibles après `last_time` et leur empreinte.
+
+    Elles sont extraites des données chargées par `load_state` (rechargées avec
+    elles à chaque nouvelle version) et mémorisées jusqu'au rechargement suivant.
+    """
+    memo = app.state.future_exog
+    if (last_time, steps) not in memo:
+        exog = app.state.exog.loc[last_time:].iloc[1:steps + 1].ffill().bfill()
+        memo[(last_time, steps)] = exog, exog_fingerprint(exog)
+    return memo[(last_time, steps)]
+
+def resolve_forecaster(model, cutoff):
+    """
+    Retourne (identifiant, fonction `steps -> prévisions`, dernier horodatage connu) d'un modèle déjà entraîné.
+
+    Les modèles de `/predict/` (AR, SARIMAX, Kalman) n'ont pas de date limite :
+    une requête qui en précise une est refusée (400) plutôt que servie sans elle.
+    """
+    if model in BASELINE_MODELS:
+        if cutoff is not None:
+            raise HTTPException(status_code=400, detail=f"Le modèle {model} n'accepte pas de date limite (cutoff)")
+        models = current_models()
+        if models is None:
+            raise HTTPException(status_code=503, detail="Modèles en cours d'entraînement, réessayer plus tard")
+        last_time = app.state.times[-1]
+        forecasters = {
+            "AR": lambda steps: models["AR"].predict(steps),
+            "SARIMAX": lambda steps: models["SARIMAX"].forecast(steps),
+            "Kalman": lambda steps: kalman_forecast(app.state.kalman_state, steps)["mean"]
+        }
+        return (model, app.state.data_id), forecasters[model], last_time
+    if model not in MODEL_CHOICES:
+        raise HTTPException(status_code=400, detail=f"Modèle inconnu : {model}")
+    try:
+        cutoff_date = pd.Timestamp(cutoff) if cutoff is not None else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Date limite invalide : {cutoff}")
+    for job in jobs.completed("train"):
+        result = job["result"]
+        if result["model_type"] == model and (cutoff is None or pd.Timestamp(result["cutoff_date"]) == cutoff_date):
+            break
+    else:
+        raise HTTPException(status_code=404, detail=f"Aucun modèle {model} entraîné (cutoff={cutoff})")
+    key = (model, result["registry_key"])
+    fitted = registry.get(*key)
+    last_time = pd.Timestamp(result["forecast"]["index"][0]) - STEP
+    if model not in EXOG_MODELS:
+        return key, (lambda steps: make_future_predictions(fitted, model, steps)), last_time
+
+    return key, (lambda steps: make_future_predictions(fitted, model, steps, future_exog(last_time, steps)[0])), last_time
+
+@app.post("/predict/batch")
+@instrument("api_predict_batch", counts=lambda result, body: {"rows": len(body.queries)})
+def predict_batch(body: BatchRequest):
+    # Une seule prévision par modèle (horizon maximal), découpée pour chaque requête
+    refresh_state()
+    queries, resolved, forecasters, origins = [], {}, {}, {}
+    for query in body.queries:
+        horizon = HORIZONS.get(query.horizon, query.horizon)
+        if not isinstance(horizon, int) or not 1 <= horizon <= MAX_HORIZON:
+            raise HTTPException(status_code=400, detail=f"Horizon invalide : {query.horizon} (1 à {MAX_HORIZON} pas)")
+        if (query.model, query.cutoff) not in resolved:
+            key, forecaster, origin = resolve_forecaster(query.model, query.cutoff)
+            resolved[(query.model, query.cutoff)] = key
+            forecasters[key], origins[key] = forecaster, origin
+        queries.append((resolved[(query.model, query.cutoff)], horizon))
+    try:
+        results = batch_forecast(queries, forecasters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    forecasts = []
+    for query, (key, horizon), values in zip(body.queries, queries, results):
+        index = pd.DatetimeIndex(forecast_times(origins[key], horizon))
+        forecasts.append({
+            "model": query.model,
+            "horizon": horizon,
+            "cutoff": query.cutoff,
+            "index": index.strftime('%Y-%m-%d %H:%M').tolist(),
+            "values": values.tolist()
+        })
+    return JSONResponse({"forecasts": forecasts})
+
+@app.get("/analysis")
+@instrument("api_analysis")
+def analysis(columns: str = "Consommation", by_year: bool = True, nlags: int = NLAGS):
+    # ADF (d=0..2, différences saisonnières 96/672), ACF et PACF
+    data = load_consumption_data(str(DATA_DIR))
+    selected = [column.strip() for column in columns.split(",")]
+    unknown = [column for column in selected if column not in data.columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Colonnes inconnues : {', '.join(unknown)}")
+    if not 1 <= nlags <= 5000:
+        raise HTTPException(status_code=400, detail="nlags doit être compris entre 1 et 5000")
+    # Calcul dans le processus de l'API : pas de pool créé par requête (les cœurs
+    # restent aux entraînements de `jobs`) ; les résultats sont en cache par série
+    return JSONResponse({"series": analyze(data, tuple(selected), by_year, nlags, max_workers=1)})
+
+@app.get("/metrics")
+def metrics():
+    # Durées, compteurs et mémoire des étapes instrumentées, au format Prometheus
+    return Response(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/cache/stats")
+def cache_stats():
+    return forecast_cache.stats()
+
+@app.post("/train")
+@instrument("api_train")
+def train(body: TrainRequest):
+    if body.model_type not in MODEL_CHOICES:
+        raise HTTPException(status_code=400, detail=f"Type de modèle inconnu : {body.model_type}")
+    job_id = jobs.submit(
+        "train", run_training, body.model_type, body.cutoff_date, body.horizon, DATA_DIR, registry.save_dir,
+        params=body.model_dump()
+    )
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    status = jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Tâche inconnue")
+    return status
 
-    # Faire les prédictions
-    predictions = make_predictions(data)
-    
-    return {"predictions": predictions}
+@app.post("/kalman/update")
+@instrument("api_kalman_update", counts=lambda result, body: {"rows": len(body.observations)})
+def kalman_update(body: Observations):
+    # Seules les nouvelles observations sont filtrées : coût constant par appel
+    with kalman_lock:
+        state, result = update_kalman(app.state.kalman_state, body.observations, body.horizon)
+        if body.observations:
+            registry.put("kalman_online", app.state.kalman_key, state)
+        app.state.kalman_state = state
+    return result
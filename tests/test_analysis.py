@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from statsmodels.tsa.stattools import acf as sm_acf
+from statsmodels.tsa.stattools import adfuller
+from statsmodels.tsa.stattools import pacf as sm_pacf
+
+from backend.analysis import acf, adf_test, pacf
+
+
+def series(kind, n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(size=n)
+    if kind == "random_walk":
+        return np.cumsum(noise)
+    values = np.zeros(n)
+    for t in range(2, n):
+        values[t] = 0.6 * values[t - 1] - 0.2 * values[t - 2] + noise[t]
+    return values + 5 * np.sin(2 * np.pi * np.arange(n) / 96)
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")  # forme du résultat d'adfuller
+@pytest.mark.parametrize("kind", ["random_walk", "ar2"])
+@pytest.mark.parametrize("maxlag", [None, 5])
+def test_adf_matches_statsmodels(kind, maxlag):
+    x = series(kind)
+    result = adf_test(x, maxlag)
+    statistic, pvalue, usedlag, nobs, critical, _ = adfuller(x, maxlag, autolag='AIC')
+    assert result["usedlag"] == usedlag
+    assert result["nobs"] == nobs
+    assert result["statistic"] == pytest.approx(statistic, rel=1e-8)
+    assert result["pvalue"] == pytest.approx(pvalue, rel=1e-6)
+    assert result["critical_values"] == pytest.approx(critical)
+    assert result["stationary"] == (kind == "ar2")
+
+
+def test_acf_and_pacf_match_statsmodels():
+    x = series("ar2")
+    autocorrelation = acf(x, 200)
+    np.testing.assert_allclose(autocorrelation, sm_acf(x, nlags=200, fft=True), atol=1e-10)
+    np.testing.assert_allclose(pacf(autocorrelation), sm_pacf(x, nlags=200, method='ldb'), atol=1e-8)
+
+
+def test_acf_is_truncated_to_series_length():
+    assert len(acf(np.arange(10.0), 50)) == 10
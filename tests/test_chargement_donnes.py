@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.chargement_donnes import (
+    CACHE_DIRNAME, ROLLUP_LEVELS, ROLLUP_STATS, compute_rollup, data_version, ingest_file,
+    load_consumption_data, load_rollup, read_cache
+)
+from backend.training import filter_data
+from benchmarks.common import make_frame
+
+
+def write_year(path, df, name):
+    df.to_csv(path / name, sep=';', date_format='%d/%m/%Y %H:%M', index_label='datetime')
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    df = make_frame(96 * 30, start='2023-01-01')
+    df.iloc[100:104, 2] = np.nan
+    write_year(tmp_path, df.iloc[:96 * 20], 'energy_data2023.csv')
+    write_year(tmp_path, df.iloc[96 * 20:], 'energy_data2024.csv')
+    return tmp_path
+
+
+def test_cached_load_matches_csv(data_dir):
+    expected = load_consumption_data(str(data_dir), use_cache=False)
+    assert len(expected) == 96 * 30
+    first = load_consumption_data(str(data_dir))  # construit le cache
+    version = data_version(str(data_dir))
+    cached = load_consumption_data(str(data_dir))  # lu depuis les memory-maps
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(cached, expected, check_freq=False)
+    assert data_version(str(data_dir)) == version
+
+
+def test_modified_file_rebuilds_cache(data_dir):
+    load_consumption_data(str(data_dir))
+    df = load_consumption_data(str(data_dir), use_cache=False)
+    # Dernier fichier raccourci : ses lignes supprimées ne doivent pas survivre dans le cache
+    write_year(data_dir, df.iloc[96 * 20:96 * 25], 'energy_data2024.csv')
+    reloaded = load_consumption_data(str(data_dir))
+    pd.testing.assert_frame_equal(reloaded, load_consumption_data(str(data_dir), use_cache=False), check_freq=False)
+    assert len(read_cache(data_dir / CACHE_DIRNAME)[0]) == 96 * 25
+
+
+
+def test_new_file_is_ingested_incrementally(data_dir):
+    load_consumption_data(str(data_dir))
+    extra = make_frame(96 * 5, start='2023-01-31')
+    write_year(data_dir, extra, 'energy_data2025.csv')
+    index_file = data_dir / CACHE_DIRNAME / 'index.i8'
+    inode = index_file.stat().st_ino
+    incremental = load_consumption_data(str(data_dir))
+    assert index_file.stat().st_ino == inode  # ajout en fin de fichier, pas de réécriture
+    pd.testing.assert_frame_equal(incremental, load_consumption_data(str(data_dir), use_cache=False), check_freq=False)
+
+
+def test_ingest_file_updates_and_inserts(data_dir, tmp_path_factory):
+    expected = load_consumption_data(str(data_dir), use_cache=False)
+    load_consumption_data(str(data_dir))
+    external = tmp_path_factory.mktemp('external')
+
+    # Horodatages existants : les valeurs connues sont remplacées, les NaN ne les effacent pas
+    update = expected.iloc[50:150].copy()
+    update['Consommation'] += 1.0
+    update.iloc[:10, 0] = np.nan
+    write_year(external, update, 'update.csv')
+    assert ingest_file(str(external / 'update.csv'), str(data_dir)) == 0
+    expected.loc[update.index, 'Consommation'] = update['Consommation']
+    pd.testing.assert_frame_equal(read_cache(data_dir / CACHE_DIRNAME)[0], expected, check_freq=False)
+
+    # Horodatage absent au milieu de l'historique : réécriture complète
+    inserted = pd.DataFrame([[1.0, 2.0, 3.0]], columns=expected.columns,
+                            index=pd.DatetimeIndex([expected.index[10] + pd.Timedelta('5min')], name='datetime'))
+    write_year(external, inserted, 'insert.csv')
+    assert ingest_file(str(external / 'insert.csv'), str(data_dir)) == 1
+    expected = pd.concat([expected, inserted]).sort_index()
+    pd.testing.assert_frame_equal(read_cache(data_dir / CACHE_DIRNAME)[0], expected, check_freq=False)
+    # Le fichier externe est relu lors d'une reconstruction
+    assert str(external / 'insert.csv') in read_cache(data_dir / CACHE_DIRNAME)[1]['ingested']
+
+
+@pytest.mark.parametrize("level", list(ROLLUP_LEVELS))
+def test_incremental_rollups_match_full_recompute(data_dir, level):
+    load_consumption_data(str(data_dir))
+    load_rollup(str(data_dir), level)
+    extra = make_frame(96 * 10, start='2023-01-28 06:00', seed=3)  # chevauche la fin de l'historique
+    extra.iloc[5:20, 1] = np.nan
+    write_year(data_dir, extra, 'energy_data2025.csv')
+    full = load_consumption_data(str(data_dir))
+    incremental = load_rollup(str(data_dir), level)
+
+    index = full.index.values.astype('datetime64[ns]').view(np.int64)
+    buckets, stats = compute_rollup(index, full.to_numpy(dtype=np.float64), level)
+    np.testing.assert_array_equal(incremental.index.values.view(np.int64), buckets)
+    for i, name in enumerate(ROLLUP_STATS):
+        np.testing.assert_allclose(incremental[name].to_numpy(), stats[:, i], rtol=1e-12)
+    # Référence indépendante : groupby pandas sur les moyennes
+    width, offset = (pd.Timedelta(seconds=x) for x in ROLLUP_LEVELS[level])
+    means = full.groupby((full.index - offset).floor(width) + offset).mean()
+    np.testing.assert_allclose(incremental['mean'].to_numpy(), means.to_numpy(), rtol=1e-12)
+
+
+def test_compact_load(data_dir):
+    compact = load_consumption_data(str(data_dir), compact=True)
+    expected = load_consumption_data(str(data_dir), use_cache=False)
+    np.testing.assert_array_equal(compact.to_frame().to_numpy(), expected.to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(compact.is_missing('Consommation'), expected['Consommation'].isna().to_numpy())
+    part = compact.slice('2023-01-02 10:07', '2023-01-03').to_frame()
+    pd.testing.assert_frame_equal(part, expected.loc['2023-01-02 10:07':'2023-01-03 00:00'].astype(np.float32), check_freq=False)
+
+
+def test_filter_data_keeps_untouched_columns_shared(data_dir):
+    df = load_consumption_data(str(data_dir), use_cache=False)
+    filtered = filter_data(df, '2023-01-25 00:00:00')
+    assert not filtered.isna().any().any()
+    assert list(filtered.attrs['gaps']['colonne']) == ['Consommation']
+    assert np.shares_memory(filtered['PrévisionsJ'].to_numpy(), df['PrévisionsJ'].to_numpy())
+    assert df['Consommation'].isna().sum() == 4  # l'entrée n'est pas modifiée
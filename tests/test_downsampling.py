@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.downsampling import build_pyramid, downsample_range, lttb, minmax_downsample, range_bounds
+
+
+def lttb_reference(x, y, threshold):
+    # Algorithme de référence de Steinarsson, point par point
+    every = (len(x) - 2) / (threshold - 2)
+    a, selected = 0, [0]
+    for i in range(threshold - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, len(x))
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [len(x) - 1]
+
+
+@pytest.fixture
+def frame():
+    index = pd.date_range('2024-01-01', periods=96 * 60, freq='15min')
+    rng = np.random.default_rng(0)
+    values = 50000 + 8000 * np.sin(2 * np.pi * np.arange(len(index)) / 96) + rng.normal(0, 500, len(index))
+    return pd.DataFrame({"Consommation": values}, index=index)
+
+
+@pytest.mark.parametrize("n_out", [3, 50, 777])
+def test_lttb_matches_reference(frame, n_out):
+    time = frame.index.values.astype('datetime64[ns]').view(np.int64)[:3001]
+    values = frame["Consommation"].to_numpy()[:3001]
+    sampled_time, sampled = lttb(time, values, n_out)
+    expected = lttb_reference((time - time[0]).astype(float).tolist(), values.tolist(), n_out)
+    np.testing.assert_array_equal(sampled_time, time[expected])
+    np.testing.assert_array_equal(sampled, values[expected])
+
+
+def test_minmax_keeps_extremes_in_order(frame):
+    time = frame.index.values.astype('datetime64[ns]').view(np.int64)
+    values = frame["Consommation"].to_numpy()
+    sampled_time, sampled = minmax_downsample(time, values, values, 100)
+    assert len(sampled) == 200
+    assert np.all(np.diff(sampled_time) >= 0)
+    assert sampled.min() == values.min() and sampled.max() == values.max()
+    buckets = np.split(values, np.linspace(0, len(values), 101).astype(np.int64)[1:-1])
+    np.testing.assert_array_equal(sampled.reshape(100, 2).min(axis=1), [b.min() for b in buckets])
+    np.testing.assert_array_equal(sampled.reshape(100, 2).max(axis=1), [b.max() for b in buckets])
+
+
+def test_range_bounds_match_mask(frame):
+    time = frame.index.values.astype('datetime64[ns]').view(np.int64)
+    for start, end in [('2024-01-03 10:07', '2024-01-20'), (None, '2024-01-02'), ('2024-02-25', None), (None, None)]:
+        mask = np.ones(len(time), dtype=bool)
+        if start is not None:
+            mask &= frame.index >= start
+        if end is not None:
+            mask &= frame.index <= end
+        lo, hi = range_bounds(time, start, end)
+        np.testing.assert_array_equal(np.flatnonzero(mask), np.arange(lo, hi))
+
+
+def test_downsample_range_picks_coarsest_needed_level(frame):
+    pyramid = build_pyramid(frame)
+    _, values, level = downsample_range(pyramid, "Consommation", '2024-01-01', '2024-01-02', max_points=500)
+    assert level == "15min" and len(values) == 97
+    _, values, level = downsample_range(pyramid, "Consommation", max_points=400)
+    assert level == "1h" and len(values) == 400
+    _, values, level = downsample_range(pyramid, "Consommation", max_points=20)
+    assert level == "1D" and len(values) == 20
+    assert values.max() == frame["Consommation"].max()
@@ -0,0 +1,98 @@
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+from backend import forecast_cache
+from backend.forecast_cache import ForecastCache, exog_fingerprint
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(forecast_cache, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_lru_eviction():
+    cache = ForecastCache(maxsize=2)
+    for key in ("a", "b", "a", "c"):
+        cache.get_or_compute(key, lambda: key.upper())
+    assert cache.get_or_compute("a", lambda: pytest.fail("a est en cache")) == "A"
+    assert cache.get_or_compute("b", lambda: "B2") == "B2"  # évincée avant "a"
+    assert cache.stats()["evictions"] == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ForecastCache(ttl=900)
+    assert cache.get_or_compute("k", lambda: 1) == 1
+    clock[0] = 900.0
+    assert cache.get_or_compute("k", lambda: 2) == 1
+    clock[0] = 901.0
+    assert cache.get_or_compute("k", lambda: 3) == 3
+
+
+def test_version_change_clears_cache():
+    cache = ForecastCache()
+    assert cache.check_version(1) is False  # premier chargement
+    cache.get_or_compute("k", lambda: 1)
+    assert cache.check_version(1) is False
+    assert cache.get_or_compute("k", lambda: 2) == 1
+    assert cache.check_version(2) is True
+    assert cache.get_or_compute("k", lambda: 3) == 3
+
+
+def test_result_computed_before_invalidation_is_not_cached():
+    cache = ForecastCache()
+
+    def compute():
+        cache.invalidate()
+        return "périmé"
+
+    assert cache.get_or_compute("k", compute) == "périmé"
+    assert cache.get_or_compute("k", lambda: "frais") == "frais"
+
+
+def test_concurrent_misses_are_coalesced():
+    cache = ForecastCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "valeur"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+    first.start()
+    started.wait(5)
+    others = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(3)]
+    for thread in others:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in [first] + others:
+        thread.join(5)
+    assert results == ["valeur"] * 4 and len(calls) == 1
+
+
+def test_failure_is_propagated_and_not_cached():
+    cache = ForecastCache()
+    with pytest.raises(ZeroDivisionError):
+        cache.get_or_compute("k", lambda: 1 / 0)
+    assert cache.get_or_compute("k", lambda: 1) == 1
+
+
+def test_exog_fingerprint():
+    exog = np.arange(12.0).reshape(4, 3)
+    assert exog_fingerprint(None) is None
+    assert exog_fingerprint(exog) == exog_fingerprint(exog.tolist()) == exog_fingerprint(np.asfortranarray(exog))
+    exog[3, 2] += 1e-9
+    assert exog_fingerprint(exog) != exog_fingerprint(np.arange(12.0).reshape(4, 3))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from backend.hierarchy import reconciliation_matrix, summing_matrix
+
+
+def coherent_forecasts(rng):
+    return summing_matrix() @ (50000 + rng.normal(0, 2000, 96))
+
+
+def test_summing_matrix_levels():
+    S = summing_matrix()
+    assert S.shape == (121, 96)
+    np.testing.assert_array_equal(S.sum(axis=1), [96] + [4] * 24 + [1] * 96)
+    np.testing.assert_array_equal(S.sum(axis=0), np.full(96, 3))
+
+
+@pytest.mark.parametrize("method", ["bottom_up", "ols", "wls"])
+def test_projection_keeps_coherent_forecasts(method):
+    rng = np.random.default_rng(0)
+    variances = [4.0, 1.0, 0.25] if method == 'wls' else None
+    P = reconciliation_matrix(method, variances)
+    np.testing.assert_allclose(P @ summing_matrix(), np.eye(96), atol=1e-10)
+    base = coherent_forecasts(rng)
+    np.testing.assert_allclose(P @ base, base[-96:], rtol=1e-10)
+
+
+def test_ols_is_orthogonal_projection():
+    # Les prévisions réconciliées minimisent l'écart euclidien aux prévisions de base
+    rng = np.random.default_rng(1)
+    S = summing_matrix()
+    base = coherent_forecasts(rng) + rng.normal(0, 500, 121)
+    reconciled = S @ reconciliation_matrix('ols') @ base
+    expected = S @ np.linalg.lstsq(S, base, rcond=None)[0]
+    np.testing.assert_allclose(reconciled, expected, rtol=1e-10)
+
+
+def test_wls_per_day_variances():
+    variances = np.array([[4.0, 1.0, 0.25], [1.0, 1.0, 1.0]])
+    P = reconciliation_matrix('wls', variances)
+    assert P.shape == (2, 96, 121)
+    np.testing.assert_allclose(P[1], reconciliation_matrix('ols'), atol=1e-12)
+    np.testing.assert_allclose(P[0], reconciliation_matrix('wls', variances[0]), atol=1e-12)
+
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        reconciliation_matrix('wls')
+    with pytest.raises(ValueError):
+        reconciliation_matrix('mint')
@@ -0,0 +1,54 @@
+import tracemalloc
+
+import pytest
+
+from backend.instrumentation import collect, instrument, merge, peak_rss_bytes, rows, snapshot, stage
+
+MB = 2**20
+
+
+@pytest.fixture
+def tracing():
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+
+def test_nested_stage_keeps_parent_peak(tracing):
+    with collect() as events:
+        with stage("test_outer"):
+            buffer = bytearray(40 * MB)
+            del buffer
+            with stage("test_inner"):
+                buffer = bytearray(10 * MB)
+                del buffer
+                with stage("test_deep"):
+                    buffer = bytearray(20 * MB)
+                    del buffer
+            with stage("test_after"):
+                pass
+    peaks = {event["stage"]: event["peak_memory_bytes"] for event in events}
+    assert 40 * MB <= peaks["test_outer"] < 41 * MB
+    assert 20 * MB <= peaks["test_inner"] < 21 * MB
+    assert 20 * MB <= peaks["test_deep"] < 21 * MB
+    assert peaks["test_after"] < MB
+
+
+def test_counts_and_merge():
+    @instrument(counts=rows)
+    def make(n):
+        return list(range(n))
+
+    with collect() as events:
+        make(3)
+        with stage("test_counts", files=2) as counts:
+            counts["rows"] = 5
+    assert [event["stage"] for event in events] == ["make", "test_counts"]
+    assert events[1]["files"] == 2 and events[1]["rows"] == 5
+    assert events[1]["peak_rss_bytes"] <= peak_rss_bytes()
+
+    before = snapshot()["test_counts"]
+    merge(events[1:])  # événements d'un processus du pool
+    after = snapshot()["test_counts"]
+    assert after["count"] == before["count"] + 1
+    assert after["counts"]["rows"] == before["counts"]["rows"] + 5
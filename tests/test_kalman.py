@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from filterpy.kalman import KalmanFilter
+
+from backend.kalman import kalman_filter_array, kalman_filter_frame, steady_state_gain
+
+Q, R, P0 = 1.0, 100.0, 1.0
+
+
+def filterpy_loop(z, x0):
+    kf = KalmanFilter(dim_x=1, dim_z=1)
+    kf.x = np.array([[x0]])
+    kf.F = np.array([[1.]])
+    kf.H = np.array([[1.]])
+    kf.P *= P0
+    kf.Q *= Q
+    kf.R *= R
+    out = []
+    for value in z:
+        kf.predict()
+        kf.update(None if np.isnan(value) else [[value]])
+        out.append(kf.x[0, 0])
+    return np.asarray(out), kf.x[0, 0], kf.P[0, 0]
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 50000 + np.cumsum(rng.normal(0, 30, n)) + rng.normal(0, 10, n)
+
+
+def test_matches_filterpy():
+    z = random_walk(3000)
+    filtered, x, P = kalman_filter_array(z, Q, R, P0=P0)
+    expected, x_ref, P_ref = filterpy_loop(z, z[0])
+    np.testing.assert_allclose(filtered, expected, rtol=1e-9)
+    np.testing.assert_allclose([x, P], [x_ref, P_ref], rtol=1e-9)
+
+
+def test_missing_values_only_predict():
+    z = random_walk(500)
+    z[100:130] = np.nan
+    z[400] = np.nan
+    filtered, x, P = kalman_filter_array(z, Q, R, P0=P0)
+    expected, x_ref, P_ref = filterpy_loop(z, z[0])
+    np.testing.assert_allclose(filtered, expected, rtol=1e-9)
+    np.testing.assert_allclose([x, P], [x_ref, P_ref], rtol=1e-9)
+
+
+def test_steady_state_gain_is_fixed_point():
+    K, P_prior = steady_state_gain(Q, R)
+    assert np.isclose(P_prior, (1 - K) * P_prior + Q)
+    assert np.isclose(K, P_prior / (P_prior + R))
+
+
+def test_columns_are_filtered_independently():
+    z = np.column_stack([random_walk(800, seed) for seed in range(3)])
+    filtered, x, P = kalman_filter_array(z, Q, R, P0=P0)
+    for j in range(3):
+        column, x_j, P_j = kalman_filter_array(z[:, j], Q, R, P0=P0)
+        np.testing.assert_array_equal(filtered[:, j], column)
+        assert (x[j], P[j]) == (x_j, P_j)
+
+    df = pd.DataFrame(z, columns=['Consommation', 'PrévisionsJ-1', 'PrévisionsJ'])
+    np.testing.assert_array_equal(kalman_filter_frame(df, Q, R).to_numpy(), filtered)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from backend.models import KALMAN_PARAMS, kalman_forecast, kalman_update, run_kalman_filter
+from backend.predictions import update_kalman
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(1)
+    return (50000 + np.cumsum(rng.normal(0, 30, 2000))).tolist()
+
+
+def test_online_update_matches_full_run(data):
+    state = run_kalman_filter(data[:1500])["state"]
+    for start in range(1500, 2000, 100):
+        state = kalman_update(state, data[start:start + 100])
+    full = run_kalman_filter(data)["state"]
+    assert state["n_obs"] == full["n_obs"] == 2000
+    assert state["x"] == pytest.approx(full["x"], rel=1e-12)
+    assert state["P"] == pytest.approx(full["P"], rel=1e-12)
+
+
+def test_update_without_observations_keeps_state(data):
+    state = run_kalman_filter(data)["state"]
+    assert kalman_update(state, []) is state
+
+
+def test_forecast_variance_grows_with_horizon(data):
+    state, response = update_kalman(run_kalman_filter(data[:-5])["state"], data[-5:], steps=4)
+    assert response["forecast"]["mean"] == [state["x"]] * 4
+    variance = np.array(response["forecast"]["variance"])
+    np.testing.assert_allclose(np.diff(variance), KALMAN_PARAMS["Q"])
+    assert kalman_forecast(state, 4) == response["forecast"]
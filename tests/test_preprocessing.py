@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.preprocessing import fill_gaps, gap_runs, to_regular_grid
+
+
+def gap_runs_reference(df):
+    # Parcours naïf, colonne par colonne
+    rows = []
+    for col in df.columns:
+        start = None
+        for i, missing in enumerate(list(df[col].isna()) + [False]):
+            if missing and start is None:
+                start = i
+            elif not missing and start is not None:
+                rows.append((col, df.index[start], df.index[i - 1], i - start))
+                start = None
+    return rows
+
+
+@pytest.fixture
+def holed():
+    index = pd.date_range('2024-03-30', periods=400, freq='15min')
+    rng = np.random.default_rng(0)
+    values = rng.normal(50000, 3000, (400, 3))
+    values[0:3, 0] = np.nan  # trou au début
+    values[50:54, 0] = np.nan
+    values[60, 0] = np.nan
+    values[120:200, 1] = np.nan
+    values[395:, 2] = np.nan  # trou à la fin
+    return pd.DataFrame(values, index=index, columns=['PrévisionsJ-1', 'PrévisionsJ', 'Consommation'])
+
+
+def test_gap_runs_match_reference(holed):
+    gaps = gap_runs(holed)
+    assert list(gaps.columns) == ['colonne', 'début', 'fin', 'pas']
+    assert list(gaps.itertuples(index=False, name=None)) == gap_runs_reference(holed)
+    assert gap_runs(holed.fillna(0)).empty
+
+
+def test_fill_gaps_matches_pandas(holed):
+    expected = holed.interpolate(method='time').bfill().ffill()
+    np.testing.assert_allclose(fill_gaps(holed.to_numpy()), expected.to_numpy(), rtol=1e-12)
+    assert np.isnan(fill_gaps(np.full((5, 1), np.nan))).all()
+    assert fill_gaps(holed.to_numpy(dtype=np.float32)).dtype == np.float32
+
+
+def test_regular_grid_reindex():
+    index = pd.date_range('2024-10-27', periods=200, freq='15min')
+    df = pd.DataFrame({"Consommation": np.arange(200.0)}, index=index)
+    same, added, off_grid = to_regular_grid(df)
+    assert same is df and (added, off_grid) == (0, 0)
+
+    # Quatre pas absents, un doublon et un horodatage hors grille
+    off = pd.DataFrame({"Consommation": [-1.0]}, index=[index[30] + pd.Timedelta('5min')])
+    damaged = pd.concat([df.drop(index[10:14]), df.iloc[[20]], off]).sort_index(kind='stable')
+    regular, added, off_grid = to_regular_grid(damaged)
+    assert (added, off_grid) == (4, 1)
+    pd.testing.assert_index_equal(regular.index, index, check_names=False)
+    expected = df["Consommation"].where(~df.index.isin(index[10:14]))
+    np.testing.assert_array_equal(regular["Consommation"].to_numpy(), expected.to_numpy())
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.regression import BLOCK, HISTORY, LagRegressionModel, lag_features
+from benchmarks.common import make_frame
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return make_frame(96 * 40)
+
+
+@pytest.fixture(scope="module")
+def temperature():
+    return pd.Series(10.0, index=pd.date_range('2014-12-01', '2015-12-31', freq='D'))
+
+
+def test_lag_features_read_only_a_block_back(frame):
+    y = frame["Consommation"].to_numpy()
+    start = HISTORY + 10
+    features = lag_features(y, start, start + BLOCK)
+    changed = y.copy()
+    changed[start:] = 0.0  # valeurs du bloc inconnues à sa première position
+    np.testing.assert_array_equal(lag_features(changed, start, start + BLOCK), features)
+    np.testing.assert_allclose(features[0], [y[start - 96], y[start - 672], y[start - 191:start - 95].mean(),
+                                             y[start - 767:start - 95].mean()])
+
+
+@pytest.mark.parametrize("method", ["hgb", "ridge"])
+def test_forecast_blocks_are_consistent(frame, temperature, method):
+    exog = frame[["PrévisionsJ-1"]]
+    train = frame.iloc[:-BLOCK * 3]
+    params = {"max_iter": 20} if method == 'hgb' else {}
+    model = LagRegressionModel(method, temperature=temperature, **params)
+    model.fit(train["Consommation"], exog.iloc[:len(train)])
+    future = exog.iloc[len(train):]
+    long = model.forecast(BLOCK * 3, future)
+    assert long.index[0] == train.index[-1] + pd.Timedelta('15min')
+    # Un horizon plus court est un préfixe du plus long
+    pd.testing.assert_series_equal(model.forecast(BLOCK + 7, future), long.iloc[:BLOCK + 7], check_freq=False)
+
+    # Terme AR(1) : écart au modèle sans résidu en phi ** k
+    base = model.forecast(BLOCK, future)
+    model.residual, residual = 0.0, model.residual
+    np.testing.assert_allclose(base - model.forecast(BLOCK, future), residual * model.phi ** np.arange(1, BLOCK + 1))
+
+
+def test_extend_matches_refit_history(frame, temperature):
+    exog = frame[["PrévisionsJ-1"]]
+    series = frame["Consommation"]
+    model = LagRegressionModel('ridge', temperature=temperature).fit(series.iloc[:-50], exog.iloc[:-50])
+    extended = model.extend(series.iloc[-50:].to_numpy(), exog.iloc[-50:])
+    X = np.hstack([lag_features(series.to_numpy(), len(series) - 1, len(series)),
+                   model._design(series.index[-1:], exog.iloc[-1:])])
+    assert extended.residual == pytest.approx(series.iloc[-1] - model.estimator.predict(X)[0])
+    assert extended._last_time == series.index[-1] and extended.nobs == len(series)
+    np.testing.assert_array_equal(extended._history, series.to_numpy()[-HISTORY:])
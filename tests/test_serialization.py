@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.serialization import decode_binary, encode_binary, forecast_times, iter_ndjson, select, to_series
+
+
+def make_series(index, seed=0):
+    times = index.values.astype('datetime64[ns]').view(np.int64)
+    return to_series(np.random.default_rng(seed).normal(50000, 3000, len(index)), times)
+
+
+def assert_round_trip(series):
+    decoded = decode_binary(encode_binary(series))
+    assert list(decoded) == list(series)
+    for name, (times, values) in series.items():
+        index, decoded_values = decoded[name]
+        np.testing.assert_array_equal(index.values.astype('datetime64[ns]').view(np.int64), times)
+        np.testing.assert_array_equal(decoded_values, values.astype(np.float32))
+
+
+def test_regular_series_round_trip():
+    index = pd.date_range('2024-03-30', periods=500, freq='15min')
+    payload = encode_binary({"a": make_series(index)})
+    header_size = int.from_bytes(payload[:4], 'little')
+    assert len(payload) == 4 + header_size + 4 * 500  # pas d'horodatages transmis
+    assert_round_trip({"a": make_series(index), "b": make_series(index[:7], seed=1)})
+
+
+def test_series_with_gaps_round_trip():
+    index = pd.date_range('2024-01-01', periods=300, freq='15min').delete([10, 11, 12, 200])
+    header = encode_binary({"a": make_series(index)})
+    size = int.from_bytes(header[:4], 'little')
+    item = json.loads(header[4:4 + size])["series"][0]
+    assert (item["step"], item["length"], item["gaps"]) == (900, 300, True)
+    assert_round_trip({"a": make_series(index)})
+
+
+@pytest.mark.parametrize("index", [
+    pd.DatetimeIndex(['2024-01-01 00:00', '2024-01-01 00:11:40', '2024-01-01 00:28:20']),  # pas sans diviseur commun
+    pd.DatetimeIndex(['2024-01-01', '2024-01-01 00:15', '2024-02-01']),  # grille trop creuse
+    pd.DatetimeIndex(['2024-01-01']),
+    pd.DatetimeIndex([]),
+], ids=["no_common_step", "sparse", "single", "empty"])
+def test_irregular_and_short_series_round_trip(index):
+    assert_round_trip({"a": make_series(index)})
+
+
+def test_select_and_ndjson():
+    index = pd.date_range('2024-01-01', periods=1000, freq='15min')
+    series = {"a": make_series(index)}
+    times, values = select(series, '2024-01-02', '2024-01-03', step=4)["a"]
+    expected = index[(index >= '2024-01-02') & (index <= '2024-01-03')][::4]
+    np.testing.assert_array_equal(times, expected.values.astype('datetime64[ns]').view(np.int64))
+    lines = [json.loads(line) for line in iter_ndjson({"a": (times, values)}, chunk_size=10)]
+    assert [line["offset"] for line in lines] == list(range(0, len(values), 10))
+    assert sum((line["values"] for line in lines), []) == values.tolist()
+
+
+def test_forecast_times_follow_last_time():
+    times = forecast_times('2024-01-01 23:45', 3)
+    assert pd.DatetimeIndex(times).strftime('%H:%M').tolist() == ['00:00', '00:15', '00:30']
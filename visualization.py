@@ -26,7 +26,7 @@ def read_energy_data(file_path):
         # Vérification des valeurs NaN
         if df.isna().sum().sum() > 0:
             print("\n⚠️ Avertissement : Données manquantes détectées, application d'un forward fill.")
-            df.fillna(method="ffill", inplace=True)
+            df.ffill(inplace=True)
 
         print("\n✅ Données chargées avec succès !")
         print(df.info())
@@ -105,34 +105,33 @@ def auto_arima_selection(series):
     print("\n✅ Modèle optimal trouvé :", model)
     return model
 
-# 📂 Chargement des données
-#PROJECT_ROOT = Path(__file__).parent.parent
-#DATA_DIR = PROJECT_ROOT / "data"
-#data_path = str(DATA_DIR)
+if __name__ == "__main__":
+    # Exploration interactive (fenêtres matplotlib). Pour une analyse sans affichage,
+    # réutilisable par l'API et le tableau de bord : backend.analysis.analyze
+    DATA_DIR = Path(__file__).parent / "data"
+    file_path = DATA_DIR / "energy_data2023.csv"
+    df = read_energy_data(file_path)
 
-file_path = "/Users/macos/Desktop/ProjetDataScience/data/energy_data2023.csv"
-df = read_energy_data(file_path)
+    if df is not None:
+        target_column = "Consommation"  # ⚠️ Change selon tes données
+        if target_column in df.columns:
+            series = df[target_column]
 
-if df is not None:
-    target_column = "Consommation"  # ⚠️ Change selon tes données
-    if target_column in df.columns:
-        series = df[target_column]
+            # 📊 1. Test de stationnarité et différenciation
+            is_stationary = test_stationarity(series)
+            if not is_stationary:
+                series, d_value = apply_differencing(series)
+            else:
+                d_value = 0  # Pas de différenciation nécessaire
 
-        # 📊 1. Test de stationnarité et différenciation
-        is_stationary = test_stationarity(series)
-        if not is_stationary:
-            series, d_value = apply_differencing(series)
-        else:
-            d_value = 0  # Pas de différenciation nécessaire
-
-        # 🔍 2. Détection de la saisonnalité
-        seasonal_analysis(series, period=24)  # ⚠️ Modifier selon les données
+            # 🔍 2. Détection de la saisonnalité (96 pas de 15 minutes par jour)
+            seasonal_analysis(series, period=96)
 
-        # 📊 3. ACF et PACF
-        plot_acf_pacf(series)
+            # 📊 3. ACF et PACF
+            plot_acf_pacf(series)
 
-        # 🚀 4. Sélection des hyperparamètres avec Auto-ARIMA
-        best_model = auto_arima_selection(series)
+            # 🚀 4. Sélection des hyperparamètres avec Auto-ARIMA
+            best_model = auto_arima_selection(series)
 
-    else:
-        print(f"\n❌ La colonne '{target_column}' n'existe pas dans les données.")
+        else:
+            print(f"\n❌ La colonne '{target_column}' n'existe pas dans les données.")